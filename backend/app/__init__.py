@@ -1,9 +1,16 @@
 from flask import Flask, jsonify
 from flask_cors import CORS
-import certifi
 from pymongo import MongoClient
+import atexit
 import logging
 from config import Config
+from app.utils.serialization import create_json_provider
+from app.cli import register_commands
+from app.utils.auth import init_auth
+from app.utils.metrics import init_metrics, MongoPoolListener
+from app.utils.profiling import init_profiling
+from app.utils.startup import init_startup, add_warmup_task
+from app.utils.db import sync_indexes
 
 # Configure logging
 logging.basicConfig(
@@ -14,11 +21,33 @@ logger = logging.getLogger(__name__)
 
 
 def create_app(config_class=Config):
-    """Create and configure the Flask application"""
+    """
+    Create and configure the Flask application
+    
+    Nothing here waits on the network: the Mongo client connects lazily and
+    the ping, index builds and client warmups run on a background thread
+    (see app.utils.startup), so workers boot fast and survive a database blip.
+    """
     app = Flask(__name__)
+    startup = init_startup(app, config_class)
+    
+    with startup.phase('config'):
+        app.config.from_object(config_class)
+        
+        # Serialize ObjectId/datetime/Binary/HttpUrl natively, with orjson when available
+        app.json = create_json_provider(app)
+    
+    with startup.phase('instrumentation'):
+        # /metrics, per-request timing and Server-Timing headers
+        init_metrics(app)
+        
+        # Sampling profiler and tracemalloc endpoints (no-op unless PROFILING_ENABLED)
+        init_profiling(app)
     
-    # Load configurationfi
-    app.config.from_object(config_class)
+    with startup.phase('auth'):
+        # Resolve JWT key material once rather than on every request
+        verifier = init_auth(app)
+        add_warmup_task(app, 'jwks', verifier.warmup)
     
     # Configure CORS
     CORS(app, resources={
@@ -26,50 +55,75 @@ def create_app(config_class=Config):
             "origins": config_class.CORS_ORIGINS,
             "methods": config_class.CORS_METHODS,
             "allow_headers": config_class.CORS_ALLOWED_HEADERS,
-            "expose_headers": ["Content-Type"]
+            "expose_headers": ["Content-Type", "ETag", "Last-Modified", "Cache-Control"]
         }
     })
-        
-    with app.app_context():
-        # Initialize MongoDB
-        try:
-            app.mongodb_client = MongoClient(
-                Config.MONGO_URI,
-                tlsCAFile=certifi.where(),
-                serverSelectionTimeoutMS=5000
-            )
-            
-            app.database = app.mongodb_client[Config.MONGO_DB_NAME]
-            app.mongodb_client.admin.command('ping')
-            logger.info("Connected to MongoDB!")
-        except Exception as e:
-            logger.error(f"Error connecting to MongoDB: {str(e)}")
-            raise
-        
-    @app.teardown_appcontext
-    def close_mongo(exception):
-        """close mongo when ap shutting down"""
-        if hasattr(app, 'mongodb_client'):
-            app.mongodb_client.close()
-            logger.info("Closed MongoDB connection")
+    
+    with startup.phase('mongo'):
+        init_mongo(app, config_class)
     
     # Register blueprints and error handlers
-    register_blueprints(app)
+    with startup.phase('blueprints'):
+        register_blueprints(app)
     register_error_handlers(app)
+    register_commands(app)
+    
+    startup.finish()
+    if config_class.STARTUP_WARMUP:
+        startup.start_warmup()
     
     return app
 
+def init_mongo(app, config_class=Config):
+    """Create the MongoDB client without connecting; the first operation (or warmup) connects"""
+    tls_options = {}
+    if config_class.MONGO_TLS:
+        import certifi
+        tls_options['tlsCAFile'] = certifi.where()
+    
+    app.mongodb_client = MongoClient(
+        config_class.MONGO_URI,
+        serverSelectionTimeoutMS=config_class.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        connect=False,
+        **tls_options,
+        event_listeners=[MongoPoolListener()]
+    )
+    app.database = app.mongodb_client[config_class.MONGO_DB_NAME]
+    # One client per process for its lifetime; closing it per app context
+    # would throw the connection pool away after every request
+    atexit.register(app.mongodb_client.close)
+    
+    def ping():
+        app.mongodb_client.admin.command('ping')
+        logger.info("Connected to MongoDB!")
+    
+    add_warmup_task(app, 'mongo', ping, required=True)
+    
+    def indexes():
+        # The declared regular indexes; the Atlas vector index is left to `flask sync-indexes`
+        report = sync_indexes(app.database)
+        if report['created']:
+            logger.info(f"Created indexes: {', '.join(report['created'])}")
+        for failure in report['failed']:
+            # e.g. existing duplicate linkedInURLs; imports still dedupe, just not under concurrency
+            logger.warning(f"Could not create index {failure}")
+    
+    add_warmup_task(app, 'indexes', indexes)
+
 def register_blueprints(app):
     """Register Flask blueprints"""
     try:
         from app.routes.search import create_search_blueprint
         from app.routes.profile import create_profile_blueprint
+        from app.routes.health import create_health_blueprint
         
         profile_bp = create_profile_blueprint(app.database)
         search_bp = create_search_blueprint(app.database)
+        health_bp = create_health_blueprint(app.database)
         
         app.register_blueprint(search_bp, url_prefix='/api/v1/search/')
         app.register_blueprint(profile_bp, url_prefix='/api/v1/profiles/')
+        app.register_blueprint(health_bp, url_prefix='/health')
         
         logger.info("Blueprints registered successfully")
     except Exception as e:
@@ -87,7 +141,7 @@ def register_error_handlers(app):
 
     @app.errorhandler(500)
     def internal_error(error):
-        logger.error(f"Internal server error: {str(e)}")
+        logger.error(f"Internal server error: {str(error)}")
         return jsonify({
             "status": "error",
             "message": "Internal server error"
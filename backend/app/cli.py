@@ -0,0 +1,139 @@
+# app/cli.py
+import sys
+import time
+import click
+from flask import Flask, current_app
+from config import Config
+
+def register_commands(app: Flask) -> None:
+    """Register the backend's `flask <command>` maintenance commands"""
+
+    @app.cli.command('search-cache-server')
+    @click.option('--socket', 'address', default=lambda: Config.SEARCH_CACHE_SOCKET,
+                  help='Unix socket path (defaults to SEARCH_CACHE_SOCKET)')
+    def search_cache_server(address: str):
+        """Run the search result cache shared by all workers on this host"""
+        from app.utils.cache import CacheServer
+
+        if not address:
+            raise click.UsageError("Set SEARCH_CACHE_SOCKET or pass --socket")
+        if not Config.SEARCH_CACHE_AUTHKEY:
+            raise click.UsageError("Set SEARCH_CACHE_AUTHKEY to a secret shared with the workers")
+        CacheServer(
+            address,
+            Config.SEARCH_CACHE_AUTHKEY.encode(),
+            max_entries=Config.SEARCH_CACHE_MAX_ENTRIES,
+            max_bytes=Config.SEARCH_CACHE_MAX_BYTES
+        ).serve_forever()
+
+    @app.cli.command('export-profiles')
+    @click.option('--format', 'export_format', type=click.Choice(['ndjson', 'arrow', 'parquet']),
+                  default='ndjson', show_default=True)
+    @click.option('--output', '-o', default='-', help="Output path ('-' for stdout, ndjson only)")
+    @click.option('--embeddings/--no-embeddings', default=False, help='Include the stored vectors')
+    @click.option('--batch-size', type=int, default=lambda: Config.EXPORT_BATCH_SIZE)
+    def export_profiles(export_format: str, output: str, embeddings: bool, batch_size: int):
+        """Stream alumniProfiles to NDJSON, an Arrow IPC file or Parquet"""
+        from app.services.export import ExportService
+
+        service = ExportService(
+            current_app.database, dimensions=Config.EMBEDDING_DIMENSIONS, batch_size=batch_size
+        )
+        started = time.monotonic()
+
+        if export_format == 'ndjson':
+            if output == '-':
+                service.write_ndjson(sys.stdout.buffer, embeddings)
+                return
+            with open(output, 'wb') as f:
+                service.write_ndjson(f, embeddings)
+            click.echo(f"Exported profiles to {output} in {time.monotonic() - started:.1f}s", err=True)
+            return
+
+        if output == '-':
+            raise click.UsageError(f"--output is required for {export_format}")
+        try:
+            if export_format == 'arrow':
+                rows = service.write_arrow(output, embeddings)
+            else:
+                rows = service.write_parquet(output, embeddings)
+        except RuntimeError as e:
+            raise click.ClickException(str(e))
+        click.echo(f"Exported {rows} profiles to {output} in {time.monotonic() - started:.1f}s", err=True)
+
+    @app.cli.command('backfill-pgvector')
+    @click.option('--embed-missing', is_flag=True,
+                  help='Embed profiles that have no alumniEmb yet (one Cohere call per batch)')
+    @click.option('--batch-size', type=int, default=96, show_default=True)
+    def backfill_pgvector(embed_missing: bool, batch_size: int):
+        """Copy every profile and its alumniEmb into the pgvector Embedding column"""
+        from app.services.pgvector import PgVectorStore
+        from app.services.vector import VectorService, MAX_EMBED_BATCH
+
+        store = PgVectorStore(Config.PG_DSN, dimensions=Config.EMBEDDING_DIMENSIONS)
+        started = time.monotonic()
+        try:
+            counts = store.backfill(
+                current_app.database,
+                vector_service=VectorService() if embed_missing else None,
+                batch_size=min(batch_size, MAX_EMBED_BATCH) if embed_missing else batch_size
+            )
+        finally:
+            store.close()
+        click.echo(f"Upserted {counts['upserted']} profiles ({counts['embedded']} newly embedded) "
+                   f"in {time.monotonic() - started:.1f}s", err=True)
+        if counts["skipped"]:
+            click.echo(f"{counts['skipped']} profiles have no alumniEmb; rerun with --embed-missing", err=True)
+        if counts["failed"]:
+            click.echo(f"{counts['failed']} profiles could not be embedded", err=True)
+            sys.exit(1)
+
+    @app.cli.command('sync-indexes')
+    @click.option('--vector-index/--no-vector-index', default=True, show_default=True,
+                  help='Also create the Atlas vector search index (Atlas only)')
+    @click.option('--dry-run', is_flag=True, help='Only report what would be created')
+    def sync_indexes_command(vector_index: bool, dry_run: bool):
+        """Create the indexes declared in app.utils.db.INDEXES that are missing"""
+        from app.utils.db import sync_indexes
+
+        report = sync_indexes(
+            current_app.database,
+            dimensions=Config.EMBEDDING_DIMENSIONS if vector_index else None,
+            dry_run=dry_run
+        )
+        labels = {"created": "would create" if dry_run else "created", "existing": "exists",
+                  "undeclared": "not declared", "failed": "FAILED"}
+        for outcome, label in labels.items():
+            for index in report[outcome]:
+                click.echo(f"{label:<14}{index}")
+        if report["failed"]:
+            sys.exit(1)
+
+    @app.cli.command('index-usage')
+    @click.option('--unused-only', is_flag=True, help='Only list indexes with no recorded use')
+    def index_usage_command(unused_only: bool):
+        """Report per-index usage from $indexStats (counts reset on mongod restart)"""
+        from app.utils.db import index_usage
+
+        click.echo(f"{'ops':>12}  {'since':<26}index")
+        for index in index_usage(current_app.database):
+            if unused_only and index["ops"]:
+                continue
+            flag = "  (unused)" if not index["ops"] and index["name"] != '_id_' else ""
+            click.echo(f"{index['ops']:>12}  {index['since'].isoformat(timespec='seconds'):<26}"
+                       f"{index['collection']}.{index['name']}{flag}")
+
+    @app.cli.command('check-query-plans')
+    def check_query_plans_command():
+        """Explain the service queries and fail if any of them scans a whole collection"""
+        from app.utils.db import check_query_plans
+
+        results = check_query_plans(current_app.database)
+        for result in results:
+            detail = result.get("error") or " > ".join(dict.fromkeys(result["stages"]))
+            click.echo(f"{'ok' if result['ok'] else 'FAIL':<6}{result['query']:<42}{detail}")
+        failed = [result for result in results if not result["ok"]]
+        if failed:
+            click.echo(f"\n{len(failed)} of {len(results)} queries do not use an index; "
+                       f"run `flask sync-indexes`", err=True)
+            sys.exit(1)
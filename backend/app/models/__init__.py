@@ -1,3 +1,3 @@
-from .profile import AlumniProfile
+from .profile import AlumniProfile, ProfileRecord
 
-__all__ = ['AlumniProfile']
+__all__ = ['AlumniProfile', 'ProfileRecord']
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Dict, Any
 from pydantic import BaseModel, Field, HttpUrl, validator
 from bson import ObjectId, Binary
 
@@ -28,7 +28,8 @@ class AlumniProfile(BaseModel):
     university: str
     highSchool: str
     linkedInURL: HttpUrl
-    alumniEmb: Optional[list] = None
+    alumniEmb: Optional[Binary] = None
+    alumniEmbBin: Optional[Binary] = None
     dateUpdated: datetime = Field(default_factory=datetime.utcnow)
 
     class Config:
@@ -52,5 +53,50 @@ class AlumniProfile(BaseModel):
             "highSchool": self.highSchool,
             "linkedInURL": str(self.linkedInURL),
             "alumniEmb": self.alumniEmb,
+            "alumniEmbBin": self.alumniEmbBin,
             "dateUpdated": self.dateUpdated
-        }
\ No newline at end of file
+        }
+
+# Fields returned by profile reads, in response order
+PROFILE_READ_FIELDS = (
+    "fullName",
+    "currentRole",
+    "company",
+    "university",
+    "highSchool",
+    "linkedInURL",
+    "dateUpdated"
+)
+
+class ProfileRecord:
+    """
+    Read-path view of a stored profile
+    
+    Built straight from a projected MongoDB document with no validation;
+    AlumniProfile is reserved for writes. The embedding is only present when
+    the read explicitly asked for it.
+    """
+    __slots__ = ("id",) + PROFILE_READ_FIELDS + ("alumniEmb",)
+
+    def __init__(self, doc: Dict[str, Any]):
+        self.id = doc["_id"]
+        for field in PROFILE_READ_FIELDS:
+            setattr(self, field, doc.get(field))
+        self.alumniEmb = doc.get("alumniEmb")
+
+    @staticmethod
+    def projection(include_embedding: bool = False) -> Dict[str, int]:
+        """MongoDB projection that loads only what a ProfileRecord needs"""
+        projection = {field: 1 for field in PROFILE_READ_FIELDS}
+        if include_embedding:
+            projection["alumniEmb"] = 1
+        return projection
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Response dict; ObjectId/datetime/Binary are left to the JSON provider"""
+        data = {"_id": self.id}
+        for field in PROFILE_READ_FIELDS:
+            data[field] = getattr(self, field)
+        if self.alumniEmb is not None:
+            data["alumniEmb"] = self.alumniEmb
+        return data
\ No newline at end of file
@@ -0,0 +1,38 @@
+# app/routes/health.py
+from flask import Blueprint, jsonify, current_app
+from http import HTTPStatus
+from app.utils.db import health_check
+from app.utils.startup import startup_state
+
+def create_health_blueprint(database):
+    """Creates the liveness and readiness probe blueprint"""
+
+    health_bp = Blueprint('health', __name__)
+
+    @health_bp.route('/live', methods=['GET'])
+    def live():
+        """The process is up and serving; says nothing about its dependencies"""
+        return jsonify({"status": "ok"}), HTTPStatus.OK
+
+    @health_bp.route('/ready', methods=['GET'])
+    def ready():
+        """
+        200 only once the required warmup tasks (Mongo ping, search warmup
+        including a synthetic query) have succeeded and Mongo still answers,
+        so a load balancer never routes user traffic to a cold worker
+        """
+        startup = startup_state(current_app)
+        # A failed warmup is retried here, at most every STARTUP_WARMUP_RETRY_SECONDS
+        startup.retry_failed()
+
+        ready = startup.ready and health_check(current_app.mongodb_client)
+        response = jsonify({
+            "status": "ready" if ready else "warming",
+            "startup": startup.to_dict()
+        })
+        if not ready:
+            response.headers['Retry-After'] = '1'
+            return response, HTTPStatus.SERVICE_UNAVAILABLE
+        return response, HTTPStatus.OK
+
+    return health_bp
@@ -1,13 +1,18 @@
 # app/routes/profile.py
-from app.services.vector import VectorService
-from flask import Blueprint, request, jsonify, current_app
+from app.services.vector import VectorService, MAX_EMBED_BATCH
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from http import HTTPStatus
-from bson import Binary
-from bson import ObjectId
-from app.services.profile import ProfileService
+from pymongo.errors import DuplicateKeyError
+from app.services.profile import ProfileService, DUPLICATE_PROFILE_MESSAGE
+from app.services.importer import ImportService
+from app.services.export import ExportService
 from app.models.profile import AlumniProfile
-from app.utils.validation import validate_profile_data
-from pydantic import HttpUrl
+from app.utils.validation import validate_profile_data, validate_batch_profiles, BatchItemError
+from app.utils.conditional import profile_validators, is_not_modified, set_cache_headers
+from config import Config
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 
@@ -16,8 +21,50 @@ def create_profile_blueprint(database):
     profile_bp = Blueprint('profile', __name__)
     
     profile_service = ProfileService(database)
-    
     vector_service = VectorService()
+    export_service = ExportService(
+        database, dimensions=Config.EMBEDDING_DIMENSIONS, batch_size=Config.EXPORT_BATCH_SIZE
+    )
+    import_service = ImportService(database, vector_service, batch_size=Config.IMPORT_BATCH_SIZE)
+    
+    def conditional_profile_response(profile_id: str, include_embedding: bool):
+        """
+        Serve a profile with ETag/Last-Modified, answering revalidations with a
+        304 from a covered version lookup instead of a full read
+        """
+        version = profile_service.get_profile_version(profile_id)
+        if version is None:
+            return jsonify({
+                "status": "error",
+                "message": "Profile not found"
+            }), HTTPStatus.NOT_FOUND
+        
+        variant = "emb" if include_embedding else ""
+        etag, last_modified = profile_validators(profile_id, version, variant)
+        if is_not_modified(etag, last_modified):
+            response = current_app.response_class(status=HTTPStatus.NOT_MODIFIED)
+        else:
+            profile = profile_service.get_profile(profile_id, include_embedding=include_embedding)
+            if not profile:
+                return jsonify({
+                    "status": "error",
+                    "message": "Profile not found"
+                }), HTTPStatus.NOT_FOUND
+            # The profile may have changed since the version lookup
+            if profile.dateUpdated:
+                etag, last_modified = profile_validators(profile_id, profile.dateUpdated, variant)
+            response = jsonify({
+                "status": "success",
+                "profile": profile.to_dict()
+            })
+        
+        return set_cache_headers(
+            response,
+            etag,
+            last_modified,
+            max_age=Config.PROFILE_CACHE_MAX_AGE,
+            stale_while_revalidate=Config.PROFILE_CACHE_STALE_WHILE_REVALIDATE
+        )
     
     @profile_bp.route('/', methods=['POST'])
     #@require_auth
@@ -49,8 +96,7 @@ def create_profile_blueprint(database):
             temp_profile = AlumniProfile(**data)
             
             try:
-                vector_embedding = vector_service.generate_profile_vector(temp_profile)
-                data['alumniEmb'] = vector_embedding
+                data.update(vector_service.generate_profile_embeddings(temp_profile))
             except Exception as e:
                 current_app.logger.error(f"Error generating vector embedding: {str(e)}")
                 return jsonify({
@@ -59,7 +105,19 @@ def create_profile_blueprint(database):
                 }), HTTPStatus.INTERNAL_SERVER_ERROR
                 
             # Create profile
-            profile = await profile_service.create_profile(data)
+            try:
+                profile = await profile_service.create_profile(data)
+            except DuplicateKeyError:
+                return jsonify({
+                    "status": "error",
+                    "message": DUPLICATE_PROFILE_MESSAGE
+                }), HTTPStatus.CONFLICT
+            
+            if profile is None:
+                return jsonify({
+                    "status": "error",
+                    "message": "Failed to create profile"
+                }), HTTPStatus.INTERNAL_SERVER_ERROR
             
             return jsonify({
                 "status": "success",
@@ -78,34 +136,37 @@ def create_profile_blueprint(database):
         """
         Get alumni profile by ID
 
-        Request body:
-        {
-        "profile_id": "6726ac2b41c292327ac3b0a4"
-        }
+        Query parameters (or request body):
+        - profile_id: "6726ac2b41c292327ac3b0a4"
+        - include_embedding: "true" to also return alumniEmb
         """
         try:
-            data = request.get_json()
-            profile_id = data.get('profile_id')
-            profile = profile_service.get_profile(profile_id)
-            print(profile)
-            if not profile:
-                return jsonify({
-                    "status": "error",
-                    "message": "Profile not found"
-                }), HTTPStatus.NOT_FOUND
-                
-            profile_dict = profile.model_dump(by_alias=True)
-            for key, value in profile_dict.items():
-                if isinstance(value, ObjectId):
-                    profile_dict[key] = str(value)
-                    
-                if isinstance(value, HttpUrl):
-                    profile_dict[key] = str(value)
-                
+            data = request.get_json(silent=True) or {}
+            profile_id = request.args.get('profile_id') or data.get('profile_id')
+            include_embedding = request.args.get('include_embedding', 'false').lower() == 'true'
+            
+            return conditional_profile_response(profile_id, include_embedding)
+            
+        except Exception as e:
             return jsonify({
-                "status": "success",
-                "profile": profile_dict
-            }), HTTPStatus.OK
+                "status": "error",
+                "message": str(e)
+            }), HTTPStatus.INTERNAL_SERVER_ERROR
+
+    @profile_bp.route('/<profile_id>', methods=['GET'])
+    #@require_auth
+    def get_profile_by_id(profile_id: str):
+        """
+        Get alumni profile by ID (cacheable)
+
+        Supports If-None-Match / If-Modified-Since revalidation.
+
+        Query parameters:
+        - include_embedding: "true" to also return alumniEmb
+        """
+        try:
+            include_embedding = request.args.get('include_embedding', 'false').lower() == 'true'
+            return conditional_profile_response(profile_id, include_embedding)
             
         except Exception as e:
             return jsonify({
@@ -115,11 +176,11 @@ def create_profile_blueprint(database):
 
     @profile_bp.route('/update-profile/', methods=['PUT'])
     #@require_auth
-    async def update_profile(profile_id: str):
+    async def update_profile():
         """Update profile by ID"""
         try:
             data = request.get_json()
-            profile_id = data.get('profile_id')
+            profile_id = data.pop('profile_id', None)
             
             # Validate update data
             validation_result = validate_profile_data(data, is_update=True)
@@ -195,12 +256,55 @@ def create_profile_blueprint(database):
             data = request.get_json()
             profiles_data = data.get('profiles', [])
             
-            created_profiles = await profile_service.create_many_profiles(profiles_data)
+            validation_result = validate_batch_profiles(profiles_data, Config.PROFILE_BATCH_MAX_SIZE)
+            if validation_result['message']:
+                return jsonify({
+                    "status": "error",
+                    "message": validation_result['message']
+                }), HTTPStatus.BAD_REQUEST
+            
+            if not validation_result['valid_indices']:
+                return jsonify({
+                    "status": "error",
+                    "message": "No valid profiles in batch",
+                    "errors": validation_result['errors']
+                }), HTTPStatus.BAD_REQUEST
+            
+            # Invalid items are reported back; the rest are embedded (one
+            # Cohere call per MAX_EMBED_BATCH) and created with one bulk insert
+            errors = list(validation_result['errors'])
+            documents, positions = [], []
+            valid_indices = validation_result['valid_indices']
+            for start in range(0, len(valid_indices), MAX_EMBED_BATCH):
+                chunk = valid_indices[start:start + MAX_EMBED_BATCH]
+                try:
+                    embeddings = vector_service.generate_embeddings_batch([profiles_data[i] for i in chunk])
+                except Exception as e:
+                    current_app.logger.error(f"Error generating batch embeddings: {str(e)}")
+                    errors.extend(
+                        BatchItemError(index=i, message="Failed to generate profile embedding") for i in chunk
+                    )
+                    continue
+                for i, embedding in zip(chunk, embeddings):
+                    documents.append({**profiles_data[i], **embedding})
+                    positions.append(i)
+            
+            created_profiles, failures = await profile_service.create_many_profiles(documents)
+            errors.extend(BatchItemError(index=positions[j], message=message) for j, message in failures)
+            errors.sort(key=lambda error: error['index'])
+            
+            if not created_profiles:
+                return jsonify({
+                    "status": "error",
+                    "message": "No profiles were created",
+                    "errors": errors
+                }), HTTPStatus.BAD_REQUEST
             
             return jsonify({
-                "status": "success",
+                "status": "partial" if errors else "success",
                 "created_count": len(created_profiles),
-                "profiles": [p.dict(by_alias=True) for p in created_profiles]
+                "profiles": created_profiles,
+                "errors": errors
             }), HTTPStatus.CREATED
             
         except Exception as e:
@@ -209,4 +313,67 @@ def create_profile_blueprint(database):
                 "message": str(e)
             }), HTTPStatus.INTERNAL_SERVER_ERROR
             
+    @profile_bp.route('/import', methods=['POST'])
+    #@require_admin
+    def import_profiles():
+        """
+        Bulk import profiles from an NDJSON body (admin only)
+        
+        Request body: one profile object per line, same fields as POST /.
+        Profiles whose linkedInURL already exists are skipped, so an
+        interrupted import can simply be resent.
+        
+        Response: NDJSON stream of {"type": "error", "line", "message"} events,
+        {"type": "progress", "processed", "imported", "skipped", "failed"}
+        after every batch and a final {"type": "summary", ...}.
+        """
+        dumps = current_app.json.dumps
+        
+        def generate():
+            try:
+                for event in import_service.run(request.stream):
+                    yield dumps(event) + "\n"
+            except Exception as e:
+                logger.error(f"Profile import aborted: {str(e)}")
+                yield dumps({"type": "error", "message": str(e)}) + "\n"
+        
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    @profile_bp.route('/export', methods=['GET'])
+    #@require_admin
+    def export_profiles():
+        """
+        Stream every profile (admin only)
+        
+        Query parameters:
+            format: 'ndjson' (default) or 'arrow' (Arrow IPC stream)
+            embeddings: 'true' to include alumniEmb/alumniEmbBin
+        
+        Parquet needs a seekable file, so it is only offered by
+        `flask export-profiles`.
+        """
+        export_format = request.args.get('format', 'ndjson')
+        include_embeddings = request.args.get('embeddings', 'false').lower() == 'true'
+        
+        if export_format == 'ndjson':
+            body, mimetype = export_service.ndjson(include_embeddings), 'application/x-ndjson'
+        elif export_format == 'arrow':
+            try:
+                export_service.arrow_schema(include_embeddings)
+            except RuntimeError as e:
+                return jsonify({
+                    "status": "error",
+                    "message": str(e)
+                }), HTTPStatus.NOT_IMPLEMENTED
+            body, mimetype = export_service.arrow_stream(include_embeddings), 'application/vnd.apache.arrow.stream'
+        else:
+            return jsonify({
+                "status": "error",
+                "message": "Format must be 'ndjson' or 'arrow'"
+            }), HTTPStatus.BAD_REQUEST
+        
+        response = Response(stream_with_context(body), mimetype=mimetype)
+        response.headers['Content-Disposition'] = f'attachment; filename=alumni-profiles.{export_format}'
+        return response
+
     return profile_bp
\ No newline at end of file
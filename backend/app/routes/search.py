@@ -3,7 +3,13 @@ from flask import Blueprint, request, jsonify
 from http import HTTPStatus
 from typing import Optional, Dict, Any
 from app.services.search import SearchService
+from app.services.suggest import SuggestService, SUGGEST_FIELDS
 from app.utils.validation import validate_search_params
+from app.utils.cache import create_search_cache
+from app.signals import profile_changed, profiles_imported, index_rebuilt
+from app.utils.metrics import timed, SEARCH_CACHE_LOOKUPS
+from app.utils.startup import add_warmup_task
+from app.utils.admission import AdmissionController, Overloaded, SearchTimeout, limit_native_threads
 from config import Config
         
 def create_search_blueprint(database):
@@ -11,11 +17,61 @@ def create_search_blueprint(database):
     
     search_bp = Blueprint('search', __name__)
     
+    vector_store = None
+    if Config.VECTOR_BACKEND == 'pgvector':
+        from app.services.pgvector import PgVectorStore
+        vector_store = PgVectorStore(
+            Config.PG_DSN,
+            dimensions=Config.EMBEDDING_DIMENSIONS,
+            min_pool_size=Config.PG_MIN_POOL_SIZE,
+            max_pool_size=Config.PG_MAX_POOL_SIZE,
+            ef_search=Config.PGVECTOR_EF_SEARCH
+        )
+    elif Config.VECTOR_BACKEND == 'exact':
+        from app.services.exact import ExactVectorStore
+        vector_store = ExactVectorStore(database, refresh_seconds=Config.BINARY_INDEX_REFRESH_SECONDS)
+    elif Config.VECTOR_BACKEND == 'binary':
+        from app.services.quantized import BinaryRescoreStore
+        vector_store = BinaryRescoreStore(
+            database,
+            oversample=Config.BINARY_OVERSAMPLE,
+            refresh_seconds=Config.BINARY_INDEX_REFRESH_SECONDS
+        )
+    
     search_service = SearchService(
         database=database,
-        cohere_api_key=Config.COHERE_KEY
+        cohere_api_key=Config.COHERE_KEY,
+        vector_store=vector_store
+    )
+    
+    # Embedding client, vector index load and a synthetic query run on the
+    # warmup thread, not at import; readiness waits for them
+    search_bp.record_once(lambda state: add_warmup_task(state.app, 'search', search_service.warmup, required=True))
+    
+    # Cache misses run on a bounded pool: past its queue, requests get a fast
+    # 503 instead of piling onto Cohere, BLAS threads and Mongo all at once
+    limit_native_threads(Config.SEARCH_NATIVE_THREADS)
+    admission = AdmissionController(
+        workers=Config.SEARCH_WORKERS,
+        queue_size=Config.SEARCH_QUEUE_SIZE,
+        timeout=Config.SEARCH_TIMEOUT_SECONDS,
+        retry_after=Config.SEARCH_RETRY_AFTER_SECONDS,
+        run_timeout=Config.SEARCH_RUN_TIMEOUT_SECONDS
     )
     
+    # Typeahead is answered from memory: loaded at warmup, kept current by the profile signals
+    suggest_service = SuggestService(database, max_limit=Config.SUGGEST_MAX_LIMIT)
+    profile_changed.connect(suggest_service.profile_changed, weak=False)
+    profiles_imported.connect(suggest_service.profiles_imported, weak=False)
+    search_bp.record_once(lambda state: add_warmup_task(state.app, 'suggest', suggest_service.rebuild))
+    
+    search_cache = create_search_cache(Config)
+    if search_cache is not None:
+        # Any profile write or index rebuild moves to a new cache generation
+        profile_changed.connect(search_cache.bump_generation, weak=False)
+        profiles_imported.connect(search_cache.bump_generation, weak=False)
+        index_rebuilt.connect(search_cache.bump_generation, weak=False)
+    
     @search_bp.route('/text', methods=['POST'])
     async def text_search():
         """
@@ -25,7 +81,8 @@ def create_search_blueprint(database):
         {
             "query": "software engineers from Berkeley",
             "limit": 10,
-            "offset": 0
+            "offset": 0,
+            "filters": {"company": "Google"}
         }
         """
         try:
@@ -43,24 +100,52 @@ def create_search_blueprint(database):
             query = data.get('query')
             limit = data.get('limit', 10)
             offset = data.get('offset', 0)
+            filters = data.get('filters')
             
-            # Perform search
-            results = search_service.search_by_text(
-                query=query,
-                k=limit
-            )
+            with timed('total'):
+                results = None
+                if search_cache:
+                    with timed('cache'):
+                        # The generation the search starts from, not the one it ends on
+                        cache_key = search_cache.key(query, limit, filters)
+                        results = search_cache.get(cache_key)
+                    SEARCH_CACHE_LOOKUPS.labels('miss' if results is None else 'hit').inc()
+                if results is None:
+                    # Perform search
+                    results = admission.run(
+                        search_service.search_by_text,
+                        query=query,
+                        k=limit,
+                        filters=filters
+                    )
+                    # Empty results may be a swallowed embedding/search error; don't pin them
+                    if search_cache and results:
+                        search_cache.set(cache_key, results)
+                
+                # Apply pagination
+                paginated_results = results[offset:offset + limit]
+                
+                with timed('serialization'):
+                    response = jsonify({
+                        "status": "success",
+                        "results": paginated_results,
+                        "count": len(paginated_results),
+                        "total": len(results),
+                        "has_more": len(results) > (offset + limit)
+                    })
             
-            # Apply pagination
-            paginated_results = results[offset:offset + limit]
+            return response, HTTPStatus.OK
             
+        except Overloaded as e:
             return jsonify({
-                "status": "success",
-                "results": paginated_results,
-                "count": len(paginated_results),
-                "total": len(results),
-                "has_more": len(results) > (offset + limit)
-            }), HTTPStatus.OK
-            
+                "status": "error",
+                "message": "Search is busy, please retry shortly"
+            }), HTTPStatus.SERVICE_UNAVAILABLE, {"Retry-After": str(e.retry_after)}
+        except SearchTimeout as e:
+            return jsonify({
+                "status": "error",
+                "message": str(e)
+            }), HTTPStatus.GATEWAY_TIMEOUT
         except Exception as e:
             return jsonify({
                 "status": "error",
@@ -95,4 +180,46 @@ def create_search_blueprint(database):
                 "message": str(e)
             }), HTTPStatus.INTERNAL_SERVER_ERROR
 
+    # Deliberately not async: an event loop per call would cost more than the lookup
+    @search_bp.route('/suggest', methods=['GET'])
+    def suggest():
+        """
+        Typeahead completions for company, university, highSchool and currentRole
+        
+        Query parameters:
+        - q: Prefix typed so far, matched against the start of any word
+        - field: Restrict to one field (default: all four)
+        - limit: Number of completions (default 8)
+        """
+        prefix = request.args.get('q', '')
+        field = request.args.get('field') or None
+        limit = request.args.get('limit', default=8, type=int)
+        
+        if field is not None and field not in SUGGEST_FIELDS:
+            return jsonify({
+                "status": "error",
+                "message": f"field must be one of: {', '.join(SUGGEST_FIELDS)}"
+            }), HTTPStatus.BAD_REQUEST
+        if limit is None or not 1 <= limit <= Config.SUGGEST_MAX_LIMIT:
+            return jsonify({
+                "status": "error",
+                "message": f"Limit must be between 1 and {Config.SUGGEST_MAX_LIMIT}"
+            }), HTTPStatus.BAD_REQUEST
+        
+        with timed('suggest'):
+            suggestions = suggest_service.suggest(prefix, field, limit)
+        return jsonify({
+            "status": "success",
+            "suggestions": suggestions
+        }), HTTPStatus.OK
+
+    @search_bp.route('/cache/stats', methods=['GET'])
+    def cache_stats():
+        """Search result cache statistics (entries, bytes, hit ratio, generation)"""
+        return jsonify({
+            "status": "success",
+            "enabled": search_cache is not None,
+            "stats": search_cache.stats() if search_cache else {}
+        }), HTTPStatus.OK
+
     return search_bp
\ No newline at end of file
@@ -1,4 +1,14 @@
-from .search import SearchService
-from .vector import VectorService
+# Services are imported on first access (PEP 562) so importing the package
+# doesn't pull in every service's dependencies at worker boot
+_SERVICES = {
+    'SearchService': 'app.services.search',
+    'VectorService': 'app.services.vector',
+}
 
-__all__ = ['SearchService', 'VectorService']
\ No newline at end of file
+__all__ = ['SearchService', 'VectorService']
+
+def __getattr__(name):
+    if name in _SERVICES:
+        from importlib import import_module
+        return getattr(import_module(_SERVICES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,85 @@
+from functools import lru_cache
+from hashlib import blake2b
+from types import SimpleNamespace
+from typing import Dict, Sequence
+import re
+import threading
+import time
+import numpy as np
+from config import Config
+
+_TOKEN = re.compile(r'\w+')
+
+@lru_cache(maxsize=65536)
+def _token_vector(token: str, dimensions: int) -> np.ndarray:
+    seed = int.from_bytes(blake2b(token.encode(), digest_size=8).digest(), 'little')
+    return np.random.default_rng(seed).standard_normal(dimensions).astype(np.float32)
+
+def hashed_embedding(text: str, dimensions: int) -> np.ndarray:
+    """
+    Deterministic unit vector for text: the normalized sum of per-token
+    pseudo-random vectors, so texts sharing words land close together
+    """
+    vector = np.zeros(dimensions, dtype=np.float32)
+    for token in _TOKEN.findall(text.lower()):
+        vector += _token_vector(token, dimensions)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+class FakeEmbeddingClient:
+    """
+    Offline stand-in for cohere.Client with the same embed() call shape
+
+    Returns int8, ubinary and float embeddings derived from hashed_embedding,
+    optionally sleeping `latency` seconds per call to mimic the API round
+    trip. Used for load tests and local development (EMBEDDING_PROVIDER=fake).
+    """
+
+    def __init__(self, dimensions: int = 1024, latency: float = 0.0):
+        self.dimensions = dimensions
+        self.latency = latency
+
+    def embed(self, texts: Sequence[str], model: str = None, input_type: str = None,
+              embedding_types: Sequence[str] = ("float",), **kwargs) -> SimpleNamespace:
+        if self.latency:
+            time.sleep(self.latency)
+
+        vectors = np.vstack([hashed_embedding(text, self.dimensions) for text in texts])
+        embeddings = SimpleNamespace()
+        if "float" in embedding_types:
+            embeddings.float = vectors.tolist()
+        if "int8" in embedding_types:
+            scale = 127 / np.maximum(np.abs(vectors).max(axis=1, keepdims=True), 1e-12)
+            embeddings.int8 = np.round(vectors * scale).astype(np.int8).tolist()
+        if "ubinary" in embedding_types:
+            embeddings.ubinary = np.packbits(vectors > 0, axis=1).tolist()
+        return SimpleNamespace(embeddings=embeddings)
+
+def create_embedding_client(api_key: str):
+    """cohere.Client, or FakeEmbeddingClient when Config.EMBEDDING_PROVIDER is 'fake'"""
+    if Config.EMBEDDING_PROVIDER == 'fake':
+        return FakeEmbeddingClient(
+            dimensions=Config.EMBEDDING_DIMENSIONS,
+            latency=Config.FAKE_EMBEDDING_LATENCY_MS / 1000
+        )
+    import cohere
+    return cohere.Client(api_key)
+
+_clients: Dict[str, object] = {}
+_clients_lock = threading.Lock()
+
+def get_embedding_client(api_key: str):
+    """
+    Process-wide embedding client, created on first use
+
+    Importing cohere and building its HTTP client is the slowest part of
+    service setup, so it is deferred until a request (or the startup warmup)
+    needs it, and every service shares the one client and connection pool.
+    """
+    client = _clients.get(api_key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(api_key)
+            if client is None:
+                client = _clients[api_key] = create_embedding_client(api_key)
+    return client
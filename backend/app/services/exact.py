@@ -0,0 +1,80 @@
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+import logging
+import numpy as np
+from bson.binary import Binary
+from app.utils.vectors import vector_to_numpy
+from app.utils.metrics import timed
+from app.services.memory_index import MemoryVectorIndex, object_array
+
+logger = logging.getLogger(__name__)
+
+PROFILE_FIELDS = ("fullName", "currentRole", "company", "university", "highSchool", "linkedInURL", "dateUpdated")
+
+class ExactVectorStore(MemoryVectorIndex):
+    """
+    Brute-force cosine search over alumniEmb held in memory
+
+    Emulates Atlas $vectorSearch (same filters, same 0-1 score scale and
+    result shape) against any MongoDB, e.g. a local mongod, so the search
+    path can be exercised without Atlas. Profile writes patch the matrix as
+    they happen (see MemoryVectorIndex).
+    """
+
+    embedding_types = ("int8",)
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        return matrix / (np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12)
+
+    def _vectors(self, profiles: Iterable[Dict[str, Any]]) -> Tuple[List[Any], np.ndarray]:
+        ids, vectors = [], []
+        for profile in profiles:
+            if profile.get("alumniEmb") is not None:
+                ids.append(profile["_id"])
+                vectors.append(vector_to_numpy(profile["alumniEmb"]))
+        if not vectors:
+            return ids, np.empty((0, 0), dtype=np.float32)
+        return ids, self._normalize(np.vstack(vectors).astype(np.float32))
+
+    def _read_all(self) -> Tuple[np.ndarray, np.ndarray]:
+        ids, matrix = self._vectors(
+            self.db.alumniProfiles.find({"alumniEmb": {"$exists": True}}, {"alumniEmb": 1}).batch_size(10000)
+        )
+        return object_array(ids), matrix
+
+    def search(self, query_vectors: Dict[str, Binary], k: int = 5,
+               filters: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """Exact top-k by cosine similarity, then one Mongo fetch for the profile fields"""
+        ids, matrix = self.snapshot()
+        if not len(ids):
+            return []
+
+        with timed('vector_search'):
+            query = vector_to_numpy(query_vectors["int8"]).astype(np.float32)
+            scores = matrix @ (query / (np.linalg.norm(query) + 1e-12))
+            if filters:
+                # Pre-filter like $vectorSearch: only matching profiles can rank
+                allowed = {doc["_id"] for doc in self.db.alumniProfiles.find(filters, {"_id": 1})}
+                mask = np.fromiter((_id in allowed for _id in ids), dtype=bool, count=len(ids))
+                scores = np.where(mask, scores, -np.inf)
+                limit = min(k, len(allowed), len(ids))
+            else:
+                limit = min(k, len(ids))
+            if limit <= 0:
+                return []
+            top = np.argpartition(-scores, limit - 1)[:limit] if limit < len(ids) else np.arange(len(ids))
+            top = top[np.argsort(-scores[top])][:limit]
+
+        with timed('hydration'):
+            selected = [ids[i] for i in top]
+            projection = {field: 1 for field in PROFILE_FIELDS}
+            docs = {doc["_id"]: doc for doc in self.db.alumniProfiles.find({"_id": {"$in": selected}}, projection)}
+
+        return [
+            {
+                "profile": {"_id": ids[i], **{field: docs[ids[i]].get(field) for field in PROFILE_FIELDS}},
+                # Same 0-1 scale as Atlas vectorSearchScore for cosine
+                "similarity_score": float((1 + scores[i]) / 2)
+            }
+            for i in top if ids[i] in docs and np.isfinite(scores[i])
+        ]
@@ -0,0 +1,200 @@
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+from datetime import timezone
+import json
+import logging
+import numpy as np
+from app.models.profile import PROFILE_READ_FIELDS
+from app.utils.vectors import vector_to_numpy
+from app.utils.serialization import encode_default
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+# pyarrow is optional and slow to import; loaded by the first Arrow/Parquet export
+pa = None
+pq = None
+
+logger = logging.getLogger(__name__)
+
+# Stored vector fields and the element type of their Arrow list columns
+EMBEDDING_COLUMNS = (('alumniEmb', 'int8'), ('alumniEmbBin', 'uint8'))
+
+class _ChunkSink:
+    """Write-only file object that hands Arrow IPC output back chunk by chunk"""
+
+    closed = False
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+class ExportService:
+    """
+    Stream alumniProfiles out of MongoDB without materializing the collection
+
+    Documents are read from one _id-ordered cursor and written either as
+    NDJSON lines or as Arrow record batches (IPC stream or Parquet), with
+    embeddings as fixed-size-list columns: alumniEmb as int8[dimensions],
+    alumniEmbBin as uint8[dimensions / 8] packed bits. Memory use is bounded
+    by batch_size whatever the corpus size.
+    """
+
+    def __init__(self, database, dimensions: int = 1024, batch_size: int = 1000):
+        self.db = database
+        self.dimensions = dimensions
+        self.batch_size = batch_size
+
+    def _cursor(self, include_embeddings: bool):
+        projection = {field: 1 for field in PROFILE_READ_FIELDS}
+        if include_embeddings:
+            projection.update({field: 1 for field, _ in EMBEDDING_COLUMNS})
+        return self.db.alumniProfiles.find({}, projection).sort('_id', 1).batch_size(self.batch_size)
+
+    def _batches(self, include_embeddings: bool) -> Iterator[List[Dict[str, Any]]]:
+        batch = []
+        for doc in self._cursor(include_embeddings):
+            batch.append(doc)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def ndjson(self, include_embeddings: bool = False) -> Iterator[bytes]:
+        """
+        One JSON object per profile, yielded a batch of lines at a time
+
+        Embeddings are written as arrays of their int8 values / packed bytes.
+        """
+        for batch in self._batches(include_embeddings):
+            lines = []
+            for doc in batch:
+                if include_embeddings:
+                    for field, _ in EMBEDDING_COLUMNS:
+                        if doc.get(field) is not None:
+                            doc[field] = vector_to_numpy(doc[field]).tolist()
+                if orjson is not None:
+                    lines.append(orjson.dumps(doc, default=encode_default))
+                else:
+                    lines.append(json.dumps(doc, default=encode_default).encode())
+            yield b"\n".join(lines) + b"\n"
+
+    def arrow_schema(self, include_embeddings: bool = False) -> "pa.Schema":
+        self._require_pyarrow()
+        fields = [pa.field('_id', pa.string(), nullable=False)]
+        fields += [pa.field(field, pa.string()) for field in PROFILE_READ_FIELDS if field != 'dateUpdated']
+        fields.append(pa.field('dateUpdated', pa.timestamp('ms', tz='UTC')))
+        if include_embeddings:
+            for field, element_type in EMBEDDING_COLUMNS:
+                fields.append(pa.field(field, pa.list_(getattr(pa, element_type)(), self._width(field))))
+        return pa.schema(fields)
+
+    def record_batches(self, include_embeddings: bool = False) -> Iterator["pa.RecordBatch"]:
+        """Arrow record batches of up to batch_size profiles"""
+        schema = self.arrow_schema(include_embeddings)
+        for batch in self._batches(include_embeddings):
+            columns = [pa.array([str(doc['_id']) for doc in batch], pa.string())]
+            for field in PROFILE_READ_FIELDS:
+                if field == 'dateUpdated':
+                    columns.append(pa.array(
+                        [self._utc(doc.get(field)) for doc in batch], pa.timestamp('ms', tz='UTC')
+                    ))
+                else:
+                    columns.append(pa.array(
+                        [None if doc.get(field) is None else str(doc[field]) for doc in batch], pa.string()
+                    ))
+            if include_embeddings:
+                for field, element_type in EMBEDDING_COLUMNS:
+                    columns.append(self._vector_column(batch, field, element_type))
+            yield pa.RecordBatch.from_arrays(columns, schema=schema)
+
+    def arrow_stream(self, include_embeddings: bool = False) -> Iterator[bytes]:
+        """Arrow IPC stream, yielded as one chunk per record batch"""
+        self._require_pyarrow()
+        sink = _ChunkSink()
+        with pa.ipc.new_stream(sink, self.arrow_schema(include_embeddings)) as writer:
+            for batch in self.record_batches(include_embeddings):
+                writer.write_batch(batch)
+                yield sink.drain()
+        yield sink.drain()
+
+    def write_ndjson(self, out: BinaryIO, include_embeddings: bool = False) -> None:
+        for chunk in self.ndjson(include_embeddings):
+            out.write(chunk)
+
+    def write_arrow(self, path: str, include_embeddings: bool = False) -> int:
+        """Write an Arrow IPC file; returns the number of rows"""
+        schema = self.arrow_schema(include_embeddings)
+        rows = 0
+        with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+            for batch in self.record_batches(include_embeddings):
+                writer.write_batch(batch)
+                rows += batch.num_rows
+        return rows
+
+    def write_parquet(self, path: str, include_embeddings: bool = False, compression: str = 'zstd') -> int:
+        """Write a Parquet file, one row group per record batch; returns the number of rows"""
+        schema = self.arrow_schema(include_embeddings)
+        rows = 0
+        with pq.ParquetWriter(path, schema, compression=compression) as writer:
+            for batch in self.record_batches(include_embeddings):
+                writer.write_batch(batch)
+                rows += batch.num_rows
+        return rows
+
+    def _width(self, field: str) -> int:
+        return self.dimensions // 8 if field == 'alumniEmbBin' else self.dimensions
+
+    def _vector_column(self, batch: List[Dict[str, Any]], field: str, element_type: str) -> "pa.Array":
+        """Pack a batch of BSON vectors into one FixedSizeListArray (nulls for missing/mismatched)"""
+        width = self._width(field)
+        values = np.zeros((len(batch), width), dtype=element_type)
+        valid = np.zeros(len(batch), dtype=bool)
+        for i, doc in enumerate(batch):
+            vector = doc.get(field)
+            if vector is None:
+                continue
+            array = vector_to_numpy(vector)
+            if array.shape[0] != width:
+                logger.warning(f"Skipping {field} of {doc['_id']}: {array.shape[0]} values, expected {width}")
+                continue
+            values[i] = array
+            valid[i] = True
+
+        list_type = pa.list_(getattr(pa, element_type)(), width)
+        validity = None if valid.all() else pa.py_buffer(np.packbits(valid, bitorder='little'))
+        return pa.Array.from_buffers(
+            list_type, len(batch), [validity], children=[pa.array(values.reshape(-1))]
+        )
+
+    @staticmethod
+    def _utc(value: Optional[Any]) -> Optional[Any]:
+        # Naive datetimes from pymongo are UTC
+        if value is not None and value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value
+
+    @staticmethod
+    def _require_pyarrow() -> None:
+        global pa, pq
+        if pa is not None:
+            return
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("Arrow/Parquet export requires pyarrow (pip install pyarrow)")
+        pa, pq = pyarrow, pyarrow.parquet
@@ -0,0 +1,146 @@
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+from datetime import datetime, timezone
+import logging
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from app.services.vector import VectorService, MAX_EMBED_BATCH
+from app.utils.validation import profile_errors
+from app.utils.serialization import loads
+from app.signals import profiles_imported
+
+logger = logging.getLogger(__name__)
+
+# Upsert key that makes re-running an import safe (unique index
+# profile_linkedin_url in app.utils.db.INDEXES)
+IMPORT_KEY = 'linkedInURL'
+
+class ImportService:
+    """
+    Bulk import of alumni profiles from NDJSON
+
+    Lines are consumed lazily and handled in fixed-size batches, so memory
+    stays bounded however large the input is. Each batch is validated,
+    stripped of profiles that already exist, embedded with one Cohere call
+    and written with a single unordered bulk upsert keyed on linkedInURL;
+    `$setOnInsert` means a replayed line never overwrites or duplicates.
+    """
+
+    def __init__(self, database, vector_service: VectorService, batch_size: int = MAX_EMBED_BATCH):
+        self.db = database
+        self.vector_service = vector_service
+        self.batch_size = min(batch_size, MAX_EMBED_BATCH)
+
+    def run(self, lines: Iterable[bytes]) -> Iterator[Dict[str, Any]]:
+        """
+        Import NDJSON lines, yielding progress and per-line error events
+
+        Args:
+            lines: Raw NDJSON lines (e.g. the request stream)
+
+        Yields:
+            {"type": "error", "line", "message"} for every rejected line,
+            {"type": "progress", ...counts} after every batch and a final
+            {"type": "summary", ...counts}
+        """
+        counts = {"processed": 0, "imported": 0, "skipped": 0, "failed": 0}
+        batch: List[Tuple[int, Dict[str, Any]]] = []
+
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            counts["processed"] += 1
+
+            try:
+                profile = loads(line)
+            except ValueError:
+                counts["failed"] += 1
+                yield {"type": "error", "line": line_number, "message": "Invalid JSON"}
+                continue
+
+            errors = profile_errors(profile)
+            if errors:
+                counts["failed"] += 1
+                yield {"type": "error", "line": line_number, "message": "; ".join(errors)}
+                continue
+
+            batch.append((line_number, profile))
+            if len(batch) >= self.batch_size:
+                yield from self._import_batch(batch, counts)
+                batch = []
+
+        if batch:
+            yield from self._import_batch(batch, counts)
+
+        yield {"type": "summary", **counts}
+
+    def _import_batch(self, batch: List[Tuple[int, Dict[str, Any]]],
+                      counts: Dict[str, int]) -> Iterator[Dict[str, Any]]:
+        # Drop profiles already stored (or repeated within the batch) before paying for embeddings
+        urls = [profile[IMPORT_KEY] for _, profile in batch]
+        seen = {
+            doc[IMPORT_KEY] for doc in
+            self.db.alumniProfiles.find({IMPORT_KEY: {"$in": urls}}, {IMPORT_KEY: 1, "_id": 0})
+        }
+        pending = []
+        for line_number, profile in batch:
+            if profile[IMPORT_KEY] in seen:
+                counts["skipped"] += 1
+            else:
+                seen.add(profile[IMPORT_KEY])
+                pending.append((line_number, profile))
+
+        if pending:
+            try:
+                embeddings = self.vector_service.generate_embeddings_batch([profile for _, profile in pending])
+            except Exception as e:
+                logger.error(f"Error generating import embeddings: {str(e)}")
+                counts["failed"] += len(pending)
+                for line_number, _ in pending:
+                    yield {"type": "error", "line": line_number, "message": "Failed to generate profile embedding"}
+                pending = []
+                embeddings = []
+
+            yield from self._write(pending, embeddings, counts)
+
+        yield {"type": "progress", **counts}
+
+    def _write(self, pending: List[Tuple[int, Dict[str, Any]]], embeddings: List[Dict[str, Any]],
+               counts: Dict[str, int]) -> Iterator[Dict[str, Any]]:
+        if not pending:
+            return
+
+        now = datetime.now(timezone.utc)
+        documents = [
+            {**profile, **embedding, "dateUpdated": now}
+            for (_, profile), embedding in zip(pending, embeddings)
+        ]
+        operations = [
+            UpdateOne({IMPORT_KEY: document[IMPORT_KEY]}, {"$setOnInsert": document}, upsert=True)
+            for document in documents
+        ]
+
+        try:
+            result = self.db.alumniProfiles.bulk_write(operations, ordered=False)
+            upserted = result.upserted_ids
+        except BulkWriteError as e:
+            upserted = {item["index"]: item["_id"] for item in e.details.get("upserted", [])}
+            for error in e.details.get("writeErrors", []):
+                if error["code"] == 11000:
+                    # A concurrent import inserted the same linkedInURL first
+                    continue
+                counts["failed"] += 1
+                upserted[error["index"]] = None
+                yield {"type": "error", "line": pending[error["index"]][0], "message": error["errmsg"]}
+
+        inserted = []
+        for index, document in enumerate(documents):
+            object_id = upserted.get(index)
+            if object_id is not None:
+                document["_id"] = object_id
+                inserted.append(document)
+            elif index not in upserted:
+                counts["skipped"] += 1
+
+        counts["imported"] += len(inserted)
+        if inserted:
+            profiles_imported.send(self, profiles=inserted)
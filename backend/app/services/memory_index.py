@@ -0,0 +1,177 @@
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+import logging
+import threading
+import time
+import numpy as np
+from app.signals import profile_changed, profiles_imported, index_rebuilt
+
+logger = logging.getLogger(__name__)
+
+def object_array(values: List[Any]) -> np.ndarray:
+    """1-d object array of ids (np.array would try to nest sequences)"""
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+class MemoryVectorIndex(ABC):
+    """
+    Base for vector stores that search profile vectors held in memory
+
+    The index is one (ids, matrix) tuple replaced with a single assignment,
+    so a search always reads rows and ids of the same version. The
+    profile_changed / profiles_imported receivers keep it current: new
+    profiles are appended, updated ones have their row replaced and deleted
+    ones are dropped, each time in a new matrix (a search may be reading the
+    current one without the GIL). A background thread re-reads everything every
+    refresh_seconds for writes made by other processes, and index_rebuilt
+    is only sent when that actually changed the index.
+
+    """
+
+    def __init__(self, database, refresh_seconds: int = 300):
+        self.db = database
+        self.refresh_seconds = refresh_seconds
+        self._index: Tuple[np.ndarray, np.ndarray] = (object_array([]), np.empty((0, 0), dtype=np.float32))
+        # Row of each id; only touched under _lock
+        self._rows: Dict[Any, int] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+        # Serializes full reads so concurrent first searches share one
+        self._load_lock = threading.RLock()
+        # Writes seen while load() reads MongoDB, replayed onto what it read
+        self._pending: Optional[List[Tuple[str, List[Dict[str, Any]]]]] = None
+        self._refresher = None
+        profile_changed.connect(self._on_profile_changed, weak=False)
+        profiles_imported.connect(self._on_profiles_imported, weak=False)
+
+    def __len__(self) -> int:
+        return len(self._index[0])
+
+    @abstractmethod
+    def _read_all(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(ids, matrix) for every profile in alumniProfiles"""
+
+    @abstractmethod
+    def _vectors(self, profiles: Iterable[Dict[str, Any]]) -> Tuple[List[Any], np.ndarray]:
+        """(ids, rows) for the given profile documents that have usable vectors"""
+
+    def warmup(self) -> None:
+        """Build the index now instead of on the first search"""
+        self.snapshot()
+
+    def snapshot(self) -> Tuple[np.ndarray, np.ndarray]:
+        """The current (ids, matrix); loads it first if nothing has yet"""
+        if not self._loaded:
+            # Only searches arriving before warmup finished wait for this
+            with self._load_lock:
+                if not self._loaded:
+                    self.load()
+        if self._refresher is None and self.refresh_seconds > 0:
+            with self._lock:
+                if self._refresher is None:
+                    self._refresher = threading.Thread(
+                        target=self._refresh_loop, name=f"{type(self).__name__}-refresh", daemon=True
+                    )
+                    self._refresher.start()
+        return self._index
+
+    def _refresh_loop(self) -> None:
+        while True:
+            time.sleep(self.refresh_seconds)
+            try:
+                self.load()
+            except Exception as e:
+                logger.error(f"Reloading {type(self).__name__} failed: {str(e)}")
+
+    def load(self) -> bool:
+        """Re-read every vector from alumniProfiles; returns whether the index changed"""
+        started = time.monotonic()
+        with self._load_lock:
+            with self._lock:
+                self._pending = []
+            try:
+                ids, matrix = self._read_all()
+                with self._lock:
+                    current_ids, current = self._index
+                    changed = not self._loaded or not (
+                        np.array_equal(ids, current_ids) and np.array_equal(matrix, current)
+                    )
+                    self._replace(ids, matrix)
+                    for action, profiles in self._pending:
+                        self._apply(action, profiles)
+                    self._loaded = True
+            finally:
+                with self._lock:
+                    self._pending = None
+
+        if changed:
+            index_rebuilt.send(self, size=len(ids), nbytes=matrix.nbytes)
+            logger.info(
+                f"Loaded {type(self).__name__} with {len(ids)} vectors ({matrix.nbytes} bytes) "
+                f"in {time.monotonic() - started:.2f}s"
+            )
+        return changed
+
+    def _replace(self, ids: np.ndarray, matrix: np.ndarray) -> None:
+        self._rows = {_id: row for row, _id in enumerate(ids)}
+        self._index = (ids, matrix)
+
+    def _apply(self, action: str, profiles: List[Dict[str, Any]]) -> None:
+        if action == 'deleted':
+            self._remove([profile["_id"] for profile in profiles])
+        else:
+            self._upsert(profiles)
+
+    def _upsert(self, profiles: List[Dict[str, Any]]) -> None:
+        ids, rows = self._vectors(profile for profile in profiles if "_id" in profile)
+        if not ids:
+            return
+        index_ids, matrix = self._index
+        if matrix.size and rows.shape[1] != matrix.shape[1]:
+            logger.warning(f"Ignoring {len(ids)} vectors of width {rows.shape[1]}, index has {matrix.shape[1]}")
+            return
+
+        added, patched = [], []
+        for i, _id in enumerate(ids):
+            row = self._rows.get(_id)
+            if row is None:
+                added.append(i)
+            else:
+                patched.append((row, i))
+        if patched:
+            # Never written in place: a search may be scoring this matrix right now
+            matrix = matrix.copy()
+            for row, i in patched:
+                matrix[row] = rows[i]
+        if added:
+            for offset, i in enumerate(added):
+                self._rows[ids[i]] = len(index_ids) + offset
+            index_ids = np.concatenate([index_ids, object_array([ids[i] for i in added])])
+            matrix = np.vstack([matrix, rows[added]]) if matrix.size else rows[added]
+        self._index = (index_ids, matrix)
+
+    def _remove(self, ids: List[Any]) -> None:
+        rows = [self._rows[_id] for _id in ids if _id in self._rows]
+        if not rows:
+            return
+        index_ids, matrix = self._index
+        keep = np.ones(len(index_ids), dtype=bool)
+        keep[rows] = False
+        self._replace(index_ids[keep], matrix[keep])
+
+    def _write(self, action: str, profiles: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((action, profiles))
+            self._apply(action, profiles)
+
+    def _on_profile_changed(self, sender, action: str = None, profile: Dict[str, Any] = None,
+                            previous: Dict[str, Any] = None, **kwargs) -> None:
+        if action == 'deleted':
+            self._write('deleted', [previous])
+        elif profile is not None:
+            self._write(action, [profile])
+
+    def _on_profiles_imported(self, sender, profiles: List[Dict[str, Any]] = (), **kwargs) -> None:
+        self._write('imported', list(profiles))
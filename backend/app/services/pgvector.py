@@ -0,0 +1,341 @@
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Iterable
+import logging
+import struct
+import threading
+from psycopg2.pool import ThreadedConnectionPool
+from psycopg2.extras import execute_values
+from pymongo import UpdateOne
+from bson import ObjectId
+from bson.binary import Binary
+from app.utils.vectors import vector_to_numpy
+from app.utils.metrics import timed
+from app.signals import profile_changed, profiles_imported
+
+logger = logging.getLogger(__name__)
+
+# Filterable profile fields -> AlumniProfiles columns
+FILTER_COLUMNS = {
+    'company': 'Company',
+    'university': 'University',
+    'highSchool': 'HighSchool',
+    'currentRole': 'CurrentRole',
+}
+
+# Columns written from a MongoDB profile, in upsert order, with the
+# VARCHAR length of the legacy table (db/Alumni_table.py)
+PROFILE_COLUMNS = (
+    ('fullName', 'FullName', 100),
+    ('currentRole', 'CurrentRole', 100),
+    ('company', 'Company', 100),
+    ('university', 'University', 100),
+    ('highSchool', 'HighSchool', 100),
+    ('linkedInURL', 'LinkedInURL', 255),
+    ('dateUpdated', 'DateUpdated', None),
+)
+
+# A truncated URL would be a broken link, so such profiles are skipped instead
+UNTRUNCATED_FIELDS = frozenset({'linkedInURL'})
+
+def column_values(profile: Dict[str, Any]) -> Optional[List[Any]]:
+    """PROFILE_COLUMNS values of a profile, fitted to the columns; None if it cannot fit"""
+    values = []
+    for field, _, max_length in PROFILE_COLUMNS:
+        value = profile.get(field)
+        if max_length and isinstance(value, str) and len(value) > max_length:
+            if field in UNTRUNCATED_FIELDS:
+                return None
+            value = value[:max_length]
+        values.append(value)
+    return values
+
+def legacy_object_id(alumni_id: int) -> ObjectId:
+    """
+    ObjectId of the MongoDB copy of a Postgres row
+
+    Same as db/migrate_postgres.py: a zero timestamp followed by the 8-byte
+    AlumniID.
+    """
+    return ObjectId(struct.pack('>IQ', 0, alumni_id))
+
+def legacy_alumni_id(profile_id: Any) -> Optional[int]:
+    """AlumniID a legacy_object_id() was built from, or None for any other id"""
+    try:
+        timestamp, alumni_id = struct.unpack('>IQ', ObjectId(profile_id).binary)
+    except Exception:
+        return None
+    return alumni_id if timestamp == 0 else None
+
+class PgVectorStore:
+    """
+    Vector store for Postgres deployments using the pgvector extension
+
+    Embeddings live in an Embedding vector column on AlumniProfiles with an
+    HNSW index, so top-k search, filtering and profile hydration run as a
+    single SQL query.
+
+    MongoDB stays the profile store. Rows are matched to its profiles by a
+    ProfileID column; migrated rows also by AlumniID (see legacy_object_id).
+    The profile_changed / profiles_imported receivers copy each write's
+    fields and alumniEmb across, and backfill() fills the column for
+    profiles written before. Results carry the MongoDB id, so they can be
+    passed straight to the profile endpoints.
+    """
+    
+    embedding_types = ("int8",)
+
+    def __init__(self, dsn: str, dimensions: int, min_pool_size: int = 1,
+                 max_pool_size: int = 10, ef_search: int = 100):
+        """The connection pool is opened and the schema ensured on first use"""
+        self.dsn = dsn
+        self.min_pool_size = min_pool_size
+        self.max_pool_size = max_pool_size
+        self.dimensions = dimensions
+        self.ef_search = ef_search
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._schema_ready = False
+        profile_changed.connect(self._on_profile_changed, weak=False)
+        profiles_imported.connect(self._on_profiles_imported, weak=False)
+
+    @property
+    def pool(self) -> ThreadedConnectionPool:
+        # Opening min_pool_size connections blocks, so keep it out of app startup
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadedConnectionPool(self.min_pool_size, self.max_pool_size, self.dsn)
+        return self._pool
+
+    def warmup(self) -> None:
+        """Open the pool and ensure the schema ahead of the first search"""
+        with self.connection():
+            pass
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection for one transaction"""
+        conn = self.pool.getconn()
+        try:
+            with conn:
+                if not self._schema_ready:
+                    self.ensure_schema(conn)
+                yield conn
+        finally:
+            self.pool.putconn(conn)
+
+    def ensure_schema(self, conn) -> None:
+        """Create the pgvector extension, embedding column and HNSW index"""
+        with conn.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS vector")
+            cursor.execute(
+                f"ALTER TABLE AlumniProfiles ADD COLUMN IF NOT EXISTS Embedding vector({int(self.dimensions)})"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS alumniprofiles_embedding_hnsw "
+                "ON AlumniProfiles USING hnsw (Embedding vector_cosine_ops)"
+            )
+            cursor.execute("ALTER TABLE AlumniProfiles ADD COLUMN IF NOT EXISTS ProfileID VARCHAR(24)")
+            cursor.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS alumniprofiles_profile_id ON AlumniProfiles (ProfileID)"
+            )
+        self._schema_ready = True
+        logger.info("pgvector schema ready")
+
+    @staticmethod
+    def to_literal(vector: Binary) -> str:
+        """Format a BSON vector as a pgvector text literal"""
+        return '[' + ','.join(map(str, vector_to_numpy(vector).tolist())) + ']'
+
+    def upsert_profiles(self, profiles: Iterable[Dict[str, Any]]) -> int:
+        """
+        Write MongoDB profiles (fields and alumniEmb) to AlumniProfiles
+
+        Migrated profiles update their original row; others get a row of
+        their own keyed on ProfileID. Text longer than its legacy VARCHAR
+        column is truncated, so one profile cannot fail the whole batch;
+        profiles without an alumniEmb of the configured dimensions, or with
+        a linkedInURL that does not fit, are skipped.
+
+        Returns:
+            Number of rows written
+        """
+        legacy, other = [], []
+        for profile in profiles:
+            vector = profile.get('alumniEmb')
+            if vector is None or '_id' not in profile:
+                continue
+            if len(vector_to_numpy(vector)) != self.dimensions:
+                logger.warning(f"Not indexing profile {profile['_id']}: alumniEmb is not {self.dimensions}-d")
+                continue
+            values = column_values(profile)
+            if values is None:
+                logger.warning(f"Not indexing profile {profile['_id']}: linkedInURL is too long for AlumniProfiles")
+                continue
+            row = (str(profile['_id']), *values, self.to_literal(vector))
+            alumni_id = legacy_alumni_id(profile['_id'])
+            if alumni_id is not None:
+                legacy.append((alumni_id, *row))
+            else:
+                other.append(row)
+        if not legacy and not other:
+            return 0
+
+        columns = ['ProfileID', *(column for _, column, _ in PROFILE_COLUMNS), 'Embedding']
+        updates = ', '.join(f"{column} = EXCLUDED.{column}" for column in columns)
+        values = ', '.join(['%s'] * (len(columns) - 1))
+        written = 0
+        with self.connection() as conn, conn.cursor() as cursor:
+            if legacy:
+                execute_values(
+                    cursor,
+                    f"INSERT INTO AlumniProfiles (AlumniID, {', '.join(columns)}) VALUES %s "
+                    f"ON CONFLICT (AlumniID) DO UPDATE SET {updates}",
+                    legacy,
+                    template=f"(%s, {values}, %s::vector)",
+                    page_size=len(legacy)
+                )
+                written += cursor.rowcount
+            if other:
+                execute_values(
+                    cursor,
+                    f"INSERT INTO AlumniProfiles ({', '.join(columns)}) VALUES %s "
+                    f"ON CONFLICT (ProfileID) DO UPDATE SET {updates}",
+                    other,
+                    template=f"({values}, %s::vector)",
+                    page_size=len(other)
+                )
+                written += cursor.rowcount
+        return written
+
+    def remove(self, profile_ids: Iterable[Any]) -> int:
+        """Take profiles out of search (the rows themselves are kept)"""
+        profile_ids = [str(profile_id) for profile_id in profile_ids]
+        if not profile_ids:
+            return 0
+        with self.connection() as conn, conn.cursor() as cursor:
+            cursor.execute(
+                "UPDATE AlumniProfiles SET Embedding = NULL WHERE ProfileID = ANY(%s)",
+                (profile_ids,)
+            )
+            return cursor.rowcount
+
+    def _on_profile_changed(self, sender, action: str = None, profile: Dict[str, Any] = None,
+                            previous: Dict[str, Any] = None, **kwargs) -> None:
+        # A failure here must not fail the MongoDB write; backfill() repairs it
+        try:
+            if action == 'deleted':
+                self.remove([previous['_id']])
+            else:
+                self.upsert_profiles([profile])
+        except Exception as e:
+            logger.error(f"pgvector sync failed ({action}): {str(e)}; run `flask backfill-pgvector`")
+
+    def _on_profiles_imported(self, sender, profiles: List[Dict[str, Any]] = (), **kwargs) -> None:
+        try:
+            self.upsert_profiles(profiles)
+        except Exception as e:
+            logger.error(f"pgvector sync failed (import): {str(e)}; run `flask backfill-pgvector`")
+
+    def backfill(self, database, vector_service=None, batch_size: int = 96) -> Dict[str, int]:
+        """
+        Copy every MongoDB profile's alumniEmb into AlumniProfiles
+
+        Args:
+            database: MongoDB database holding alumniProfiles
+            vector_service: When given, profiles without alumniEmb (e.g. ones
+                migrated from Postgres, whose faissMapping vectors are 384-d
+                MiniLM and unusable here) are embedded and updated in
+                MongoDB first; otherwise they are skipped
+            batch_size: Profiles per embed call and per upsert
+
+        Returns:
+            Counts of profiles upserted, embedded, skipped and failed
+        """
+        counts = {"upserted": 0, "embedded": 0, "skipped": 0, "failed": 0}
+        projection = {'alumniEmbBin': 0}
+
+        def flush(batch: List[Dict[str, Any]]) -> None:
+            missing = [profile for profile in batch if profile.get('alumniEmb') is None]
+            if missing and vector_service is not None:
+                try:
+                    embeddings = vector_service.generate_embeddings_batch(missing)
+                    database.alumniProfiles.bulk_write([
+                        UpdateOne({'_id': profile['_id']}, {'$set': fields})
+                        for profile, fields in zip(missing, embeddings)
+                    ], ordered=False)
+                    for profile, fields in zip(missing, embeddings):
+                        profile.update(fields)
+                    counts["embedded"] += len(missing)
+                except Exception as e:
+                    logger.error(f"Embedding {len(missing)} profiles failed: {str(e)}")
+                    counts["failed"] += len(missing)
+                    batch = [profile for profile in batch if profile.get('alumniEmb') is not None]
+            elif missing:
+                counts["skipped"] += len(missing)
+            counts["upserted"] += self.upsert_profiles(batch)
+
+        batch = []
+        for profile in database.alumniProfiles.find({}, projection).batch_size(batch_size):
+            batch.append(profile)
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+        return counts
+
+    def search(self, query_vectors: Dict[str, Binary], k: int = 5,
+               filters: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """
+        Top-k cosine search with optional exact-match filters
+
+        Scores are reported on the same 0-1 scale as Atlas vectorSearchScore
+        for cosine similarity.
+        """
+        conditions = ["Embedding IS NOT NULL"]
+        params: List[Any] = []
+        for field, value in (filters or {}).items():
+            conditions.append(f"{FILTER_COLUMNS[field]} = %s")
+            params.append(value)
+
+        literal = self.to_literal(query_vectors["int8"])
+        query = f"""
+            SELECT AlumniID, ProfileID, FullName, CurrentRole, Company, University, HighSchool,
+                   LinkedInURL, DateUpdated, (2 - (Embedding <=> %s::vector)) / 2 AS score
+            FROM AlumniProfiles
+            WHERE {' AND '.join(conditions)}
+            ORDER BY Embedding <=> %s::vector
+            LIMIT %s
+        """
+
+        with self.connection() as conn, conn.cursor() as cursor:
+            # Filters discard candidates after the graph walk, so widen it to still fill k
+            cursor.execute("SET LOCAL hnsw.ef_search = %s", (max(self.ef_search, k * 2),))
+            with timed('vector_search'):
+                cursor.execute(query, [literal, *params, literal, k])
+            with timed('hydration'):
+                rows = cursor.fetchall()
+
+        return [
+            {
+                "profile": {
+                    # The MongoDB id, as the profile endpoints expect
+                    "_id": profile_id or str(legacy_object_id(alumni_id)),
+                    "fullName": full_name,
+                    "currentRole": current_role,
+                    "company": company,
+                    "university": university,
+                    "highSchool": high_school,
+                    "linkedInURL": linkedin_url,
+                    "dateUpdated": date_updated
+                },
+                "similarity_score": float(score)
+            }
+            for alumni_id, profile_id, full_name, current_role, company, university, high_school, linkedin_url, date_updated, score in rows
+        ]
+
+    def close(self) -> None:
+        """Close all pooled connections"""
+        if self._pool is not None:
+            self._pool.closeall()
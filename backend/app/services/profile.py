@@ -1,59 +1,93 @@
-import base64
 from flask import current_app
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timezone
 from bson import ObjectId
-from app.models.profile import AlumniProfile
+from app.models.profile import AlumniProfile, ProfileRecord
 from bson.binary import Binary
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from app.signals import profile_changed, profiles_imported
 
 
 
+# Stored vector fields that are never returned in API responses
+EMBEDDING_FIELDS = ('alumniEmb', 'alumniEmbBin')
+
+DUPLICATE_KEY = 11000
+# profile_linkedin_url in app.utils.db.INDEXES makes linkedInURL unique
+DUPLICATE_PROFILE_MESSAGE = "A profile with this linkedInURL already exists"
+
+# Lets version lookups for conditional GETs be answered from the index alone
+# (declared as profile_version in app.utils.db.INDEXES)
+VERSION_INDEX = [('_id', 1), ('dateUpdated', 1)]
+
 class ProfileService:
     def __init__(self, database: None):
         self.db = database
-        
+    
     async def create_profile(self, profile_data: Dict[str, Any]) -> Optional[AlumniProfile]:
-        """Create a new alumni profile with vector embedding."""
+        """
+        Create a new alumni profile with vector embedding.
+        
+        Raises DuplicateKeyError when the linkedInURL is already taken;
+        returns None if the insert fails for any other reason.
+        """
         try:
             
             profile_data['dateUpdated'] = datetime.now(timezone.utc)
     
-            result = self.db.alumniProfiles.insert_one(profile_data)
+            # insert_one fills in profile_data['_id'], so no read-back is needed
+            self.db.alumniProfiles.insert_one(profile_data)
+            profile_changed.send(self, action='created', profile=profile_data, previous=None)
             
-            created_profile = self.db.alumniProfiles.find_one(
-                {'_id': result.inserted_id}
-            )
-            
-            if created_profile:
-                # Convert ObjectId to string for JSON serialization
-                created_profile['_id'] = str(created_profile['_id'])
-                if 'alumniEmb' in created_profile:
-                    created_profile['alumniEmb'] = base64.b64encode(created_profile['alumniEmb']).decode('utf-8')
-                return created_profile
-                
-            return None
+            # Embeddings stay server-side; the JSON provider handles ObjectId/datetime
+            return {
+                key: value for key, value in profile_data.items()
+                if key not in EMBEDDING_FIELDS
+            }
             
+        except DuplicateKeyError:
+            raise
         except Exception as e:
             print(f"Error creating profile: {str(e)}")
             return None 
         
-    def get_profile(self, profile_id: str) -> Optional[AlumniProfile]:
-        """Retrieve a profile by ID."""
+    def get_profile(self, profile_id: str, include_embedding: bool = False) -> Optional[ProfileRecord]:
+        """Retrieve a profile by ID, without its embedding unless asked for."""
         try:
             object_id = ObjectId(profile_id)
             profile_data = self.db.alumniProfiles.find_one(
-                {'_id': object_id}
+                {'_id': object_id},
+                ProfileRecord.projection(include_embedding)
             )
             
             if not profile_data:
                 return None
             
-            return AlumniProfile.parse_obj(profile_data) 
+            return ProfileRecord(profile_data)
         
         except Exception as e:
             print(f"Error retrieving profile: {str(e)}")
             return None
         
+    def get_profile_version(self, profile_id: str) -> Optional[datetime]:
+        """Return a profile's dateUpdated with a covered index lookup, or None."""
+        try:
+            query = {'_id': ObjectId(profile_id)}
+            projection = {'_id': 1, 'dateUpdated': 1}
+        except Exception:
+            return None
+        
+        try:
+            doc = next(self.db.alumniProfiles.find(query, projection).hint(VERSION_INDEX).limit(1), None)
+        except OperationFailure:
+            # Index not built yet; the _id lookup still works, just not covered
+            doc = self.db.alumniProfiles.find_one(query, projection)
+        
+        if not doc:
+            return None
+        return doc.get('dateUpdated') or datetime.fromtimestamp(0, timezone.utc)
+        
     async def update_profile(
         self,
         profile_id: str,
@@ -63,15 +97,18 @@ class ProfileService:
         try:
             update_data['dateUpdated'] = datetime.now(timezone.utc)
 
-            result = await self.db.alumniProfiles.find_one_and_update(
+            previous = self.db.alumniProfiles.find_one_and_update(
                 {'_id': ObjectId(profile_id)},
                 {'$set': update_data},
-                return_document=True
+                return_document=ReturnDocument.BEFORE
             )
             
-            if not result:
+            if not previous:
                 return None
             
+            result = {**previous, **update_data}
+            profile_changed.send(self, action='updated', profile=result, previous=previous)
+            
             profile = AlumniProfile(**result)
             
             return profile
@@ -83,13 +120,14 @@ class ProfileService:
         """Delete a profile and its associated vector."""
         try:
             # Delete profile
-            result = await self.db.alumniProfiles.delete_one(
+            previous = self.db.alumniProfiles.find_one_and_delete(
                 {'_id': ObjectId(profile_id)}
             )
             
-            if result.deleted_count == 0:
+            if not previous:
                 return False
             
+            profile_changed.send(self, action='deleted', profile=None, previous=previous)
             return True
         except Exception as e:
             print(f"Error deleting profile: {str(e)}")
@@ -98,17 +136,37 @@ class ProfileService:
     async def create_many_profiles(
         self,
         profiles_data: List[Dict[str, Any]]
-    ) -> List[AlumniProfile]:
-        """Batch create multiple profiles with vector embeddings."""
-        created_profiles = []
+    ) -> Tuple[List[Dict[str, Any]], List[Tuple[int, str]]]:
+        """
+        Insert already-embedded profiles with one unordered bulk insert.
+        
+        Returns:
+            The created profiles (without embeddings) and (position, message)
+            for each profile that could not be inserted
+        """
+        if not profiles_data:
+            return [], []
         
+        now = datetime.now(timezone.utc)
         for profile_data in profiles_data:
-            try:
-                profile = await self.create_profile(profile_data)
-                if profile:
-                    created_profiles.append(profile)
-            except Exception as e:
-                print(f"Error in batch profile creation: {str(e)}")
-                continue
+            profile_data['dateUpdated'] = now
+        
+        failures = []
+        try:
+            # insert_many fills in each document's _id, so no read-back is needed
+            self.db.alumniProfiles.insert_many(profiles_data, ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get('writeErrors', []):
+                message = DUPLICATE_PROFILE_MESSAGE if error['code'] == DUPLICATE_KEY else error['errmsg']
+                failures.append((error['index'], message))
+        
+        failed = {position for position, _ in failures}
+        inserted = [profile for position, profile in enumerate(profiles_data) if position not in failed]
+        if inserted:
+            profiles_imported.send(self, profiles=inserted)
         
-        return created_profiles
\ No newline at end of file
+        created = [
+            {key: value for key, value in profile.items() if key not in EMBEDDING_FIELDS}
+            for profile in inserted
+        ]
+        return created, failures
@@ -0,0 +1,124 @@
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+import logging
+import numpy as np
+from bson.binary import Binary
+from app.utils.vectors import vector_to_numpy
+from app.utils.metrics import timed
+from app.services.memory_index import MemoryVectorIndex, object_array
+
+logger = logging.getLogger(__name__)
+
+# Bits set in each byte value, for NumPy builds without np.bitwise_count
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint16)
+
+PROFILE_FIELDS = ("fullName", "currentRole", "company", "university", "highSchool", "linkedInURL", "dateUpdated")
+
+def hamming_distances(codes: np.ndarray, query_bits: np.ndarray) -> np.ndarray:
+    """Hamming distance between each row of packed codes and the packed query"""
+    xor = np.bitwise_xor(codes, query_bits)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(xor).sum(axis=1, dtype=np.uint32)
+    return _POPCOUNT[xor].sum(axis=1, dtype=np.uint32)
+
+def sign_bits(int8_vector: np.ndarray) -> np.ndarray:
+    """Approximate ubinary bits for profiles stored before alumniEmbBin existed"""
+    return np.packbits(int8_vector > 0)
+
+class BinaryRescoreStore(MemoryVectorIndex):
+    """
+    Two-stage retrieval over alumniProfiles
+
+    The first pass scans packed 1-bit vectors (alumniEmbBin, 128 bytes per
+    profile: 8x smaller than int8 and 32x smaller than float32) held in
+    memory with vectorized Hamming distance. The widened candidate set is
+    then rescored against the stored int8 vectors, fetched together with
+    the profile fields in a single query.
+    """
+
+    embedding_types = ("int8", "ubinary")
+
+    def __init__(self, database, oversample: int = 10, refresh_seconds: int = 300):
+        super().__init__(database, refresh_seconds=refresh_seconds)
+        self.oversample = oversample
+
+    @staticmethod
+    def _code(profile: Dict[str, Any]) -> Optional[np.ndarray]:
+        if profile.get("alumniEmbBin") is not None:
+            return vector_to_numpy(profile["alumniEmbBin"])
+        if profile.get("alumniEmb") is not None:
+            return sign_bits(vector_to_numpy(profile["alumniEmb"]))
+        return None
+
+    def _vectors(self, profiles: Iterable[Dict[str, Any]]) -> Tuple[List[Any], np.ndarray]:
+        ids, packed = [], []
+        for profile in profiles:
+            code = self._code(profile)
+            if code is not None:
+                ids.append(profile["_id"])
+                packed.append(code)
+        return ids, np.vstack(packed) if packed else np.empty((0, 0), dtype=np.uint8)
+
+    def _read_all(self) -> Tuple[np.ndarray, np.ndarray]:
+        ids, packed = [], []
+        for doc in self.db.alumniProfiles.find(
+            {"alumniEmbBin": {"$exists": True}}, {"alumniEmbBin": 1}
+        ).batch_size(10000):
+            ids.append(doc["_id"])
+            packed.append(vector_to_numpy(doc["alumniEmbBin"]))
+
+        derived = 0
+        for doc in self.db.alumniProfiles.find(
+            {"alumniEmbBin": {"$exists": False}, "alumniEmb": {"$exists": True}}, {"alumniEmb": 1}
+        ).batch_size(10000):
+            ids.append(doc["_id"])
+            packed.append(sign_bits(vector_to_numpy(doc["alumniEmb"])))
+            derived += 1
+
+        if derived:
+            logger.warning(f"{derived} profiles have no alumniEmbBin; using bits derived from int8")
+        return object_array(ids), np.vstack(packed) if packed else np.empty((0, 0), dtype=np.uint8)
+
+    def search(self, query_vectors: Dict[str, Binary], k: int = 5,
+               filters: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """Hamming first pass, int8 rescoring of the top candidates"""
+        ids, codes = self.snapshot()
+        if not len(ids):
+            return []
+
+        # Filters are applied while rescoring, so widen the first pass to still fill k
+        oversample = self.oversample * (4 if filters else 1)
+        num_candidates = min(len(ids), k * oversample)
+
+        with timed('vector_search'):
+            distances = hamming_distances(codes, vector_to_numpy(query_vectors["ubinary"]))
+            if num_candidates < len(ids):
+                candidates = np.argpartition(distances, num_candidates - 1)[:num_candidates]
+            else:
+                candidates = np.arange(len(ids))
+
+        query = {"_id": {"$in": ids[candidates].tolist()}}
+        if filters:
+            query.update(filters)
+        projection = {field: 1 for field in PROFILE_FIELDS}
+        projection["alumniEmb"] = 1
+        with timed('hydration'):
+            docs = [doc for doc in self.db.alumniProfiles.find(query, projection) if doc.get("alumniEmb")]
+        if not docs:
+            return []
+
+        query_int8 = vector_to_numpy(query_vectors["int8"]).astype(np.float32)
+        matrix = np.vstack([vector_to_numpy(doc["alumniEmb"]) for doc in docs]).astype(np.float32)
+        cosine = matrix @ query_int8 / (
+            np.linalg.norm(matrix, axis=1) * np.linalg.norm(query_int8) + 1e-12
+        )
+        top = np.argsort(-cosine)[:k]
+
+        results = []
+        for i in top:
+            doc = docs[i]
+            results.append({
+                "profile": {"_id": doc["_id"], **{field: doc.get(field) for field in PROFILE_FIELDS}},
+                # Same 0-1 scale as Atlas vectorSearchScore for cosine
+                "similarity_score": float((1 + cosine[i]) / 2)
+            })
+        return results
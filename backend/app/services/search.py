@@ -1,18 +1,53 @@
 from datetime import datetime
-from typing import List, Dict, Any
-import cohere
+from typing import List, Dict, Any, Optional
 from flask import current_app
 from app.models.profile import AlumniProfile
 from bson.binary import Binary, BinaryVectorDtype
+from app.utils.metrics import timed, COHERE_CALLS, ERRORS
+from app.services.embeddings import get_embedding_client
 
 class SearchService:
     """Service for handling alumni search operations using Atlas Search"""
     
-    def __init__(self, database: None, cohere_api_key: str, model_name: str = "embed-english-v3.0"):
-        """Initialize the search service with Cohere client"""
-        self.co = cohere.Client(cohere_api_key)
+    # Run end to end by warmup() so the first user query hits a warm path
+    WARMUP_QUERY = "software engineer at Google"
+    
+    def __init__(self, database: None, cohere_api_key: str, model_name: str = "embed-english-v3.0",
+                 vector_store=None):
+        """
+        Initialize the search service; the Cohere client (or its offline
+        stand-in) is created on first use
+        
+        Args:
+            vector_store: Optional backend exposing embedding_types and
+                search(query_vectors, k, filters); Atlas $vectorSearch on
+                alumniProfiles is used when omitted
+        """
+        self.cohere_api_key = cohere_api_key
+        self._co = None
         self.model_name = model_name
         self.db = database
+        self.vector_store = vector_store
+
+    @property
+    def co(self):
+        if self._co is None:
+            self._co = get_embedding_client(self.cohere_api_key)
+        return self._co
+
+    @co.setter
+    def co(self, client) -> None:
+        self._co = client
+
+    def warmup(self) -> None:
+        """
+        Create the embedding client, load the vector store and run one
+        synthetic query end to end; raises if any step fails
+        """
+        self.co
+        if hasattr(self.vector_store, 'warmup'):
+            self.vector_store.warmup()
+        self._search(self.WARMUP_QUERY, k=1)
 
     def generate_bson_vector(self, vector, vector_dtype):
         """Convert vector to BSON Binary format"""
@@ -20,89 +55,108 @@ class SearchService:
     
     def generate_embedding(self, text: str) -> Binary:
         """Generate int8 embeddings using Cohere and convert to BSON Binary"""
+        return self.generate_embeddings(text, ("int8",))["int8"]
+    
+    def generate_embeddings(self, text: str, embedding_types=("int8",)) -> Dict[str, Binary]:
+        """
+        Generate query embeddings of several types in one Cohere call
+        
+        Args:
+            text: Query text
+            embedding_types: Cohere embedding types, e.g. ("int8", "ubinary")
+            
+        Returns:
+            Mapping of embedding type to BSON Binary vector
+        """
         try:
-            response = self.co.embed(
-                texts=[text],
-                model=self.model_name,
-                input_type='search_query',
-                embedding_types=["int8"]
-            )
-            # Get int8 embeddings
-            int8_embedding = response.embeddings.int8[0]
-            # Convert to BSON Binary format
-            bson_vector = self.generate_bson_vector(int8_embedding, BinaryVectorDtype.INT8)
-            return bson_vector
+            with timed('embed'):
+                response = self.co.embed(
+                    texts=[text],
+                    model=self.model_name,
+                    input_type='search_query',
+                    embedding_types=list(embedding_types)
+                )
+            COHERE_CALLS.labels('search_query', 'success').inc()
+            embeddings = response.embeddings
+            vectors = {}
+            if "int8" in embedding_types:
+                vectors["int8"] = self.generate_bson_vector(embeddings.int8[0], BinaryVectorDtype.INT8)
+            if "ubinary" in embedding_types:
+                vectors["ubinary"] = self.generate_bson_vector(embeddings.ubinary[0], BinaryVectorDtype.PACKED_BIT)
+            return vectors
         except Exception as e:
+            COHERE_CALLS.labels('search_query', 'error').inc()
             current_app.logger.error(f"Cohere embedding error: {str(e)}")
             raise
 
-    def search_by_text(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
+    def search_by_text(self, query: str, k: int = 5,
+                       filters: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
         """
         Search alumni profiles using text query with Atlas Search vector search
         
         Args:
             query: Search query text
             k: Number of results to return
+            filters: Optional exact-match filters on profile fields
             
         Returns:
             List of alumni profiles with similarity scores
         """
         try:
-            # Generate query embedding using Cohere
-            query_vector = self.generate_embedding(query)
-            
-            
-            # Construct Atlas Search aggregation pipeline
-            pipeline = [
-                {
-                    "$vectorSearch": {
-                        "index": "alumni_vector_index",
-                        "path": "alumniEmb",
-                        "queryVector": query_vector,
-                        "numCandidates": k * 2,  # Consider more candidates than final results
-                        "limit": k
-                    }
-                },
-                {
-                    "$project": {
-                        "score": {
-                            "$meta": "vectorSearchScore"
-                        },
-                        "fullName": 1,
-                        "currentRole": 1,
-                        "company": 1,
-                        "university": 1,
-                        "highSchool": 1,
-                        "linkedInURL": 1,
-                        "dateUpdated": 1,
-                        "_id": 1
-                    }
-                }
-            ]
-            
-            # Execute search using the alumniProfiles collection
-            search_results = list(self.db.alumniProfiles.aggregate(pipeline))
-            
-            results = []
-            for result in search_results:
-                results.append({
-                    "profile": {
-                        "_id": str(result["_id"]),  # Convert ObjectId to string
-                        "fullName": result.get("fullName"),
-                        "currentRole": result.get("currentRole"),
-                        "company": result.get("company"),
-                        "university": result.get("university"),
-                        "highSchool": result.get("highSchool"),
-                        "linkedInURL": result.get("linkedInURL"),
-                        "dateUpdated": result.get("dateUpdated").isoformat() if result.get("dateUpdated") else None
-                    },
-                    "similarity_score": result["score"]
-                })
-            
-            
-            
-            return results
-            
+            return self._search(query, k, filters)
         except Exception as e:
+            ERRORS.labels('search').inc()
             current_app.logger.error(f"Search error: {str(e)}")
-            return []
\ No newline at end of file
+            return []
+
+    def _search(self, query: str, k: int, filters: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        if self.vector_store is not None:
+            query_vectors = self.generate_embeddings(query, self.vector_store.embedding_types)
+            return self.vector_store.search(query_vectors, k=k, filters=filters)
+        
+        # Generate query embedding using Cohere
+        query_vector = self.generate_embedding(query)
+        
+        vector_search = {
+            "index": "alumni_vector_index",
+            "path": "alumniEmb",
+            "queryVector": query_vector,
+            "numCandidates": k * 2,  # Consider more candidates than final results
+            "limit": k
+        }
+        if filters:
+            vector_search["filter"] = {
+                "$and": [{field: {"$eq": value}} for field, value in filters.items()]
+            }
+        
+        # Construct Atlas Search aggregation pipeline
+        pipeline = [
+            {
+                "$vectorSearch": vector_search
+            },
+            {
+                # Shape results server-side so they go straight to the JSON encoder
+                "$project": {
+                    "_id": 0,
+                    "profile": {
+                        "_id": "$_id",
+                        "fullName": "$fullName",
+                        "currentRole": "$currentRole",
+                        "company": "$company",
+                        "university": "$university",
+                        "highSchool": "$highSchool",
+                        "linkedInURL": "$linkedInURL",
+                        "dateUpdated": "$dateUpdated"
+                    },
+                    "similarity_score": {
+                        "$meta": "vectorSearchScore"
+                    }
+                }
+            }
+        ]
+        
+        # Execute search using the alumniProfiles collection
+        with timed('vector_search'):
+            cursor = self.db.alumniProfiles.aggregate(pipeline)
+        with timed('hydration'):
+            return list(cursor)
@@ -0,0 +1,246 @@
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import heapq
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Profile fields offered as completions
+SUGGEST_FIELDS = ('company', 'university', 'highSchool', 'currentRole')
+
+# Words this short are only matched at the start of a value ("of", "at")
+MIN_INNER_WORD_LENGTH = 3
+
+# Ranked lists are built for every prefix this short at rebuild (their
+# ranges are too wide to scan per request) and kept for longer prefixes
+# once asked for, up to MAX_KEPT_PREFIX_LENGTH characters
+PRECOMPUTED_PREFIX_LENGTH = 2
+MAX_KEPT_PREFIX_LENGTH = 12
+
+def normalize(text: str) -> str:
+    return ' '.join(text.casefold().split())
+
+def _keys_for(value: str) -> List[Tuple[str, str]]:
+    """(key, value) for the whole value and each later word worth matching on"""
+    words = value.split(' ')
+    return [
+        (' '.join(words[i:]), value) for i, word in enumerate(words)
+        if i == 0 or len(word) >= MIN_INNER_WORD_LENGTH
+    ]
+
+class _Ranked:
+    """
+    The most used values under one prefix
+
+    Every value under the prefix that is not a member has a count <= floor,
+    and every member's count is >= floor, so the members sorted by count are
+    the true top of the prefix. Count changes keep that true in O(1) and the
+    list is only rebuilt (by a scan) once too few members are left.
+    """
+    __slots__ = ('members', 'floor')
+
+    def __init__(self, members: Dict[str, int], floor: int):
+        self.members = members
+        self.floor = floor
+
+    def update(self, value: str, count: int) -> None:
+        if count > self.floor:
+            self.members[value] = count
+        elif value in self.members:
+            # Could now rank below a non-member; it becomes one
+            del self.members[value]
+            self.floor = max(self.floor, count)
+
+class _FieldIndex:
+    """
+    Distinct values of one field, searchable by prefix
+
+    Each value is filed under its whole text and under every later word
+    ("university of california berkeley" also under "california berkeley"
+    and "berkeley") in one sorted list of (key, value) pairs, so a prefix
+    is a contiguous slice found with bisect. Values are ranked by how many
+    profiles use them.
+    """
+
+    def __init__(self, depth: int, cache_size: int):
+        self.depth = depth
+        self.cache_size = cache_size
+        self.counts: Dict[str, int] = {}
+        self.labels: Dict[str, str] = {}
+        self.keys: List[Tuple[str, str]] = []
+        self.ranked: 'OrderedDict[str, _Ranked]' = OrderedDict()
+
+    def load(self, groups: Iterable[Tuple[str, int]]) -> None:
+        """Bulk-load (label, count) pairs and rank every short prefix"""
+        for label, count in groups:
+            value = normalize(label)
+            if value and count > 0:
+                self.counts[value] = self.counts.get(value, 0) + count
+                self.labels.setdefault(value, label.strip())
+        self.keys = sorted(key for value in self.counts for key in _keys_for(value))
+        for length in range(1, PRECOMPUTED_PREFIX_LENGTH + 1):
+            for prefix, keys in groupby(self.keys, key=lambda key: key[0][:length]):
+                if len(prefix) == length:
+                    self.ranked[prefix] = self._rank({value for _, value in keys})
+
+    def _rank(self, values: Iterable[str]) -> _Ranked:
+        top = heapq.nlargest(self.depth + 1, ((self.counts[value], value) for value in values))
+        floor = top.pop()[0] if len(top) > self.depth else 0
+        return _Ranked({value: count for count, value in top}, floor)
+
+    def _scan(self, prefix: str) -> _Ranked:
+        start = bisect_left(self.keys, (prefix,))
+        # '\U0010ffff' sorts after any character, closing the prefix range
+        end = bisect_left(self.keys, (prefix + '\U0010ffff',), start)
+        return self._rank({value for _, value in self.keys[start:end]})
+
+    def add(self, label: str, delta: int) -> None:
+        """Adjust how many profiles use a value"""
+        value = normalize(label)
+        if not value:
+            return
+        previous = self.counts.get(value, 0)
+        count = max(previous + delta, 0)
+        if count == previous:
+            return
+        if count:
+            self.counts[value] = count
+            if not previous:
+                self.labels[value] = label.strip()
+                for key in _keys_for(value):
+                    insort(self.keys, key)
+        else:
+            del self.counts[value]
+            del self.labels[value]
+            for key in _keys_for(value):
+                position = bisect_left(self.keys, key)
+                if position < len(self.keys) and self.keys[position] == key:
+                    del self.keys[position]
+        for key, _ in _keys_for(value):
+            for length in range(1, min(len(key), MAX_KEPT_PREFIX_LENGTH) + 1):
+                ranked = self.ranked.get(key[:length])
+                if ranked is not None:
+                    ranked.update(value, count)
+
+    def top(self, prefix: str, limit: int) -> List[Tuple[int, str]]:
+        """(count, value) of the most used values with a word starting with prefix"""
+        ranked = self.ranked.get(prefix)
+        if ranked is not None and (len(ranked.members) >= limit or not ranked.floor):
+            self.ranked.move_to_end(prefix)
+        else:
+            ranked = self._scan(prefix)
+            if len(prefix) <= MAX_KEPT_PREFIX_LENGTH:
+                self.ranked[prefix] = ranked
+                if len(self.ranked) > self.cache_size:
+                    self.ranked.popitem(last=False)
+        return heapq.nlargest(limit, ((count, value) for value, count in ranked.members.items()))
+
+class SuggestService:
+    """
+    Typeahead completions for companies, universities, high schools and roles
+
+    Everything is answered from memory: rebuild() loads the distinct values
+    and their profile counts from MongoDB (at warmup), and the
+    profile_changed / profiles_imported receivers keep them current, so a
+    completion never waits on the database or the embedding provider.
+    """
+
+    def __init__(self, database, fields: Iterable[str] = SUGGEST_FIELDS,
+                 max_limit: int = 20, cache_size: int = 50000):
+        self.db = database
+        self.fields = tuple(fields)
+        self.max_limit = max_limit
+        self.cache_size = cache_size
+        self._indexes = {field: self._new_index() for field in self.fields}
+        self._lock = threading.Lock()
+        # Changes seen while rebuild() reads MongoDB, replayed onto the new
+        # indexes (one the aggregation already saw is counted twice, which
+        # only nudges its rank)
+        self._pending: Optional[List[Tuple[str, str, int]]] = None
+
+    def _new_index(self) -> _FieldIndex:
+        # Twice the largest page, so members dropping out rarely force a rescan
+        return _FieldIndex(depth=2 * self.max_limit, cache_size=self.cache_size)
+
+    def rebuild(self) -> None:
+        """Reload every field's distinct values and counts from MongoDB"""
+        with self._lock:
+            self._pending = []
+        try:
+            indexes = {}
+            for field in self.fields:
+                indexes[field] = self._new_index()
+                indexes[field].load((group['_id'], group['count']) for group in self.db.alumniProfiles.aggregate([
+                    {'$match': {field: {'$type': 'string'}}},
+                    {'$group': {'_id': f'${field}', 'count': {'$sum': 1}}}
+                ]))
+            with self._lock:
+                for field, label, delta in self._pending:
+                    indexes[field].add(label, delta)
+                self._indexes = indexes
+        finally:
+            with self._lock:
+                self._pending = None
+        logger.info("Suggest index built: " + ", ".join(
+            f"{len(index.counts)} {field}" for field, index in indexes.items()
+        ))
+
+    def _apply(self, changes: Iterable[Tuple[str, Any, int]]) -> None:
+        with self._lock:
+            for field, label, delta in changes:
+                if not isinstance(label, str):
+                    continue
+                if self._pending is not None:
+                    self._pending.append((field, label, delta))
+                self._indexes[field].add(label, delta)
+
+    def profile_changed(self, sender, action: str, profile=None, previous=None, **kwargs) -> None:
+        """profile_changed receiver: move counts from the previous version to the new one"""
+        changes = []
+        for field in self.fields:
+            before = previous.get(field) if previous else None
+            after = profile.get(field) if profile else None
+            if before == after:
+                continue
+            if before is not None:
+                changes.append((field, before, -1))
+            if after is not None:
+                changes.append((field, after, 1))
+        self._apply(changes)
+
+    def profiles_imported(self, sender, profiles=(), **kwargs) -> None:
+        """profiles_imported receiver"""
+        self._apply(
+            (field, profile.get(field), 1) for profile in profiles for field in self.fields
+        )
+
+    def suggest(self, prefix: str, field: Optional[str] = None, limit: int = 8) -> List[Dict[str, Any]]:
+        """
+        Most common values with a word starting with prefix
+
+        Args:
+            prefix: What the user has typed so far (case-insensitive)
+            field: One of SUGGEST_FIELDS, or None to search them all
+            limit: Maximum completions, at most max_limit
+
+        Returns:
+            [{"value", "field", "count"}] ordered by count, highest first
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        limit = min(limit, self.max_limit)
+        fields = (field,) if field else self.fields
+        with self._lock:
+            matches = heapq.nlargest(limit, (
+                (count, value, field_name)
+                for field_name in fields
+                for count, value in self._indexes[field_name].top(prefix, limit)
+            ))
+            return [
+                {"value": self._indexes[field_name].labels[value], "field": field_name, "count": count}
+                for count, value, field_name in matches
+            ]
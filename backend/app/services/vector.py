@@ -1,23 +1,37 @@
-from typing import List, Tuple, Optional
+from typing import Any, List, Tuple, Optional, Dict
 from config import Config
 import numpy as np
 from bson import ObjectId
 from bson.binary import Binary, BinaryVectorDtype
 import logging
-import cohere
 from flask import current_app
 from app.models.profile import AlumniProfile
+from app.utils.metrics import COHERE_CALLS
+from app.services.embeddings import get_embedding_client
 
 logger = logging.getLogger(__name__)
 
+# Most texts Cohere's embed endpoint accepts per request
+MAX_EMBED_BATCH = 96
+
 class VectorService:
     """Service for handling vector operations"""
     
     def __init__(self, model_name: str = 'embed-english-v3.0'):
-        """Initialize the vector service"""
-        self.co = cohere.Client(Config.COHERE_KEY)
+        """Initialize the vector service; the embedding client is created on first use"""
+        self._co = None
         self.model_name = model_name
 
+    @property
+    def co(self):
+        if self._co is None:
+            self._co = get_embedding_client(Config.COHERE_KEY)
+        return self._co
+
+    @co.setter
+    def co(self, client) -> None:
+        self._co = client
+
     def generate_profile_vector(self, profile: AlumniProfile) -> Binary:
         """
         Generate vector embedding for a profile
@@ -28,31 +42,66 @@ class VectorService:
         Returns:
             binary vector embedding
         """
-        # Create text representation of profile
-        profile_text = (
-            f"{profile.fullName} works as {profile.currentRole} at {profile.company}. "
-            f"Graduated from {profile.university} and attended {profile.highSchool}."
-        )
-        
-        gen = self.co.embed(
-            texts=[profile_text],
-            model=self.model_name,
-            input_type="search_document",
-            embedding_types=["int8"]).embeddings
+        return self.generate_profile_embeddings(profile)['alumniEmb']
+
+    def generate_profile_embeddings(self, profile: AlumniProfile) -> Dict[str, Binary]:
+        """
+        Generate the int8 and packed 1-bit embeddings for a profile in one call
         
-        vector = gen.int8[0]
+        Args:
+            profile: AlumniProfile instance
+            
+        Returns:
+            Profile fields to store: alumniEmb (int8) and alumniEmbBin (ubinary)
+        """
+        return self.generate_embeddings_batch([profile.model_dump()])[0]
+
+    @staticmethod
+    def profile_text(profile: Dict[str, Any]) -> str:
+        """Text representation of a profile that gets embedded"""
+        return (
+            f"{profile['fullName']} works as {profile['currentRole']} at {profile['company']}. "
+            f"Graduated from {profile['university']} and attended {profile['highSchool']}."
+        )
+
+    def generate_embeddings_batch(self, profiles: List[Dict[str, Any]]) -> List[Dict[str, Binary]]:
+        """
+        Embed up to MAX_EMBED_BATCH profiles with a single Cohere call
         
-        varray = np.array(vector, dtype=np.int8)
+        Args:
+            profiles: Profile documents (validated field dicts)
+            
+        Returns:
+            alumniEmb/alumniEmbBin fields for each profile, in input order
+        """
+        try:
+            gen = self.co.embed(
+                texts=[self.profile_text(profile) for profile in profiles],
+                model=self.model_name,
+                input_type="search_document",
+                embedding_types=["int8", "ubinary"]).embeddings
+        except Exception:
+            COHERE_CALLS.labels('search_document', 'error').inc()
+            raise
+        COHERE_CALLS.labels('search_document', 'success').inc()
         
-        return Binary.from_vector(varray, BinaryVectorDtype.INT8)
+        return [
+            {
+                'alumniEmb': Binary.from_vector(np.array(int8, dtype=np.int8), BinaryVectorDtype.INT8),
+                # Packed bytes as a plain list: NumPy input to from_vector means unpacked bits
+                'alumniEmbBin': Binary.from_vector(ubinary, BinaryVectorDtype.PACKED_BIT)
+            }
+            for int8, ubinary in zip(gen.int8, gen.ubinary)
+        ]
 
-    async def store_vector(self, profile_id: str, vector: Binary) -> bool:
+    async def store_vector(self, profile_id: str, vector: Binary, binary_vector: Optional[Binary] = None) -> bool:
         """
         Store vector embedding in database
         
         Args:
             profile_id: ID of the alumni profile
             vector: Vector embedding
+            binary_vector: Optional packed 1-bit embedding for binary retrieval
             
         Returns:
             Success status
@@ -60,15 +109,13 @@ class VectorService:
         try:
             db = current_app.database
             
-            # Create or update vector document
+            update = {"alumniEmb": vector}
+            if binary_vector is not None:
+                update["alumniEmbBin"] = binary_vector
+            
             db.alumniProfiles.update_one(
-                {"id": profile_id},
-                {
-                    "$set": {
-                        "alumniEmb": vector,
-                    }
-                },
-                upsert=True
+                {"_id": ObjectId(profile_id)},
+                {"$set": update}
             )
             return True
         except Exception as e:
@@ -109,11 +156,11 @@ class VectorService:
                 
             profile = AlumniProfile(**profile_data)
             
-            # Generate new vector
-            new_vector = self.generate_profile_vector(profile)
+            # Generate new vectors
+            embeddings = self.generate_profile_embeddings(profile)
             
-            # Store updated vector
-            return await self.store_vector(profile_id, new_vector)
+            # Store updated vectors
+            return await self.store_vector(profile_id, embeddings['alumniEmb'], embeddings['alumniEmbBin'])
             
         except Exception as e:
             print(f"Error updating vector: {str(e)}")
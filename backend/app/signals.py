@@ -0,0 +1,18 @@
+# app/signals.py
+from blinker import Namespace
+
+_signals = Namespace()
+
+# Sent by ProfileService after a profile is created, updated or deleted.
+# Receivers get action ('created' | 'updated' | 'deleted'), profile (the
+# stored document; for updates the new version) and previous (the prior
+# version for updates and deletes, else None).
+profile_changed = _signals.signal('profile-changed')
+
+# Sent by ImportService after each bulk-inserted import batch (and by
+# ProfileService for /profiles/batch), instead of one profile_changed per
+# profile. Receivers get profiles (the inserted documents).
+profiles_imported = _signals.signal('profiles-imported')
+
+# Sent whenever an in-process vector index is (re)built
+index_rebuilt = _signals.signal('index-rebuilt')
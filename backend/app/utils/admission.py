@@ -0,0 +1,117 @@
+# app/utils/admission.py
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Optional
+import contextvars
+import logging
+import sys
+import threading
+import time
+from flask import g, has_app_context
+from app.utils.metrics import SEARCH_QUEUE_DEPTH, SEARCH_IN_FLIGHT, SEARCH_REJECTIONS, SEARCH_TIMEOUTS, record_stage
+
+logger = logging.getLogger(__name__)
+
+class Overloaded(Exception):
+    """Raised when a search is shed rather than left to queue"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Search rejected: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+class SearchTimeout(Exception):
+    """Raised when an admitted search is still running after run_timeout"""
+
+class AdmissionController:
+    """
+    A fixed pool of search workers behind a bounded queue
+
+    At most `workers` searches run at once and at most `queue_size` more
+    wait. A search arriving when both are full, or still queued once its
+    deadline has passed, raises Overloaded right away so the route can
+    answer 503 + Retry-After. Under a spike the requests that are admitted
+    keep steady-state latency instead of everyone timing out together.
+    A search that started in time is never shed; if it then runs
+    run_timeout seconds past the deadline, run() raises SearchTimeout (504)
+    and it is counted in SEARCH_TIMEOUTS rather than as a rejection.
+    """
+
+    def __init__(self, workers: int, queue_size: int, timeout: float, retry_after: int = 1,
+                 run_timeout: Optional[float] = None):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.run_timeout = run_timeout
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='search')
+        # One slot per running or queued search
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+
+    def _reject(self, reason: str) -> Overloaded:
+        SEARCH_REJECTIONS.labels(reason).inc()
+        return Overloaded(reason, self.retry_after)
+
+    def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn on the pool; raises Overloaded if shed, SearchTimeout if it overruns"""
+        if not self._slots.acquire(blocking=False):
+            raise self._reject('queue_full')
+
+        deadline = time.monotonic() + self.timeout
+        queued = time.perf_counter()
+        # Flask's app/request contexts are context variables; carry them over
+        # so current_app, g and Server-Timing work on the worker thread
+        context = contextvars.copy_context()
+
+        def execute() -> Any:
+            SEARCH_QUEUE_DEPTH.dec()
+            record_stage('queue', time.perf_counter() - queued)
+            if time.monotonic() > deadline:
+                # Queued past its deadline: shed it rather than start it late
+                raise self._reject('deadline')
+            # A profiled request spends its search here, not on its own thread
+            sampler = g.get('stack_sampler') if has_app_context() else None
+            if sampler is not None:
+                sampler.add_thread(threading.get_ident())
+            SEARCH_IN_FLIGHT.inc()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                SEARCH_IN_FLIGHT.dec()
+                if sampler is not None:
+                    sampler.discard_thread(threading.get_ident())
+
+        SEARCH_QUEUE_DEPTH.inc()
+        future = self._pool.submit(context.run, execute)
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            if future.cancel():
+                # Never started, so execute() won't take it off the queue
+                SEARCH_QUEUE_DEPTH.dec()
+                raise self._reject('deadline')
+        # Already running: the deadline only sheds queued searches, so let
+        # this one finish unless it overruns run_timeout as well
+        try:
+            return future.result(timeout=self.run_timeout)
+        except FutureTimeoutError:
+            SEARCH_TIMEOUTS.inc()
+            raise SearchTimeout(f"Search still running after {self.timeout + self.run_timeout:g}s")
+
+def limit_native_threads(threads: int) -> None:
+    """
+    Cap the BLAS/OpenMP threads each search may use
+
+    numpy (and FAISS, where loaded) otherwise start one thread per core for
+    every search, so N concurrent searches oversubscribe the CPU N times.
+    SEARCH_WORKERS x SEARCH_NATIVE_THREADS should not exceed the core count.
+    """
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(limits=threads)
+    except ImportError:
+        logger.warning("threadpoolctl is not installed; BLAS thread counts are not limited")
+    # Only if something already loaded it; importing FAISS here would slow startup
+    faiss = sys.modules.get('faiss')
+    if faiss is not None:
+        faiss.omp_set_num_threads(threads)
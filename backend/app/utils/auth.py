@@ -1,11 +1,18 @@
 # app/utils/auth.py
 from functools import wraps
-from typing import Optional, Callable, Any
+from collections import OrderedDict
+from typing import Optional, Callable, Any, Sequence, Tuple
 from flask import request, jsonify, current_app
 import jwt
+from jwt.algorithms import get_default_algorithms
+from jwt.exceptions import PyJWKClientConnectionError
 from http import HTTPStatus
+import hashlib
 import os
+import threading
+import time
 from datetime import datetime, timezone
+from config import Config
 
 class AuthError(Exception):
     """Custom exception for authentication errors"""
@@ -29,44 +36,141 @@ def get_token_from_header() -> str:
         
     return parts[1]
 
-def verify_token(token: str) -> dict:
+class TokenVerifier:
     """
-    Verify JWT token and return payload
-    
-    Args:
-        token: JWT token string
-        
-    Returns:
-        dict: Token payload if valid
-        
-    Raises:
-        AuthError: If token is invalid or expired
+    Verify JWTs against key material resolved once at startup
+
+    Successful verifications are cached under the SHA-256 of the token until
+    the token's exp (bounded, least-recently-used eviction), so a client
+    reusing its token skips signature checking on every later request.
     """
-    try:
-        # Get JWT secret from environment
-        jwt_secret = os.getenv('JWT_SECRET_KEY')
-        if not jwt_secret:
-            raise AuthError('JWT secret not configured', HTTPStatus.INTERNAL_SERVER_ERROR)
-            
-        # Decode and verify token
-        payload = jwt.decode(
-            token,
-            jwt_secret,
-            algorithms=['HS256'],
-            options={'verify_exp': True}
+
+    def __init__(
+        self,
+        secret: Optional[str] = None,
+        algorithms: Sequence[str] = ('HS256',),
+        public_key: Optional[str] = None,
+        jwks_url: Optional[str] = None,
+        jwks_cache_seconds: int = 300,
+        audience: Optional[str] = None,
+        issuer: Optional[str] = None,
+        cache_size: int = 10000,
+        max_cache_seconds: int = 300
+    ):
+        self.algorithms = [algorithm.strip() for algorithm in algorithms]
+        self.audience = audience
+        self.issuer = issuer
+        self.cache_size = cache_size
+        self.max_cache_seconds = max_cache_seconds
+        self._cache: "OrderedDict[bytes, Tuple[dict, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        asymmetric = bool(public_key or jwks_url)
+        if asymmetric and any(algorithm.startswith('HS') for algorithm in self.algorithms):
+            # A public key must never be accepted as an HMAC secret
+            raise ValueError('HS* algorithms cannot be combined with a public key or JWKS')
+
+        self._key = self._load_public_key(public_key) if public_key else secret
+        self._jwks = jwt.PyJWKClient(
+            jwks_url, cache_jwk_set=True, lifespan=jwks_cache_seconds
+        ) if jwks_url else None
+
+    def warmup(self) -> None:
+        """Fetch the JWKS ahead of the first token that needs it"""
+        if self._jwks is not None:
+            self._jwks.get_jwk_set()
+
+    @classmethod
+    def from_config(cls, config) -> 'TokenVerifier':
+        return cls(
+            secret=config.get('JWT_SECRET_KEY'),
+            algorithms=config.get('JWT_ALGORITHMS', ['HS256']),
+            public_key=config.get('JWT_PUBLIC_KEY'),
+            jwks_url=config.get('JWT_JWKS_URL'),
+            jwks_cache_seconds=config.get('JWT_JWKS_CACHE_SECONDS', 300),
+            audience=config.get('JWT_AUDIENCE'),
+            issuer=config.get('JWT_ISSUER'),
+            cache_size=config.get('JWT_TOKEN_CACHE_SIZE', 10000),
+            max_cache_seconds=config.get('JWT_TOKEN_CACHE_SECONDS', 300)
         )
+
+    def _load_public_key(self, public_key: str) -> Any:
+        """Parse the PEM (inline or a file path) once instead of per request"""
+        if os.path.isfile(public_key):
+            with open(public_key) as f:
+                public_key = f.read()
+        algorithm = get_default_algorithms()[self.algorithms[0]]
+        return algorithm.prepare_key(public_key)
+
+    def _signing_key(self, token: str) -> Any:
+        if self._jwks is not None:
+            # Served from the cached JWK set; refetched only for an unknown kid
+            return self._jwks.get_signing_key_from_jwt(token).key
+        if not self._key:
+            raise AuthError('JWT secret not configured', HTTPStatus.INTERNAL_SERVER_ERROR)
+        return self._key
+
+    def verify(self, token: str) -> dict:
+        """
+        Verify JWT token and return payload
         
-        # Check if token is expired
-        exp = payload.get('exp')
-        if exp and datetime.fromtimestamp(exp, tz=timezone.utc) < datetime.now(timezone.utc):
-            raise AuthError('Token has expired', HTTPStatus.UNAUTHORIZED)
+        Args:
+            token: JWT token string
+            
+        Returns:
+            dict: Token payload if valid (shared with the cache; treat as read-only)
             
+        Raises:
+            AuthError: If token is invalid or expired
+        """
+        digest = hashlib.sha256(token.encode()).digest()
+        now = time.time()
+
+        with self._lock:
+            entry = self._cache.get(digest)
+            if entry is not None:
+                payload, expires_at = entry
+                if expires_at > now:
+                    self._cache.move_to_end(digest)
+                    return payload
+                del self._cache[digest]
+
+        try:
+            # jwt.decode already rejects expired and not-yet-valid tokens
+            payload = jwt.decode(
+                token,
+                self._signing_key(token),
+                algorithms=self.algorithms,
+                audience=self.audience,
+                issuer=self.issuer
+            )
+        except jwt.ExpiredSignatureError:
+            raise AuthError('Token has expired', HTTPStatus.UNAUTHORIZED)
+        except PyJWKClientConnectionError:
+            raise AuthError('Signing keys unavailable', HTTPStatus.SERVICE_UNAVAILABLE)
+        except (jwt.InvalidTokenError, jwt.PyJWKClientError):
+            raise AuthError('Invalid token', HTTPStatus.UNAUTHORIZED)
+
+        exp = payload.get('exp')
+        expires_at = float(exp) if exp is not None else now + self.max_cache_seconds
+        with self._lock:
+            self._cache[digest] = (payload, expires_at)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
         return payload
-        
-    except jwt.ExpiredSignatureError:
-        raise AuthError('Token has expired', HTTPStatus.UNAUTHORIZED)
-    except jwt.InvalidTokenError:
-        raise AuthError('Invalid token', HTTPStatus.UNAUTHORIZED)
+
+def init_auth(app) -> TokenVerifier:
+    """Build the app's TokenVerifier from its config; call once from create_app"""
+    verifier = TokenVerifier.from_config(app.config)
+    app.extensions['token_verifier'] = verifier
+    return verifier
+
+def verify_token(token: str) -> dict:
+    """Verify a JWT with the current app's TokenVerifier (see TokenVerifier.verify)"""
+    verifier = current_app.extensions.get('token_verifier')
+    if verifier is None:
+        verifier = init_auth(current_app)
+    return verifier.verify(token)
 
 def require_auth(f: Callable) -> Callable:
     """
@@ -141,7 +245,7 @@ def create_token(user_id: str, roles: list[str], expires_in: int = 3600) -> str:
         str: Generated JWT token
     """
     try:
-        jwt_secret = os.getenv('JWT_SECRET_KEY')
+        jwt_secret = Config.JWT_SECRET_KEY
         if not jwt_secret:
             raise AuthError('JWT secret not configured', HTTPStatus.INTERNAL_SERVER_ERROR)
             
@@ -0,0 +1,246 @@
+# app/utils/cache.py
+from collections import OrderedDict
+from multiprocessing.connection import Client, Listener
+from typing import Any, Dict, Optional, Tuple
+import logging
+import os
+import pickle
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = 'search:index-generation'
+
+# Vector backends whose index lives in each worker's memory and only picks up
+# other workers' writes on its periodic reload; they can't share a cache
+PER_PROCESS_VECTOR_BACKENDS = frozenset({'exact', 'binary'})
+
+# MemoryCache methods a CacheServer will run for its clients
+SERVER_OPERATIONS = frozenset({'get', 'set', 'counter', 'incr', 'stats'})
+
+class MemoryCache:
+    """
+    Bounded in-process cache with per-entry TTL
+
+    Entries are evicted least-recently-used first once either the entry
+    count or the approximate byte budget (pickled size) is exceeded.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Any, Tuple[Any, float, int]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Any) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at, size = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any, ttl: float) -> None:
+        size = len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._entries[key] = (value, time.monotonic() + ttl, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def counter(self, name: str) -> int:
+        return self._counters.get(name, 0)
+
+    def incr(self, name: str) -> int:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + 1
+            return self._counters[name]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+class SocketCacheClient:
+    """
+    Client for a CacheServer on a local (Unix) socket, shared by all workers
+
+    Exposes the same get/set/counter/incr/stats interface as MemoryCache.
+    Each thread keeps its own connection; a failed call drops the connection
+    and reports a miss so the cache can never take a request down.
+    """
+
+    def __init__(self, address: str, authkey: bytes):
+        self.address = address
+        self.authkey = authkey
+        self._local = threading.local()
+
+    def _call(self, *request: Any) -> Any:
+        conn = getattr(self._local, 'conn', None)
+        try:
+            if conn is None:
+                conn = self._local.conn = Client(self.address, family='AF_UNIX', authkey=self.authkey)
+            conn.send(request)
+            return conn.recv()
+        except (OSError, EOFError) as e:
+            logger.warning(f"Shared cache unavailable: {str(e)}")
+            self._local.conn = None
+            return None
+
+    def get(self, key: Any) -> Optional[Any]:
+        return self._call('get', key)
+
+    def set(self, key: Any, value: Any, ttl: float) -> None:
+        self._call('set', key, value, ttl)
+
+    def counter(self, name: str) -> int:
+        return self._call('counter', name) or 0
+
+    def incr(self, name: str) -> int:
+        return self._call('incr', name) or 0
+
+    def stats(self) -> Dict[str, int]:
+        return self._call('stats') or {}
+
+class CacheServer:
+    """
+    Serve a MemoryCache to local worker processes over a Unix socket
+
+    Requests are pickles, so only clients holding the authkey are accepted
+    and the socket is created readable and writable by its owner alone.
+    """
+
+    def __init__(self, address: str, authkey: bytes, **cache_options: Any):
+        if not authkey:
+            raise ValueError("The shared search cache needs an authkey (SEARCH_CACHE_AUTHKEY)")
+        self.address = address
+        self.authkey = authkey
+        self.cache = MemoryCache(**cache_options)
+
+    def _handle(self, conn) -> None:
+        with conn:
+            while True:
+                try:
+                    op, *args = conn.recv()
+                except (EOFError, OSError):
+                    return
+                if op not in SERVER_OPERATIONS:
+                    conn.send(None)
+                    continue
+                conn.send(getattr(self.cache, op)(*args))
+
+    def serve_forever(self) -> None:
+        if os.path.exists(self.address):
+            os.unlink(self.address)
+        # Bind with a 0600 socket rather than chmod afterwards, leaving no window
+        umask = os.umask(0o177)
+        try:
+            listener = Listener(self.address, family='AF_UNIX', authkey=self.authkey)
+        finally:
+            os.umask(umask)
+        with listener:
+            logger.info(f"Shared search cache listening on {self.address}")
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    logger.warning(f"Rejected cache connection: {str(e)}")
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+class SearchCache:
+    """
+    Search result cache keyed by normalized query, limit, filters and index generation
+
+    The generation is bumped whenever profiles change or an index is rebuilt;
+    since it is part of every key, older entries simply stop matching and age
+    out through TTL and eviction. Callers take the key once, before
+    searching, and hand it to both get() and set(), so results computed
+    across a bump are stored under the old generation and never served.
+    """
+
+    def __init__(self, backend, ttl: float = 300):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return ' '.join(query.casefold().split())
+
+    def key(self, query: str, limit: int, filters: Optional[Dict[str, str]] = None) -> Tuple:
+        filter_items = tuple(sorted((filters or {}).items()))
+        return ('search', self.backend.counter(GENERATION_KEY), self.normalize(query), limit, filter_items)
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: Tuple, results: Any) -> None:
+        self.backend.set(key, results, self.ttl)
+
+    def bump_generation(self, *args: Any, **kwargs: Any) -> int:
+        """Invalidate every cached result; usable directly as a signal receiver"""
+        return self.backend.incr(GENERATION_KEY)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            **self.backend.stats(),
+            "generation": self.backend.counter(GENERATION_KEY),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+def create_search_cache(config) -> Optional[SearchCache]:
+    """Build the search cache described by config, or None when disabled"""
+    if not config.SEARCH_CACHE_ENABLED:
+        return None
+    shared = bool(config.SEARCH_CACHE_SOCKET)
+    if shared and config.VECTOR_BACKEND in PER_PROCESS_VECTOR_BACKENDS:
+        # The shared generation moves on every worker's writes, but this
+        # worker's index only sees them on its next reload: a result from its
+        # stale index would be cached for (and served by) every worker
+        logger.warning(
+            f"SEARCH_CACHE_SOCKET is ignored with VECTOR_BACKEND={config.VECTOR_BACKEND} "
+            f"(a per-process index); caching search results per worker instead"
+        )
+        shared = False
+    if shared:
+        if not config.SEARCH_CACHE_AUTHKEY:
+            raise ValueError("SEARCH_CACHE_SOCKET is set but SEARCH_CACHE_AUTHKEY is not")
+        backend = SocketCacheClient(config.SEARCH_CACHE_SOCKET, config.SEARCH_CACHE_AUTHKEY.encode())
+    else:
+        backend = MemoryCache(
+            max_entries=config.SEARCH_CACHE_MAX_ENTRIES,
+            max_bytes=config.SEARCH_CACHE_MAX_BYTES
+        )
+    return SearchCache(backend, ttl=config.SEARCH_CACHE_TTL)
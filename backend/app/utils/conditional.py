@@ -0,0 +1,44 @@
+# app/utils/conditional.py
+from datetime import datetime, timezone
+from typing import Tuple
+from flask import request, Response
+
+def profile_validators(profile_id: str, date_updated: datetime, variant: str = "") -> Tuple[str, datetime]:
+    """
+    Strong ETag and Last-Modified for a profile version
+
+    Args:
+        profile_id: Profile ObjectId as a string
+        date_updated: The profile's dateUpdated (naive datetimes are UTC)
+        variant: Suffix distinguishing alternate representations of the same version
+
+    Returns:
+        (etag, last_modified)
+    """
+    if date_updated.tzinfo is None:
+        date_updated = date_updated.replace(tzinfo=timezone.utc)
+    etag = f"{profile_id}-{int(date_updated.timestamp() * 1000)}"
+    if variant:
+        etag = f"{etag}-{variant}"
+    return etag, date_updated
+
+def is_not_modified(etag: str, last_modified: datetime) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against the current version"""
+    if request.if_none_match:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since:
+        # HTTP dates only carry whole seconds
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+def set_cache_headers(response: Response, etag: str, last_modified: datetime,
+                      max_age: int, stale_while_revalidate: int) -> Response:
+    """Attach validators and Cache-Control so browsers and shared caches can revalidate cheaply"""
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.headers["Cache-Control"] = (
+        f"public, max-age={max_age}, stale-while-revalidate={stale_while_revalidate}"
+    )
+    response.vary.add("Accept-Encoding")
+    return response
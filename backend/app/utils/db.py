@@ -1,6 +1,10 @@
 # app/utils/db.py
-from typing import Optional
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel, MongoClient
+from pymongo.database import Database
+from pymongo.errors import OperationFailure
+from pymongo.operations import SearchIndexModel
 from pymongo.server_api import ServerApi
 import asyncio
 from functools import lru_cache
@@ -9,6 +13,11 @@ from urllib.parse import quote_plus
 import certifi
 import logging
 
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+except ImportError:  # motor is only needed for the async DatabaseConnection helpers
+    AsyncIOMotorClient = AsyncIOMotorDatabase = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -82,9 +91,6 @@ async def init_db() -> None:
         # Verify connection
         await client.admin.command('ping')
         logger.info("Successfully connected to MongoDB")
-        
-        # Initialize indexes
-        await create_indexes()
     except Exception as e:
         logger.error(f"Failed to initialize database: {str(e)}")
         raise
@@ -108,49 +114,174 @@ def get_database() -> AsyncIOMotorDatabase:
     """
     return DatabaseConnection.get_database()
 
-async def create_indexes() -> None:
+# Every index the service queries rely on, by collection. This is the one
+# place indexes are declared: `flask sync-indexes` (and app warmup) creates
+# whatever is missing, `flask index-usage` reports the ones nothing uses and
+# `flask check-query-plans` proves the queries below actually use them.
+INDEXES: Dict[str, List[IndexModel]] = {
+    'alumniProfiles': [
+        # Import upsert key; unique so concurrent imports can't insert twins
+        IndexModel([('linkedInURL', ASCENDING)], name='profile_linkedin_url', unique=True),
+        # Covered version lookups for conditional GETs (ProfileService.VERSION_INDEX)
+        IndexModel([('_id', ASCENDING), ('dateUpdated', ASCENDING)], name='profile_version'),
+        # Exact-match search filters (exact/binary backends pre-filter with find)
+        IndexModel([('company', ASCENDING)], name='profile_company'),
+        IndexModel([('university', ASCENDING)], name='profile_university'),
+        IndexModel([('highSchool', ASCENDING)], name='profile_high_school'),
+        IndexModel([('currentRole', ASCENDING)], name='profile_current_role'),
+    ],
+    'faissMapping': [
+        IndexModel([('alumniId', ASCENDING)], name='alumniId_1'),
+    ],
+}
+
+# Fields SearchService may filter $vectorSearch on
+VECTOR_FILTER_FIELDS = ('company', 'currentRole', 'university', 'highSchool')
+
+def vector_search_index(dimensions: int) -> SearchIndexModel:
+    """Atlas Vector Search index queried by SearchService ($vectorSearch on alumniEmb)"""
+    return SearchIndexModel(
+        name='alumni_vector_index',
+        type='vectorSearch',
+        definition={
+            'fields': [
+                {'type': 'vector', 'path': 'alumniEmb', 'numDimensions': dimensions, 'similarity': 'cosine'},
+                *({'type': 'filter', 'path': field} for field in VECTOR_FILTER_FIELDS),
+            ]
+        }
+    )
+
+# Representative shapes of the service queries, checked with explain:
+# (description, collection, find command arguments)
+QUERY_PLAN_CHECKS: List[Tuple[str, str, Dict[str, Any]]] = [
+    ('profile by id', 'alumniProfiles', {'filter': {'_id': ObjectId()}}),
+    ('profile version', 'alumniProfiles', {
+        'filter': {'_id': ObjectId()}, 'projection': {'_id': 1, 'dateUpdated': 1},
+        'hint': {'_id': 1, 'dateUpdated': 1}
+    }),
+    ('import dedupe', 'alumniProfiles', {
+        'filter': {'linkedInURL': {'$in': ['https://www.linkedin.com/in/example']}},
+        'projection': {'linkedInURL': 1, '_id': 0}
+    }),
+    ('export scan', 'alumniProfiles', {'filter': {}, 'sort': {'_id': 1}}),
+    *((f'search filter on {field}', 'alumniProfiles', {'filter': {field: 'example'}, 'projection': {'_id': 1}})
+      for field in VECTOR_FILTER_FIELDS),
+    ('search filter on company and university', 'alumniProfiles', {
+        'filter': {'company': 'example', 'university': 'example'}, 'projection': {'_id': 1}
+    }),
+    ('faiss mapping by profile', 'faissMapping', {'filter': {'alumniId': 'example'}}),
+]
+
+def _key(index: Dict[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+    return tuple(index['key'].items())
+
+def sync_indexes(database: Database, dimensions: Optional[int] = None,
+                 dry_run: bool = False) -> Dict[str, List[str]]:
     """
-    Create necessary indexes for the application.
-    Called during database initialization.
+    Create every declared index that is missing
+    
+    Indexes are matched on their key pattern, so ones created earlier under
+    another name count as present. The vector search index is only synced
+    when dimensions is given (and only exists on Atlas). Nothing is dropped:
+    indexes on the server that the spec doesn't declare are reported.
+    
+    Returns:
+        {"created", "existing", "failed", "undeclared"} lists of
+        "collection.index" names
     """
-    try:
-        db = get_database()
-        
-        # Indexes for alumni_profiles collection
-        await db.alumni_profiles.create_indexes([
-            # Basic profile fields
-            {'key': [('fullName', 1)], 'background': True},
-            {'key': [('currentRole', 1)], 'background': True},
-            {'key': [('company', 1)], 'background': True},
-            {'key': [('university', 1)], 'background': True},
-            {'key': [('highSchool', 1)], 'background': True},
-            {'key': [('dateUpdated', -1)], 'background': True},
-            
-            # Compound indexes for common queries
-            {'key': [('company', 1), ('currentRole', 1)], 'background': True},
-            {'key': [('university', 1), ('currentRole', 1)], 'background': True}
-        ])
-        
-        # Indexes for profile_vectors collection
-        await db.profile_vectors.create_indexes([
-            # Unique index on alumniId
-            {'key': [('alumniId', 1)], 'unique': True, 'background': True}
-        ])
-        
-        logger.info("Successfully created database indexes")
-    except Exception as e:
-        logger.error(f"Failed to create indexes: {str(e)}")
-        raise
+    report: Dict[str, List[str]] = {"created": [], "existing": [], "failed": [], "undeclared": []}
+    for collection_name, models in INDEXES.items():
+        collection = database[collection_name]
+        existing = {_key(index): index['name'] for index in collection.list_indexes()}
+        declared = set()
+        for model in models:
+            spec = model.document
+            declared.add(_key(spec))
+            if _key(spec) in existing:
+                report["existing"].append(f"{collection_name}.{existing[_key(spec)]}")
+                continue
+            if not dry_run:
+                try:
+                    collection.create_indexes([model])
+                except OperationFailure as e:
+                    # e.g. duplicate linkedInURLs blocking the unique index
+                    report["failed"].append(f"{collection_name}.{spec['name']}: {str(e)}")
+                    continue
+            report["created"].append(f"{collection_name}.{spec['name']}")
+        report["undeclared"].extend(
+            f"{collection_name}.{name}" for key, name in existing.items()
+            if key not in declared and name != '_id_'
+        )
+    
+    if dimensions is not None:
+        model = vector_search_index(dimensions)
+        name = model.document['name']
+        try:
+            if any(index['name'] == name for index in database.alumniProfiles.list_search_indexes()):
+                report["existing"].append(f"alumniProfiles.{name}")
+            else:
+                if not dry_run:
+                    database.alumniProfiles.create_search_index(model)
+                report["created"].append(f"alumniProfiles.{name}")
+        except OperationFailure as e:
+            report["failed"].append(f"alumniProfiles.{name}: {str(e)}")
+    return report
 
-async def health_check() -> bool:
+def index_usage(database: Database) -> List[Dict[str, Any]]:
+    """
+    Per-index operation counts from $indexStats, least used first
+    
+    Counts are per mongod and reset when it restarts (see "since"), so look
+    at them after a representative stretch of traffic.
+    """
+    usage = []
+    for collection_name in INDEXES:
+        for stats in database[collection_name].aggregate([{'$indexStats': {}}]):
+            usage.append({
+                "collection": collection_name,
+                "name": stats['name'],
+                "ops": stats['accesses']['ops'],
+                "since": stats['accesses']['since'],
+            })
+    return sorted(usage, key=lambda index: (index['ops'], index['collection'], index['name']))
+
+def _plan_stages(plan: Any) -> Iterator[str]:
+    """Every stage name in an explain plan tree (classic or SBE layout)"""
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            yield plan['stage']
+        for value in plan.values():
+            yield from _plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _plan_stages(item)
+
+def check_query_plans(database: Database) -> List[Dict[str, Any]]:
+    """
+    Explain each QUERY_PLAN_CHECKS query; a COLLSCAN in the winning plan
+    means the query reads the whole collection and fails the check
+    """
+    results = []
+    for description, collection_name, find in QUERY_PLAN_CHECKS:
+        result = {"query": description, "collection": collection_name}
+        try:
+            explained = database.command({'explain': {'find': collection_name, **find}, 'verbosity': 'queryPlanner'})
+        except OperationFailure as e:
+            # e.g. a hint naming an index that doesn't exist yet
+            results.append({**result, "stages": [], "ok": False, "error": str(e)})
+            continue
+        stages = list(_plan_stages(explained['queryPlanner']['winningPlan']))
+        results.append({**result, "stages": stages, "ok": 'COLLSCAN' not in stages})
+    return results
+
+def health_check(client: MongoClient) -> bool:
     """
     Perform a health check on the database.
-    Returns True if database is healthy, False otherwise.
+    Returns True if the server answers a ping, False otherwise.
     """
     try:
-        client = DatabaseConnection.get_client()
-        await client.admin.command('ping')
+        client.admin.command('ping')
         return True
     except Exception as e:
         logger.error(f"Database health check failed: {str(e)}")
-        return False
\ No newline at end of file
+        return False
@@ -0,0 +1,176 @@
+# app/utils/metrics.py
+from contextlib import contextmanager
+from typing import Iterator
+import os
+import time
+from flask import Flask, Response, g, has_request_context, request
+from pymongo import monitoring
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+)
+from app.signals import index_rebuilt
+
+# Latency buckets (seconds) sized for calls from sub-millisecond cache hits to slow Cohere round trips
+LATENCY_BUCKETS = (.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+
+SEARCH_STAGE_SECONDS = Histogram(
+    'alumni_search_stage_seconds',
+    'Time spent in each stage of a search request',
+    ['stage'],
+    buckets=LATENCY_BUCKETS
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    'alumni_http_request_seconds',
+    'HTTP request latency by endpoint',
+    ['method', 'endpoint', 'status'],
+    buckets=LATENCY_BUCKETS
+)
+SEARCH_CACHE_LOOKUPS = Counter(
+    'alumni_search_cache_lookups_total',
+    'Search result cache lookups',
+    ['result']
+)
+COHERE_CALLS = Counter(
+    'alumni_cohere_calls_total',
+    'Cohere embed API calls',
+    ['input_type', 'outcome']
+)
+ERRORS = Counter(
+    'alumni_errors_total',
+    'Errors by component',
+    ['component']
+)
+VECTOR_INDEX_VECTORS = Gauge(
+    'alumni_vector_index_vectors',
+    'Vectors held by the in-process vector index',
+    multiprocess_mode='max'
+)
+VECTOR_INDEX_BYTES = Gauge(
+    'alumni_vector_index_bytes',
+    'Memory used by the in-process vector index',
+    multiprocess_mode='max'
+)
+SEARCH_QUEUE_DEPTH = Gauge(
+    'alumni_search_queue_depth',
+    'Searches admitted and waiting for a search worker',
+    multiprocess_mode='livesum'
+)
+SEARCH_IN_FLIGHT = Gauge(
+    'alumni_search_in_flight',
+    'Searches running on the search worker pool',
+    multiprocess_mode='livesum'
+)
+SEARCH_REJECTIONS = Counter(
+    'alumni_search_rejections_total',
+    'Searches shed by admission control',
+    ['reason']
+)
+SEARCH_TIMEOUTS = Counter(
+    'alumni_search_timeouts_total',
+    'Admitted searches still running after SEARCH_RUN_TIMEOUT_SECONDS'
+)
+MONGO_POOL_CONNECTIONS = Gauge(
+    'alumni_mongo_pool_connections',
+    'MongoDB pool connections by state',
+    ['state'],
+    multiprocess_mode='livesum'
+)
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """
+    Time a search stage into SEARCH_STAGE_SECONDS
+
+    Inside a request the duration is also recorded for the Server-Timing header.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started)
+
+def record_stage(stage: str, elapsed: float) -> None:
+    """Record a stage duration measured elsewhere (e.g. time spent queued)"""
+    SEARCH_STAGE_SECONDS.labels(stage).observe(elapsed)
+    if has_request_context():
+        g.setdefault('server_timing', []).append((stage, elapsed))
+
+class MongoPoolListener(monitoring.ConnectionPoolListener):
+    """Track open and checked-out connections for MONGO_POOL_CONNECTIONS"""
+
+    def connection_created(self, event):
+        MONGO_POOL_CONNECTIONS.labels('open').inc()
+
+    def connection_closed(self, event):
+        MONGO_POOL_CONNECTIONS.labels('open').dec()
+
+    def connection_checked_out(self, event):
+        MONGO_POOL_CONNECTIONS.labels('in_use').inc()
+
+    def connection_checked_in(self, event):
+        MONGO_POOL_CONNECTIONS.labels('in_use').dec()
+
+    def connection_check_out_failed(self, event):
+        ERRORS.labels('mongo_pool').inc()
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+def _record_index(sender, size: int = 0, nbytes: int = 0, **kwargs) -> None:
+    VECTOR_INDEX_VECTORS.set(size)
+    VECTOR_INDEX_BYTES.set(nbytes)
+
+def _registry() -> CollectorRegistry:
+    """Aggregate across gunicorn workers when PROMETHEUS_MULTIPROC_DIR is set"""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+def init_metrics(app: Flask) -> None:
+    """Expose /metrics, time every request and add Server-Timing headers"""
+    index_rebuilt.connect(_record_index, weak=False)
+
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_request(response: Response) -> Response:
+        started = g.pop('request_started', None)
+        if started is None:
+            return response
+
+        elapsed = time.perf_counter() - started
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_REQUEST_SECONDS.labels(request.method, endpoint, response.status_code).observe(elapsed)
+        if response.status_code >= 500:
+            ERRORS.labels('http').inc()
+
+        timings = g.pop('server_timing', [])
+        timings.append(('app', elapsed))
+        response.headers['Server-Timing'] = ', '.join(
+            f"{stage};dur={duration * 1000:.2f}" for stage, duration in timings
+        )
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        return Response(generate_latest(_registry()), mimetype=CONTENT_TYPE_LATEST)
@@ -0,0 +1,230 @@
+# app/utils/profiling.py
+from collections import Counter
+from datetime import datetime, timezone
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Any, Callable, Dict, Optional, Set
+import hmac
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from flask import Flask, Response, g, jsonify, request
+from http import HTTPStatus
+
+logger = logging.getLogger(__name__)
+
+_UNSAFE_FILENAME = re.compile(r'[^A-Za-z0-9_.-]+')
+
+class StackSampler:
+    """
+    Statistical profiler for the threads serving one request
+
+    A daemon thread reads sys._current_frames() every `interval` seconds and
+    counts each sampled stack in collapsed form ("module:func;module:func"),
+    the input format of flamegraph.pl, speedscope and inferno. The profiled
+    code runs unmodified, so overhead is one stack walk per sample.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.thread_ids: Set[int] = {threading.get_ident()}
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def add_thread(self, thread_id: int) -> None:
+        """Also sample a thread the request continues on (e.g. an async view's event loop)"""
+        self.thread_ids = self.thread_ids | {thread_id}
+
+    def discard_thread(self, thread_id: int) -> None:
+        """Stop sampling a thread the request has left (e.g. a pooled worker)"""
+        self.thread_ids = self.thread_ids - {thread_id}
+
+    def start(self) -> 'StackSampler':
+        self._started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self) -> float:
+        """Stop sampling; returns the wall time profiled in seconds"""
+        self._stop.set()
+        self._thread.join()
+        return time.perf_counter() - self._started
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in self.thread_ids:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.samples[self._collapse(frame)] += 1
+
+    @staticmethod
+    def _collapse(frame) -> str:
+        stack = []
+        while frame is not None:
+            stack.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}")
+            frame = frame.f_back
+        return ';'.join(reversed(stack))
+
+    def write(self, path: str) -> None:
+        with open(path, 'w') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+def _prune(directory: str, max_files: int) -> None:
+    """Keep only the newest max_files profiles"""
+    files = sorted(
+        (entry for entry in os.scandir(directory) if entry.name.endswith('.folded')),
+        key=lambda entry: entry.stat().st_mtime
+    )
+    for entry in files[:max(0, len(files) - max_files)]:
+        os.unlink(entry.path)
+
+def _authorized(config: Dict[str, Any]) -> bool:
+    token = config.get('PROFILING_TOKEN')
+    supplied = request.headers.get(config.get('PROFILING_HEADER', 'X-Profile'), '')
+    return bool(token) and hmac.compare_digest(supplied, token)
+
+def memory_snapshot_stats(limit: int = 25, group_by: str = 'lineno',
+                          previous: Optional[tracemalloc.Snapshot] = None) -> Dict[str, Any]:
+    """Top allocation sites of a fresh tracemalloc snapshot, optionally diffed against `previous`"""
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    ))
+    if previous is not None:
+        stats = snapshot.compare_to(previous, group_by)[:limit]
+        top = [
+            {'site': str(stat.traceback), 'size': stat.size, 'size_diff': stat.size_diff,
+             'count': stat.count, 'count_diff': stat.count_diff}
+            for stat in stats
+        ]
+    else:
+        stats = snapshot.statistics(group_by)[:limit]
+        top = [{'site': str(stat.traceback), 'size': stat.size, 'count': stat.count} for stat in stats]
+
+    current, peak = tracemalloc.get_traced_memory()
+    return {'snapshot': snapshot, 'traced_bytes': current, 'peak_bytes': peak, 'top': top}
+
+def init_profiling(app: Flask) -> None:
+    """
+    Opt-in request profiling and tracemalloc snapshots
+
+    Disabled unless PROFILING_ENABLED. A request is profiled when it carries
+    the PROFILING_HEADER with the PROFILING_TOKEN value, or at random with
+    probability PROFILING_SAMPLE_RATE. Profiles are written as collapsed
+    stacks to PROFILING_DIR; the memory endpoints require the same header.
+    """
+    config = app.config
+    if not config.get('PROFILING_ENABLED'):
+        return
+
+    directory = config['PROFILING_DIR']
+    os.makedirs(directory, exist_ok=True)
+    interval = config['PROFILING_INTERVAL_MS'] / 1000
+    sample_rate = config['PROFILING_SAMPLE_RATE']
+    max_files = config['PROFILING_MAX_FILES']
+    state: Dict[str, Optional[tracemalloc.Snapshot]] = {'previous': None}
+
+    if config.get('PROFILING_TRACEMALLOC_FRAMES'):
+        tracemalloc.start(config['PROFILING_TRACEMALLOC_FRAMES'])
+
+    ensure_sync = app.ensure_sync
+
+    def profiled_ensure_sync(func: Callable) -> Callable:
+        # Async views run on an event loop in another thread; add it to the sampler
+        if not iscoroutinefunction(func):
+            return ensure_sync(func)
+
+        @wraps(func)
+        async def tracked(*args: Any, **kwargs: Any) -> Any:
+            sampler = g.get('stack_sampler')
+            if sampler is not None:
+                sampler.add_thread(threading.get_ident())
+            return await func(*args, **kwargs)
+        return ensure_sync(tracked)
+
+    app.ensure_sync = profiled_ensure_sync
+
+    @app.before_request
+    def start_profile():
+        if _authorized(config) or (sample_rate and random.random() < sample_rate):
+            g.stack_sampler = StackSampler(interval).start()
+
+    @app.after_request
+    def write_profile(response: Response) -> Response:
+        sampler = g.pop('stack_sampler', None)
+        if sampler is None:
+            return response
+
+        elapsed = sampler.stop()
+        timestamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S.%f')
+        endpoint = _UNSAFE_FILENAME.sub('_', request.endpoint or 'unmatched')
+        filename = f"{timestamp}-{request.method}-{endpoint}-{elapsed * 1000:.0f}ms.folded"
+        try:
+            sampler.write(os.path.join(directory, filename))
+            _prune(directory, max_files)
+            response.headers['X-Profile-File'] = filename
+        except OSError as e:
+            logger.warning(f"Could not write profile: {str(e)}")
+        return response
+
+    @app.route('/debug/memory', methods=['GET'])
+    def memory_snapshot():
+        """
+        tracemalloc allocation report
+
+        Query parameters:
+            limit: Number of allocation sites (default 25)
+            group_by: 'lineno', 'filename' or 'traceback'
+            compare: 'true' to diff against the previous snapshot
+            dump: 'true' to also save the raw snapshot to PROFILING_DIR
+        """
+        if not _authorized(config):
+            return jsonify({"status": "error", "message": "Resource not found"}), HTTPStatus.NOT_FOUND
+        if not tracemalloc.is_tracing():
+            return jsonify({
+                "status": "error",
+                "message": "tracemalloc is not tracing; POST /debug/memory/start first"
+            }), HTTPStatus.CONFLICT
+
+        group_by = request.args.get('group_by', 'lineno')
+        if group_by not in ('lineno', 'filename', 'traceback'):
+            return jsonify({"status": "error", "message": "Invalid group_by"}), HTTPStatus.BAD_REQUEST
+        compare = request.args.get('compare', 'false').lower() == 'true'
+
+        report = memory_snapshot_stats(
+            limit=request.args.get('limit', default=25, type=int),
+            group_by=group_by,
+            previous=state['previous'] if compare else None
+        )
+        snapshot = state['previous'] = report.pop('snapshot')
+        if request.args.get('dump', 'false').lower() == 'true':
+            path = os.path.join(directory, f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}.tracemalloc")
+            snapshot.dump(path)
+            report['dump'] = path
+        return jsonify({"status": "success", **report}), HTTPStatus.OK
+
+    @app.route('/debug/memory/start', methods=['POST'])
+    def memory_start():
+        if not _authorized(config):
+            return jsonify({"status": "error", "message": "Resource not found"}), HTTPStatus.NOT_FOUND
+        frames = request.args.get('frames', default=10, type=int)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        return jsonify({"status": "success", "frames": tracemalloc.get_traceback_limit()}), HTTPStatus.OK
+
+    @app.route('/debug/memory/stop', methods=['POST'])
+    def memory_stop():
+        if not _authorized(config):
+            return jsonify({"status": "error", "message": "Resource not found"}), HTTPStatus.NOT_FOUND
+        tracemalloc.stop()
+        state['previous'] = None
+        return jsonify({"status": "success"}), HTTPStatus.OK
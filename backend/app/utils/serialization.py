@@ -0,0 +1,75 @@
+# app/utils/serialization.py
+import base64
+import json
+from datetime import date, datetime
+from typing import Any
+from flask.json.provider import JSONProvider, DefaultJSONProvider
+from bson import ObjectId
+from bson.binary import Binary
+from pydantic import AnyUrl
+from pydantic_core import Url
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+# pydantic URL types (HttpUrl etc.) across pydantic 2.x releases
+URL_TYPES = (AnyUrl, Url)
+
+def encode_default(obj: Any) -> Any:
+    """
+    Serialize the MongoDB and pydantic types that appear in API responses
+
+    Lets services hand raw (projected) documents straight to the encoder
+    instead of stringifying fields one by one.
+    """
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, Binary):
+        return base64.b64encode(obj).decode('ascii')
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, URL_TYPES):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson, writing response bodies as bytes directly"""
+
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if orjson else 0
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=encode_default, option=self.option).decode('utf-8')
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=encode_default, option=self.option)
+        return self._app.response_class(body, mimetype="application/json")
+
+class MongoJSONProvider(DefaultJSONProvider):
+    """Standard library fallback with the same type handling as OrjsonProvider"""
+
+    sort_keys = False
+
+    @staticmethod
+    def default(obj: Any) -> Any:
+        try:
+            return encode_default(obj)
+        except TypeError:
+            return DefaultJSONProvider.default(obj)
+
+def loads(data: Any) -> Any:
+    """Parse JSON text or bytes outside a request (orjson when installed)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def create_json_provider(app) -> JSONProvider:
+    """Use orjson when it is installed, the standard library otherwise"""
+    if orjson is not None:
+        return OrjsonProvider(app)
+    return MongoJSONProvider(app)
@@ -0,0 +1,164 @@
+# app/utils/startup.py
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Set
+import logging
+import threading
+import time
+from flask import Flask
+
+logger = logging.getLogger(__name__)
+
+class StartupState:
+    """
+    Timed startup phases and the background warmup for one app
+
+    create_app only does in-process setup; anything that touches the network
+    (Mongo ping, index builds, embedding clients, vector index loads) is a
+    warmup task run on a daemon thread, so a worker serves requests as soon
+    as the factory returns and a database blip delays warmup instead of
+    failing the boot.
+    
+    Tasks marked required (the Mongo ping, the search warmup) gate `ready`,
+    which the readiness probe reports; a failed run is retried once
+    retry_interval has passed since it finished.
+    """
+
+    def __init__(self, retries: int = 3, backoff: float = 1.0, retry_interval: float = 10.0):
+        self.started = time.perf_counter()
+        self.retries = retries
+        self.backoff = backoff
+        self.retry_interval = retry_interval
+        self.phases: Dict[str, float] = {}
+        self.ready_after: Optional[float] = None
+        self._tasks: Dict[str, Callable[[], None]] = {}
+        self._required: Set[str] = set()
+        self.warmup: Dict[str, Dict[str, object]] = {}
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._finished_at: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time one startup phase"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - started
+
+    def add_warmup_task(self, name: str, task: Callable[[], None], required: bool = False) -> None:
+        self._tasks[name] = task
+        self.warmup[name] = {"status": "pending", "required": required}
+        if required:
+            self._required.add(name)
+
+    def finish(self) -> None:
+        """Log how long the factory took, phase by phase"""
+        self.ready_after = time.perf_counter() - self.started
+        phases = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases.items())
+        logger.info(f"App created in {self.ready_after * 1000:.0f}ms ({phases})")
+
+    def start_warmup(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run_warmup, name="app-warmup", daemon=True)
+            self._thread.start()
+
+    def retry_failed(self) -> bool:
+        """Re-run failed tasks if the last run finished over retry_interval ago"""
+        if self._finished_at is None or time.monotonic() - self._finished_at < self.retry_interval:
+            return False
+        if not any(state["status"] == "failed" for state in self.warmup.values()):
+            return False
+        self._finished_at = None
+        self.start_warmup()
+        return True
+
+    def _run_warmup(self) -> None:
+        started = time.perf_counter()
+        for name, task in self._tasks.items():
+            state = self.warmup[name]
+            if state["status"] == "done":
+                continue
+            state["status"] = "running"
+            task_started = time.perf_counter()
+            for attempt in range(1, self.retries + 1):
+                try:
+                    task()
+                    state["status"] = "done"
+                    state.pop("error", None)
+                    break
+                except Exception as e:
+                    state["error"] = str(e)
+                    logger.warning(f"Warmup task {name!r} failed (attempt {attempt}/{self.retries}): {str(e)}")
+                    if attempt < self.retries:
+                        time.sleep(self.backoff * 2 ** (attempt - 1))
+            else:
+                state["status"] = "failed"
+            state["seconds"] = round(time.perf_counter() - task_started, 3)
+        self._finished_at = time.monotonic()
+        self._done.set()
+        failed = [name for name, state in self.warmup.items() if state["status"] == "failed"]
+        logger.info(
+            f"Warmup finished in {time.perf_counter() - started:.2f}s"
+            + (f"; failed: {', '.join(failed)}" if failed else "")
+        )
+
+    @property
+    def warm(self) -> bool:
+        """True once every warmup task has run (successfully or not)"""
+        return self._done.is_set() or not self._tasks
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until warmup has finished; returns False on timeout"""
+        return self.warm or self._done.wait(timeout)
+
+    @property
+    def ready(self) -> bool:
+        """True once every required warmup task has succeeded"""
+        return all(self.warmup[name]["status"] == "done" for name in self._required)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "ready_after_ms": round(self.ready_after * 1000, 1) if self.ready_after is not None else None,
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()},
+            "warm": self.warm,
+            "ready": self.ready,
+            "warmup": self.warmup,
+        }
+
+def init_startup(app: Flask, config_class: Optional[type] = None) -> StartupState:
+    """
+    Attach a StartupState to app
+
+    create_app() calls this before app.config is loaded (so that loading it
+    is timed as a phase), hence the settings are read from config_class.
+    """
+    def setting(name: str, default: Any) -> Any:
+        if config_class is not None:
+            return getattr(config_class, name, default)
+        return app.config.get(name, default)
+
+    state = StartupState(
+        retries=setting('STARTUP_WARMUP_RETRIES', 3),
+        backoff=setting('STARTUP_WARMUP_BACKOFF_SECONDS', 1.0),
+        retry_interval=setting('STARTUP_WARMUP_RETRY_SECONDS', 10.0)
+    )
+    app.extensions['startup'] = state
+    return state
+
+def startup_state(app: Flask) -> StartupState:
+    return app.extensions['startup']
+
+def add_warmup_task(app: Flask, name: str, task: Callable[[], None], required: bool = False) -> None:
+    """
+    Run task on the app's warmup thread, inside an app context
+    (Blueprint.record_once friendly); required tasks gate readiness
+    """
+    def run() -> None:
+        with app.app_context():
+            task()
+    
+    startup_state(app).add_warmup_task(name, run, required)
@@ -1,138 +1,60 @@
 # app/utils/validation.py
-from typing import Dict, Any, TypedDict
+from typing import Any, Callable, Dict, List, NamedTuple, TypedDict
 import re
 from urllib.parse import urlparse
 
+# Profile fields that search requests may filter on
+SEARCH_FILTER_FIELDS = ('company', 'university', 'highSchool', 'currentRole')
+
 class ValidationResult(TypedDict):
     valid: bool
     message: str
 
-def validate_profile_data(data: Dict[str, Any], is_update: bool = False) -> ValidationResult:
-    """
-    Validate alumni profile data.
-    
-    Args:
-        data: Dictionary containing profile fields
-        is_update: Boolean indicating if this is an update operation
-        
-    Returns:
-        Dictionary containing validation result and error message if any
-    """
-    # Required fields for new profiles
-    required_fields = {
-        'fullName': str,
-        'currentRole': str,
-        'company': str,
-        'university': str,
-        'highSchool': str,
-        'linkedInURL': str
-    }
-    
-    # For updates, we don't require all fields to be present
-    if not is_update:
-        # Check for missing required fields
-        missing_fields = [field for field in required_fields if field not in data]
-        if missing_fields:
-            return ValidationResult(
-                valid=False,
-                message=f"Missing required fields: {', '.join(missing_fields)}"
-            )
-    
-    # Validate present fields
-    for field, value in data.items():
-        # Check if field is allowed
-        if field not in required_fields:
-            return ValidationResult(
-                valid=False,
-                message=f"Unknown field: {field}"
-            )
-        
-        # Check field type
-        if not isinstance(value, required_fields[field]):
-            return ValidationResult(
-                valid=False,
-                message=f"Field '{field}' must be of type {required_fields[field].__name__}"
-            )
-        
-        # Check if value is empty string
-        if isinstance(value, str) and not value.strip():
-            return ValidationResult(
-                valid=False,
-                message=f"Field '{field}' cannot be empty"
-            )
-    
-    # Specific field validations
-    if 'fullName' in data:
-        if not validate_full_name(data['fullName']):
-            return ValidationResult(
-                valid=False,
-                message="Full name must be 2-100 characters long and contain only letters, spaces, and hyphens"
-            )
-    
-    if 'linkedInURL' in data:
-        if not validate_linkedin_url(data['linkedInURL']):
-            return ValidationResult(
-                valid=False,
-                message="Invalid LinkedIn URL format"
-            )
-    
-    if 'currentRole' in data:
-        if not validate_role(data['currentRole']):
-            return ValidationResult(
-                valid=False,
-                message="Current role must be 2-100 characters long"
-            )
-    
-    if 'company' in data:
-        if not validate_company(data['company']):
-            return ValidationResult(
-                valid=False,
-                message="Company name must be 2-100 characters long"
-            )
-    
-    if 'university' in data:
-        if not validate_institution(data['university']):
-            return ValidationResult(
-                valid=False,
-                message="University name must be 2-200 characters long"
-            )
-    
-    if 'highSchool' in data:
-        if not validate_institution(data['highSchool']):
-            return ValidationResult(
-                valid=False,
-                message="High school name must be 2-200 characters long"
-            )
-    
-    return ValidationResult(valid=True, message="")
+# Compiled once at import; validation runs per profile on batch payloads
+FULL_NAME_PATTERN = re.compile(r'[A-Za-z\s-]{2,100}')
+LINKEDIN_PATH_PATTERN = re.compile(r'/in/[\w-]+/?')
+LINKEDIN_HOSTS = frozenset({'www.linkedin.com', 'linkedin.com'})
+
+# Default upper bound for /batch payloads; see Config.PROFILE_BATCH_MAX_SIZE
+MAX_BATCH_SIZE = 1000
+
+class BatchItemError(TypedDict):
+    index: int
+    message: str
+
+class BatchValidationResult(TypedDict):
+    valid: bool
+    message: str
+    valid_indices: List[int]
+    errors: List[BatchItemError]
+
+class FieldRule(NamedTuple):
+    check: Callable[[str], bool]
+    message: str
 
 def validate_full_name(name: str) -> bool:
     """Validate full name format."""
     # Allow letters, spaces, and hyphens, 2-100 chars
-    pattern = r'^[A-Za-z\s-]{2,100}$'
-    return bool(re.match(pattern, name))
+    return FULL_NAME_PATTERN.fullmatch(name) is not None
 
 def validate_linkedin_url(url: str) -> bool:
     """Validate LinkedIn URL format."""
     try:
         # Parse URL
         parsed = urlparse(url)
-        
-        # Check basic URL structure
-        if not all([parsed.scheme, parsed.netloc]):
-            return False
-        
-        # Check if it's a LinkedIn URL
-        if not parsed.netloc.lower() in ['www.linkedin.com', 'linkedin.com']:
-            return False
-        
-        # Check profile path format
-        if not re.match(r'^/in/[\w-]+/?$', parsed.path):
-            return False
-        
-        return True
-    except:
+    except ValueError:
         return False
+    
+    # Check basic URL structure
+    if not (parsed.scheme and parsed.netloc):
+        return False
+    
+    # Check if it's a LinkedIn URL
+    if parsed.netloc.lower() not in LINKEDIN_HOSTS:
+        return False
+    
+    # Check profile path format
+    return LINKEDIN_PATH_PATTERN.fullmatch(parsed.path) is not None
 
 def validate_role(role: str) -> bool:
     """Validate role name."""
@@ -149,44 +71,110 @@ def validate_institution(institution: str) -> bool:
     # Allow letters, numbers, spaces, and basic punctuation, 2-200 chars
     return 2 <= len(institution) <= 200
 
-def validate_batch_profiles(profiles_data: list) -> ValidationResult:
+# Profile schema: every field is a required, non-empty string with its own check
+PROFILE_SCHEMA: Dict[str, FieldRule] = {
+    'fullName': FieldRule(
+        validate_full_name,
+        "Full name must be 2-100 characters long and contain only letters, spaces, and hyphens"
+    ),
+    'currentRole': FieldRule(validate_role, "Current role must be 2-100 characters long"),
+    'company': FieldRule(validate_company, "Company name must be 2-100 characters long"),
+    'university': FieldRule(validate_institution, "University name must be 2-200 characters long"),
+    'highSchool': FieldRule(validate_institution, "High school name must be 2-200 characters long"),
+    'linkedInURL': FieldRule(validate_linkedin_url, "Invalid LinkedIn URL format"),
+}
+PROFILE_REQUIRED_FIELDS = frozenset(PROFILE_SCHEMA)
+
+def profile_errors(data: Any, is_update: bool = False) -> List[str]:
     """
-    Validate batch profile creation data.
+    Check a profile against PROFILE_SCHEMA in a single pass.
     
     Args:
-        profiles_data: List of profile dictionaries
+        data: Candidate profile
+        is_update: Boolean indicating if this is an update operation
         
     Returns:
-        ValidationResult indicating if the batch data is valid
+        Every problem found, empty when the profile is valid
     """
-    if not isinstance(profiles_data, list):
-        return ValidationResult(
-            valid=False,
-            message="Profiles data must be a list"
-        )
+    if not isinstance(data, dict):
+        return ["Profile must be an object"]
     
-    if not profiles_data:
-        return ValidationResult(
-            valid=False,
-            message="Profiles list cannot be empty"
-        )
+    errors = []
     
-    if len(profiles_data) > 100:  # Limit batch size
-        return ValidationResult(
-            valid=False,
-            message="Maximum 100 profiles allowed per batch"
-        )
+    # For updates, we don't require all fields to be present
+    if not is_update and not PROFILE_REQUIRED_FIELDS.issubset(data.keys()):
+        missing_fields = [field for field in PROFILE_SCHEMA if field not in data]
+        errors.append(f"Missing required fields: {', '.join(missing_fields)}")
     
-    # Validate each profile in the batch
-    for i, profile in enumerate(profiles_data):
-        result = validate_profile_data(profile)
-        if not result['valid']:
-            return ValidationResult(
-                valid=False,
-                message=f"Profile at index {i} is invalid: {result['message']}"
-            )
+    for field, value in data.items():
+        rule = PROFILE_SCHEMA.get(field)
+        if rule is None:
+            errors.append(f"Unknown field: {field}")
+        elif not isinstance(value, str):
+            errors.append(f"Field '{field}' must be of type str")
+        elif not value.strip():
+            errors.append(f"Field '{field}' cannot be empty")
+        elif not rule.check(value):
+            errors.append(rule.message)
+    
+    return errors
+
+def validate_profile_data(data: Dict[str, Any], is_update: bool = False) -> ValidationResult:
+    """
+    Validate alumni profile data.
     
-    return ValidationResult(valid=True, message="")
+    Args:
+        data: Dictionary containing profile fields
+        is_update: Boolean indicating if this is an update operation
+        
+    Returns:
+        Dictionary containing validation result and error message if any
+    """
+    errors = profile_errors(data, is_update)
+    return ValidationResult(valid=not errors, message="; ".join(errors))
+
+def validate_batch_profiles(profiles_data: list, max_size: int = MAX_BATCH_SIZE) -> BatchValidationResult:
+    """
+    Validate batch profile creation data.
+    
+    Every profile is checked, so callers can create the valid ones and report
+    the rest. `valid` is False when the payload itself is unusable (message
+    set) or when any profile failed (see errors).
+    
+    Args:
+        profiles_data: List of profile dictionaries
+        max_size: Maximum number of profiles accepted in one batch
+        
+    Returns:
+        BatchValidationResult with the indices that passed and per-item errors
+    """
+    if not isinstance(profiles_data, list):
+        message = "Profiles data must be a list"
+    elif not profiles_data:
+        message = "Profiles list cannot be empty"
+    elif len(profiles_data) > max_size:  # Limit batch size
+        message = f"Maximum {max_size} profiles allowed per batch"
+    else:
+        message = ""
+    
+    if message:
+        return BatchValidationResult(valid=False, message=message, valid_indices=[], errors=[])
+    
+    valid_indices = []
+    errors = []
+    for i, profile in enumerate(profiles_data):
+        item_errors = profile_errors(profile)
+        if item_errors:
+            errors.append(BatchItemError(index=i, message="; ".join(item_errors)))
+        else:
+            valid_indices.append(i)
+    
+    return BatchValidationResult(
+        valid=not errors,
+        message="",
+        valid_indices=valid_indices,
+        errors=errors
+    )
 
 def validate_search_params(data: Dict[str, Any]) -> ValidationResult:
     """Validate search request parameters"""
@@ -217,5 +205,24 @@ def validate_search_params(data: Dict[str, Any]) -> ValidationResult:
             valid=False,
             message="Offset must be non-negative"
         )
+    
+    filters = data.get('filters')
+    if filters is not None:
+        if not isinstance(filters, dict):
+            return ValidationResult(
+                valid=False,
+                message="Filters must be an object"
+            )
+        for field, value in filters.items():
+            if field not in SEARCH_FILTER_FIELDS:
+                return ValidationResult(
+                    valid=False,
+                    message=f"Cannot filter on field: {field}"
+                )
+            if not isinstance(value, str) or not value.strip():
+                return ValidationResult(
+                    valid=False,
+                    message=f"Filter '{field}' must be a non-empty string"
+                )
         
     return ValidationResult(valid=True, message="")
\ No newline at end of file
@@ -0,0 +1,21 @@
+# app/utils/vectors.py
+import numpy as np
+from bson.binary import Binary, BinaryVectorDtype
+
+# BSON vector dtype byte -> numpy dtype of the elements after the 2-byte header
+_NUMPY_DTYPES = {
+    BinaryVectorDtype.INT8.value: np.int8,
+    BinaryVectorDtype.FLOAT32.value: np.dtype('<f4'),
+    BinaryVectorDtype.PACKED_BIT.value: np.uint8,
+}
+
+def vector_to_numpy(vector: Binary) -> np.ndarray:
+    """
+    View a BSON binary vector as a NumPy array without copying.
+
+    Packed-bit vectors come back as their packed uint8 bytes.
+    """
+    dtype = _NUMPY_DTYPES.get(bytes(vector[:1]))
+    if dtype is None:
+        raise ValueError("Unsupported BSON vector dtype")
+    return np.frombuffer(vector, dtype=dtype, offset=2)
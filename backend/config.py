@@ -29,9 +29,104 @@ class Config:
     MONGO_DB_NAME = os.getenv('MONGO_DB_NAME', 'alum_ni')
     MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', 10))
     MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', 50))
+    # Atlas needs TLS; set False for a local mongod (e.g. load tests)
+    MONGO_TLS = os.getenv('MONGO_TLS', 'True').lower() == 'true'
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', 5000))
+    
+    # Startup: the app factory makes no network calls; the Mongo ping, index
+    # builds, embedding client and vector index load run on a background
+    # warmup thread (retried with exponential backoff) once the app exists
+    STARTUP_WARMUP = os.getenv('STARTUP_WARMUP', 'True').lower() == 'true'
+    STARTUP_WARMUP_RETRIES = int(os.getenv('STARTUP_WARMUP_RETRIES', 3))
+    STARTUP_WARMUP_BACKOFF_SECONDS = float(os.getenv('STARTUP_WARMUP_BACKOFF_SECONDS', 1))
+    STARTUP_WARMUP_RETRY_SECONDS = float(os.getenv('STARTUP_WARMUP_RETRY_SECONDS', 10))
     
     # Cohere settings
     COHERE_KEY = os.getenv('COHERE_KEY')
+    EMBEDDING_DIMENSIONS = int(os.getenv('EMBEDDING_DIMENSIONS', 1024))
+    # 'cohere', or 'fake' for deterministic offline embeddings (load tests, local dev)
+    EMBEDDING_PROVIDER = os.getenv('EMBEDDING_PROVIDER', 'cohere')
+    FAKE_EMBEDDING_LATENCY_MS = float(os.getenv('FAKE_EMBEDDING_LATENCY_MS', 0))
+    
+    # Vector search backend: 'atlas' ($vectorSearch), 'binary' (1-bit first pass
+    # with int8 rescoring), 'pgvector' or 'exact' (in-memory brute force that
+    # emulates $vectorSearch on any MongoDB)
+    VECTOR_BACKEND = os.getenv('VECTOR_BACKEND', 'atlas')
+    BINARY_OVERSAMPLE = int(os.getenv('BINARY_OVERSAMPLE', 10))
+    BINARY_INDEX_REFRESH_SECONDS = int(os.getenv('BINARY_INDEX_REFRESH_SECONDS', 300))
+    
+    # Postgres / pgvector Settings
+    PG_DSN = os.getenv('PG_DSN', 'dbname=alumni user=satvik host=localhost port=5432')
+    PG_MIN_POOL_SIZE = int(os.getenv('PG_MIN_POOL_SIZE', 1))
+    PG_MAX_POOL_SIZE = int(os.getenv('PG_MAX_POOL_SIZE', 10))
+    PGVECTOR_EF_SEARCH = int(os.getenv('PGVECTOR_EF_SEARCH', 100))
+    
+    # Largest /profiles/batch payload accepted (validation handles 10k+ profiles in well under a second)
+    PROFILE_BATCH_MAX_SIZE = int(os.getenv('PROFILE_BATCH_MAX_SIZE', 1000))
+    
+    # Profiles per validate/embed/bulk-write round in /profiles/import (Cohere caps embed calls at 96)
+    IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', 96))
+    
+    # Profiles per cursor batch / Arrow record batch in exports
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+    
+    # Search result cache; set SEARCH_CACHE_SOCKET to share one across workers
+    # (start it with `flask search-cache-server`). Not shared with the 'exact'
+    # and 'binary' backends, whose per-worker indexes lag other workers' writes
+    SEARCH_CACHE_ENABLED = os.getenv('SEARCH_CACHE_ENABLED', 'True').lower() == 'true'
+    SEARCH_CACHE_TTL = int(os.getenv('SEARCH_CACHE_TTL', 300))
+    SEARCH_CACHE_MAX_ENTRIES = int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', 10000))
+    SEARCH_CACHE_MAX_BYTES = int(os.getenv('SEARCH_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    SEARCH_CACHE_SOCKET = os.getenv('SEARCH_CACHE_SOCKET', '')
+    # Required with SEARCH_CACHE_SOCKET: the server unpickles what clients send,
+    # so the key must be a secret (e.g. `python -c "import secrets; print(secrets.token_hex(32))"`)
+    SEARCH_CACHE_AUTHKEY = os.getenv('SEARCH_CACHE_AUTHKEY', '')
+    
+    # Admission control for searches: SEARCH_WORKERS run at once, up to
+    # SEARCH_QUEUE_SIZE more wait, and the rest (or any still queued after
+    # SEARCH_TIMEOUT_SECONDS) get an immediate 503 + Retry-After. A search
+    # that started is left to finish, or answered 504 once it has run
+    # SEARCH_RUN_TIMEOUT_SECONDS past that. Each search may use
+    # SEARCH_NATIVE_THREADS BLAS/OpenMP threads.
+    SEARCH_WORKERS = int(os.getenv('SEARCH_WORKERS', 8))
+    SEARCH_QUEUE_SIZE = int(os.getenv('SEARCH_QUEUE_SIZE', 32))
+    SEARCH_TIMEOUT_SECONDS = float(os.getenv('SEARCH_TIMEOUT_SECONDS', 5))
+    SEARCH_RUN_TIMEOUT_SECONDS = float(os.getenv('SEARCH_RUN_TIMEOUT_SECONDS', 30))
+    SEARCH_RETRY_AFTER_SECONDS = int(os.getenv('SEARCH_RETRY_AFTER_SECONDS', 1))
+    SEARCH_NATIVE_THREADS = int(os.getenv('SEARCH_NATIVE_THREADS', 1))
+    
+    # Most completions /api/v1/search/suggest returns per request
+    SUGGEST_MAX_LIMIT = int(os.getenv('SUGGEST_MAX_LIMIT', 20))
+    
+    # JWT Settings: HS* tokens use JWT_SECRET_KEY; RS*/ES*/EdDSA tokens are
+    # checked against JWT_PUBLIC_KEY (PEM) or keys fetched from JWT_JWKS_URL
+    JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY')
+    JWT_ALGORITHMS = os.getenv('JWT_ALGORITHMS', 'HS256').split(',')
+    JWT_PUBLIC_KEY = os.getenv('JWT_PUBLIC_KEY')
+    JWT_JWKS_URL = os.getenv('JWT_JWKS_URL')
+    JWT_JWKS_CACHE_SECONDS = int(os.getenv('JWT_JWKS_CACHE_SECONDS', 300))
+    JWT_AUDIENCE = os.getenv('JWT_AUDIENCE')
+    JWT_ISSUER = os.getenv('JWT_ISSUER')
+    JWT_TOKEN_CACHE_SIZE = int(os.getenv('JWT_TOKEN_CACHE_SIZE', 10000))
+    # Upper bound for caching tokens that carry no exp claim
+    JWT_TOKEN_CACHE_SECONDS = int(os.getenv('JWT_TOKEN_CACHE_SECONDS', 300))
+    
+    # HTTP caching for profile reads
+    PROFILE_CACHE_MAX_AGE = int(os.getenv('PROFILE_CACHE_MAX_AGE', 60))
+    PROFILE_CACHE_STALE_WHILE_REVALIDATE = int(os.getenv('PROFILE_CACHE_STALE_WHILE_REVALIDATE', 300))
+    
+    # Opt-in request profiling: requests carrying PROFILING_HEADER set to
+    # PROFILING_TOKEN (or a random PROFILING_SAMPLE_RATE share) are sampled and
+    # written to PROFILING_DIR as collapsed stacks for flamegraph tools
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'False').lower() == 'true'
+    PROFILING_HEADER = os.getenv('PROFILING_HEADER', 'X-Profile')
+    PROFILING_TOKEN = os.getenv('PROFILING_TOKEN')
+    PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', 0.0))
+    PROFILING_INTERVAL_MS = float(os.getenv('PROFILING_INTERVAL_MS', 5))
+    PROFILING_DIR = os.getenv('PROFILING_DIR', '/tmp/alumni-profiles')
+    PROFILING_MAX_FILES = int(os.getenv('PROFILING_MAX_FILES', 500))
+    # Start tracemalloc at boot with this many frames (0 = only via /debug/memory/start)
+    PROFILING_TRACEMALLOC_FRAMES = int(os.getenv('PROFILING_TRACEMALLOC_FRAMES', 0))
     
     # Logging Configuration
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
@@ -0,0 +1,222 @@
+"""
+Benchmark cases for the request hot paths, all on seeded synthetic data.
+
+Nothing here talks to MongoDB, Cohere or a model: vectors are random unit
+vectors, profiles come from loadtest.data, and documents that would arrive
+from MongoDB are pre-encoded to BSON and decoded per call so the driver's
+decode cost is still part of the measurement.
+"""
+from datetime import datetime, timezone
+
+import bson
+import numpy as np
+from bson import ObjectId
+
+from loadtest.data import make_profile, make_query, new_rng
+from benchmarks.harness import case
+
+SEED = 20241104
+DIMENSION = 384  # all-MiniLM-L6-v2, as served by flask-server
+DECODE_ROWS = 100_000
+
+
+def unit_vectors(n, dim, seed=SEED):
+    vectors = np.random.default_rng(seed).standard_normal((n, dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def profiles(n, seed=SEED):
+    rng = new_rng(seed)
+    return [make_profile(rng, i) for i in range(n)]
+
+
+class RawBSONCollection:
+    """
+    Collection stand-in holding documents as encoded BSON
+
+    find()/aggregate() decode on every call, like pymongo does for each
+    cursor batch, but with no server or network in the loop.
+    """
+
+    def __init__(self, docs, key=None):
+        self._blobs = {}
+        for doc in docs:
+            self._blobs.setdefault(doc.get(key) if key else None, []).append(bson.encode(doc))
+        self._blobs = {value: b''.join(blobs) for value, blobs in self._blobs.items()}
+        self._key = key
+
+    def _decode(self, value):
+        blob = self._blobs.get(value)
+        return bson.decode_all(blob) if blob else []
+
+    def find(self, filter=None, projection=None):
+        value = (filter or {}).get(self._key) if self._key else None
+        # Operator filters such as {'$exists': False} match nothing here
+        return _Cursor([] if isinstance(value, dict) else self._decode(value))
+
+    def aggregate(self, pipeline):
+        return iter(self._decode(None))
+
+
+class _Cursor(list):
+    def batch_size(self, size):
+        return self
+
+
+def faiss_search(n):
+    import faiss
+    vectors = unit_vectors(n, DIMENSION)
+    index = faiss.IndexFlatL2(DIMENSION)
+    index.add(vectors)
+    del vectors
+    query = unit_vectors(1, DIMENSION, seed=SEED + 1)
+    return (lambda: index.search(query, 10)), 1
+
+
+@case('faiss_search[10k]', 'faiss')
+def faiss_search_10k():
+    return faiss_search(10_000)
+
+
+@case('faiss_search[100k]', 'faiss')
+def faiss_search_100k():
+    return faiss_search(100_000)
+
+
+@case('faiss_search[1m]', 'large')
+def faiss_search_1m():
+    # ~1.5 GB of float32 vectors; skipped by --quick
+    return faiss_search(1_000_000)
+
+
+def vector_decode(dtype):
+    from db.vector_codec import encode_vector, decode_vectors, _LAYOUTS
+    vectors = unit_vectors(DECODE_ROWS, DIMENSION)
+    header, element = _LAYOUTS[dtype]
+    if dtype == 'int8':
+        scales = (np.abs(vectors).max(axis=1) / 127).astype(np.float64)
+        codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype('i1')
+        payloads = [header + row.tobytes() for row in codes]
+        scales = scales.tolist()
+    else:
+        rows = vectors.astype(element)
+        payloads = [header + row.tobytes() for row in rows]
+        scales = None
+    # Sanity check that the synthetic payloads match what encode_vector writes
+    assert bytes(encode_vector(vectors[0], dtype)['vector'])[:len(header)] == header
+    return (lambda: decode_vectors(payloads, dtype, DIMENSION, scales)), DECODE_ROWS
+
+
+@case('vector_decode[float32]', 'load_vectors')
+def vector_decode_float32():
+    return vector_decode('float32')
+
+
+@case('vector_decode[float16]', 'load_vectors')
+def vector_decode_float16():
+    return vector_decode('float16')
+
+
+@case('vector_decode[int8]', 'load_vectors')
+def vector_decode_int8():
+    return vector_decode('int8')
+
+
+@case('load_matrix[float16]', 'load_vectors')
+def load_matrix_float16():
+    """flask-server load_vectors minus the network: BSON decode plus vector decode"""
+    from db.vector_codec import encode_vector, load_matrix, MODEL_NAME
+    vectors = unit_vectors(DECODE_ROWS, DIMENSION)
+    docs = []
+    for vector in vectors:
+        docs.append({'alumniId': str(ObjectId()), **encode_vector(vector, 'float16')})
+    collection = RawBSONCollection(docs, key='dtype')
+    return (lambda: load_matrix(collection, DIMENSION, MODEL_NAME)), DECODE_ROWS
+
+
+@case('search_by_text[100]', 'search')
+def search_by_text_100():
+    """Query embedding (offline client) through to the shaped result list"""
+    from app.services.embeddings import FakeEmbeddingClient
+    from app.services.search import SearchService
+
+    now = datetime.now(timezone.utc)
+    results = [
+        {
+            'profile': {'_id': ObjectId(), **profile, 'dateUpdated': now},
+            'similarity_score': 0.9 - i / 1000
+        }
+        for i, profile in enumerate(profiles(100))
+    ]
+
+    class Database:
+        alumniProfiles = RawBSONCollection(results)
+
+    service = SearchService(Database(), cohere_api_key='unused')
+    service.co = FakeEmbeddingClient(dimensions=1024)
+    query = make_query(new_rng(SEED))
+    return (lambda: service.search_by_text(query, k=100)), 1
+
+
+@case('validate_profile_data[10k]', 'validation')
+def validate_profile_data_10k():
+    from app.utils.validation import validate_profile_data
+    batch = profiles(10_000)
+    return (lambda: [validate_profile_data(profile) for profile in batch]), len(batch)
+
+
+@case('validate_batch_profiles[1000]', 'validation')
+def validate_batch_profiles_1000():
+    from app.utils.validation import validate_batch_profiles
+    batch = profiles(1000)
+    # A few bad rows so the error path is exercised too
+    for i in range(0, len(batch), 100):
+        batch[i] = {**batch[i], 'linkedInURL': 'https://example.com/not-linkedin'}
+    return (lambda: validate_batch_profiles(batch)), len(batch)
+
+
+@case('alumni_profile_parse[1000]', 'model')
+def alumni_profile_parse_1000():
+    from app.models.profile import AlumniProfile
+    batch = profiles(1000)
+    return (lambda: [AlumniProfile(**profile) for profile in batch]), len(batch)
+
+
+@case('alumni_profile_dump[1000]', 'model')
+def alumni_profile_dump_1000():
+    from app.models.profile import AlumniProfile
+    models = [AlumniProfile(**profile) for profile in profiles(1000)]
+    return (lambda: [model.to_mongo() for model in models]), len(models)
+
+
+def search_response(n=100):
+    now = datetime.now(timezone.utc)
+    results = [
+        {'profile': {'_id': ObjectId(), **profile, 'dateUpdated': now}, 'similarity_score': 0.9 - i / 1000}
+        for i, profile in enumerate(profiles(n))
+    ]
+    return {
+        'status': 'success',
+        'data': {'query': 'software engineers from Berkeley', 'results': results,
+                 'count': n, 'total': n, 'has_more': False}
+    }
+
+
+def json_provider(provider_class):
+    from flask import Flask
+    provider = provider_class(Flask(__name__))
+    payload = search_response()
+    return (lambda: provider.dumps(payload)), 1
+
+
+@case('json_response[orjson]', 'serialization')
+def json_response_orjson():
+    from app.utils.serialization import OrjsonProvider
+    return json_provider(OrjsonProvider)
+
+
+@case('json_response[stdlib]', 'serialization')
+def json_response_stdlib():
+    from app.utils.serialization import MongoJSONProvider
+    return json_provider(MongoJSONProvider)
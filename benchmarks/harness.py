@@ -0,0 +1,126 @@
+"""
+Timing, baseline storage and regression checks for the benchmark suite.
+
+Each case is timed with the timeit recipe: calibrate a loop count that takes
+at least `min_time`, then time `repeat` such loops and keep the median
+per-call time along with the best. Regressions are judged on the best
+repeat: noise from other processes only ever adds time, so the minimum is
+the most repeatable number on a shared laptop or CI runner.
+"""
+import gc
+import json
+import os
+import platform
+import statistics
+import time
+from typing import Callable, Dict, NamedTuple
+
+CASES: Dict[str, 'Case'] = {}
+
+
+class Case(NamedTuple):
+    name: str
+    group: str
+    # Builds synthetic inputs and returns (fn, items): the callable to time
+    # and how many items (queries, profiles, vectors) one call processes
+    setup: Callable[[], tuple]
+
+
+def case(name, group='default'):
+    """Register a benchmark case; the decorated function is its setup."""
+    def register(setup):
+        CASES[name] = Case(name, group, setup)
+        return setup
+    return register
+
+
+class Result(NamedTuple):
+    name: str
+    median: float
+    best: float
+    items: int
+    loops: int
+
+    @property
+    def items_per_second(self):
+        return self.items / self.median if self.median else 0.0
+
+    def to_dict(self):
+        return {'median_s': self.median, 'best_s': self.best, 'items': self.items,
+                'items_per_second': self.items_per_second}
+
+
+def measure(name, fn, items, min_time=0.2, repeat=7):
+    """Median and best seconds per call of fn()."""
+    fn()  # warm caches and lazy initialization outside the timed loops
+
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9)) + 1)
+
+    timings = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(loops):
+                fn()
+            timings.append((time.perf_counter() - started) / loops)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return Result(name, statistics.median(timings), min(timings), items, loops)
+
+
+def machine_info():
+    """What a baseline was recorded on; numbers only compare on like hardware."""
+    import numpy as np
+    info = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor() or None,
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+    }
+    try:
+        import faiss
+        info['faiss'] = faiss.__version__
+    except ImportError:
+        info['faiss'] = None
+    return info
+
+
+def load_baselines(path):
+    if not os.path.exists(path):
+        return {'machine': None, 'results': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baselines(path, results, threads, merge_into=None):
+    data = merge_into or {'results': {}}
+    data['machine'] = machine_info()
+    data['threads'] = threads
+    data['recorded_at'] = time.strftime('%Y-%m-%dT%H:%M:%S%z')
+    data['results'].update({result.name: result.to_dict() for result in results})
+    data['results'] = dict(sorted(data['results'].items()))
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+
+
+def compare(result, baseline, threshold):
+    """Relative change of the best time against a baseline entry, and whether it regressed."""
+    if baseline is None:
+        return None, False
+    change = result.best / baseline['best_s'] - 1
+    return change, change > threshold
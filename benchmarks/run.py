@@ -0,0 +1,125 @@
+"""
+Run the micro-benchmark suite and compare against stored baselines.
+
+Usage (from the repository root):
+    python -m benchmarks.run --save               # record baselines.json on this machine first
+    python -m benchmarks.run                      # run everything, compare to baselines.json
+    python -m benchmarks.run --quick              # skip the 1M-vector FAISS case
+    python -m benchmarks.run -k faiss -k decode   # only cases whose name contains a pattern
+    python -m benchmarks.run --threshold 0.5 --json results.json
+
+Exits with status 1 when any case's best time is more than --threshold
+slower than its baseline, after --retries re-measurements. Baselines are only meaningful on the machine that
+recorded them (see the "machine" block in baselines.json), so the file is
+not committed: record it once per machine from the base commit, then
+compare feature commits to it. The default threshold sits above the run to
+run spread of a small shared VM (about 25%); lower it on quieter machines.
+Thread counts are pinned (--threads, default 1) so results don't depend
+on what else the machine is doing.
+"""
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINES = os.path.join(ROOT, 'benchmarks', 'baselines.json')
+
+
+def pin_threads(threads):
+    # Must happen before numpy/faiss start their thread pools
+    for var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ[var] = str(threads)
+    try:
+        import faiss
+        faiss.omp_set_num_threads(threads)
+    except ImportError:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the search and profile hot paths")
+    parser.add_argument('-k', dest='patterns', action='append', default=[], help="only run cases containing this text")
+    parser.add_argument('--quick', action='store_true', help="skip the large (1M vector) cases")
+    parser.add_argument('--threads', type=int, default=1, help="BLAS/OpenMP threads")
+    parser.add_argument('--min-time', type=float, default=0.2, help="seconds per timed repeat")
+    parser.add_argument('--repeat', type=int, default=7, help="timed repeats per case")
+    parser.add_argument('--threshold', type=float, default=0.30, help="allowed slowdown of the best time vs baseline")
+    parser.add_argument('--retries', type=int, default=2, help="re-measure a regressed case up to N times")
+    parser.add_argument('--baselines', default=DEFAULT_BASELINES, help="baseline file")
+    parser.add_argument('--save', action='store_true', help="write results as the new baselines")
+    parser.add_argument('--json', dest='json_path', help="also write results as JSON")
+    args = parser.parse_args(argv)
+
+    pin_threads(args.threads)
+    # Benchmarks import backend code the way the backend does (app., config)
+    os.environ.setdefault('EMBEDDING_PROVIDER', 'fake')
+    sys.path[:0] = [ROOT, os.path.join(ROOT, 'backend')]
+
+    from benchmarks import cases  # noqa: F401 - registers the cases
+    from benchmarks.harness import CASES, measure, load_baselines, save_baselines, compare, machine_info
+
+    selected = [
+        c for c in CASES.values()
+        if (not args.patterns or any(p in c.name for p in args.patterns))
+        and not (args.quick and c.group == 'large')
+    ]
+    baselines = load_baselines(args.baselines)
+    if not baselines['results'] and not args.save:
+        print(f"note: no baselines in {os.path.relpath(args.baselines)}; "
+              "run with --save on the base commit to record them\n", file=sys.stderr)
+    elif baselines.get('machine') and not args.save:
+        recorded, current = baselines['machine'], machine_info()
+        if (recorded.get('platform'), recorded.get('cpu_count')) != (current['platform'], current['cpu_count']):
+            print("warning: baselines were recorded on a different machine; compare with care\n", file=sys.stderr)
+
+    print(f"{'case':<32}{'median':>12}{'best':>12}{'items/s':>14}{'vs base':>10}")
+    results, regressions = [], []
+    for benchmark in selected:
+        try:
+            fn, items = benchmark.setup()
+        except ImportError as e:
+            print(f"{benchmark.name:<32}  skipped ({e})")
+            continue
+        baseline = baselines['results'].get(benchmark.name)
+        result = measure(benchmark.name, fn, items, args.min_time, args.repeat)
+        change, regressed = compare(result, baseline, args.threshold)
+        for _ in range(args.retries if regressed else 0):
+            # A one-off stall is noise; a real regression reproduces
+            retry = measure(benchmark.name, fn, items, args.min_time, args.repeat)
+            result = retry if retry.best < result.best else result
+            change, regressed = compare(result, baseline, args.threshold)
+            if not regressed:
+                break
+        del fn
+        results.append(result)
+
+        if regressed:
+            regressions.append(result.name)
+        delta = '' if change is None else f"{change:+.1%}{' !' if regressed else ''}"
+        print(f"{result.name:<32}{format_seconds(result.median):>12}{format_seconds(result.best):>12}"
+              f"{result.items_per_second:>14,.0f}{delta:>10}", flush=True)
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({'machine': machine_info(), 'threads': args.threads,
+                       'results': {r.name: r.to_dict() for r in results}}, f, indent=2)
+    if args.save:
+        save_baselines(args.baselines, results, args.threads, merge_into=baselines if baselines['results'] else None)
+        print(f"\nSaved {len(results)} baselines to {os.path.relpath(args.baselines)}")
+        return 0
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def format_seconds(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+if __name__ == '__main__':
+    sys.exit(main())
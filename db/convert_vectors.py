@@ -0,0 +1,84 @@
+"""
+One-shot conversion of faissMapping documents to the typed vector format.
+
+Rewrites every document whose vector is headerless raw float32 (or stored in
+a different dtype than requested) using db.vector_codec, in unordered bulk
+batches. Documents whose vector is unusable, such as the raw strings older
+insert_vector calls stored, are reported and optionally deleted.
+
+Usage (from the repository root):
+    python -m db.convert_vectors [--dtype float16] [--drop-invalid]
+"""
+import argparse
+import sys
+
+from pymongo import DeleteOne, UpdateOne
+
+from db.db_utils import get_db_connection
+from db.vector_codec import DIMENSION, DTYPES, MODEL_NAME, decode_vectors, encode_vector, vector_to_float32
+
+
+def to_float32(doc, dim):
+    """Decode any stored form of a vector, or None if it is unusable."""
+    value = doc.get('vector')
+    if not isinstance(value, bytes):
+        return None
+    try:
+        if 'dtype' in doc:
+            scales = [doc['scale']] if doc['dtype'] == 'int8' else None
+            return decode_vectors([value], doc['dtype'], doc['dim'], scales)[0]
+        vector = vector_to_float32(value)
+    except (KeyError, ValueError):
+        return None
+    return vector if vector.shape[0] == dim else None
+
+
+def convert(dtype, dim=DIMENSION, model=MODEL_NAME, batch_size=1000, drop_invalid=False):
+    client = get_db_connection()
+    try:
+        faiss_mapping = client['alum_ni']['faissMapping']
+        # $ne also matches legacy documents that have no dtype at all
+        query = {'dtype': {'$ne': dtype}}
+
+        converted = invalid = 0
+        operations = []
+        for doc in faiss_mapping.find(query).batch_size(batch_size):
+            vector = to_float32(doc, dim)
+            if vector is None:
+                invalid += 1
+                print(f"Invalid vector for profile {doc.get('alumniId')}")
+                if drop_invalid:
+                    operations.append(DeleteOne({'_id': doc['_id']}))
+            else:
+                operations.append(UpdateOne(
+                    {'_id': doc['_id']},
+                    {'$set': encode_vector(vector, dtype, doc.get('model', model))}
+                ))
+                converted += 1
+
+            if len(operations) >= batch_size:
+                faiss_mapping.bulk_write(operations, ordered=False)
+                operations = []
+                print(f"Converted {converted} vectors", flush=True)
+
+        if operations:
+            faiss_mapping.bulk_write(operations, ordered=False)
+    finally:
+        client.close()
+
+    print(f"Converted {converted} vectors to {dtype}; {invalid} invalid"
+          + (" (deleted)" if drop_invalid and invalid else ""))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert faissMapping vectors to the typed storage format")
+    parser.add_argument('--dtype', choices=DTYPES, default='float16')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--drop-invalid', action='store_true', help="delete documents whose vector cannot be decoded")
+    args = parser.parse_args(argv)
+
+    convert(args.dtype, batch_size=args.batch_size, drop_invalid=args.drop_invalid)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
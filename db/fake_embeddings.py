@@ -0,0 +1,46 @@
+"""
+Deterministic offline embeddings for load tests and local development
+
+Mirrors backend/app/services/embeddings.py: a text's vector is the
+normalized sum of per-token pseudo-random vectors, so texts sharing words
+score as similar without downloading or running a model.
+"""
+import re
+from functools import lru_cache
+from hashlib import blake2b
+
+import numpy as np
+
+_TOKEN = re.compile(r'\w+')
+
+
+@lru_cache(maxsize=65536)
+def _token_vector(token, dimension):
+    seed = int.from_bytes(blake2b(token.encode(), digest_size=8).digest(), 'little')
+    return np.random.default_rng(seed).standard_normal(dimension).astype(np.float32)
+
+
+def token_sum(text, dimension):
+    """Unnormalized sum of the token vectors in text; additive over concatenation."""
+    vector = np.zeros(dimension, dtype=np.float32)
+    for token in _TOKEN.findall(text.lower()):
+        vector += _token_vector(token, dimension)
+    return vector
+
+
+def hashed_embedding(text, dimension):
+    vector = token_sum(text, dimension)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class FakeEncoder:
+    """Drop-in for SentenceTransformer.encode with hashed embeddings"""
+
+    def __init__(self, dimension=384):
+        self.dimension = dimension
+
+    def encode(self, sentences, **kwargs):
+        if isinstance(sentences, str):
+            return hashed_embedding(sentences, self.dimension)
+        return np.vstack([hashed_embedding(text, self.dimension) for text in sentences])
@@ -0,0 +1,252 @@
+"""
+Migrate the legacy Postgres AlumniProfiles/FaissMapping tables into MongoDB.
+
+Rows are streamed through a named (server-side) cursor in AlumniID order and
+written to alumniProfiles, faissMapping and legacyAlumniIds with unordered
+batched inserts. Postgres prepends the BSON vector header to each BYTEA
+vector, so the fetched buffer is handed to BSON as is, without decoding the
+individual elements or copying it in Python.
+
+Every migrated profile gets a deterministic ObjectId derived from its
+AlumniID alone, so re-running a batch (after a crash, or later, once rows
+have been edited in Postgres) only produces duplicate-key errors that are
+safely ignored. The last committed AlumniID is checkpointed to resume
+interrupted runs.
+
+Usage (from the repository root):
+    python -m db.migrate_postgres migrate [--batch-size 5000] [--restart]
+    python -m db.migrate_postgres verify
+"""
+import argparse
+import hashlib
+import os
+import struct
+import sys
+import time
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+
+from db.db_utils import get_db_connection, get_pg_connection, load_checkpoint, save_checkpoint
+from db.vector_codec import FLOAT32_HEADER, bson_vector, encode_vector, vector_to_float32
+
+DEFAULT_CHECKPOINT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.migrate_postgres.json')
+DUPLICATE_KEY = 11000
+PROFILE_FIELDS = ('fullName', 'currentRole', 'company', 'university', 'highSchool', 'linkedInURL')
+
+# Latest vector per profile; FaissMapping has no unique constraint on AlumniID.
+# '\x2700' is FLOAT32_HEADER: the vector arrives as a complete BSON vector payload
+STREAM_QUERY = '''
+    SELECT p.AlumniID, p.FullName, p.CurrentRole, p.Company, p.University,
+           p.HighSchool, p.LinkedInURL, p.DateUpdated, '\\x2700'::bytea || m.Vector
+    FROM AlumniProfiles p
+    LEFT JOIN LATERAL (
+        SELECT f.Vector FROM FaissMapping f
+        WHERE f.AlumniID = p.AlumniID
+        ORDER BY f.FaissID DESC
+        LIMIT 1
+    ) m ON TRUE
+    WHERE p.AlumniID > %s
+    ORDER BY p.AlumniID
+'''
+
+
+def legacy_object_id(alumni_id):
+    """Deterministic ObjectId: a zero timestamp followed by the 8-byte AlumniID."""
+    return ObjectId(struct.pack('>IQ', 0, alumni_id))
+
+
+def stream_rows(pg_conn, after_id, batch_size):
+    """Yield lists of rows from a named server-side cursor."""
+    with pg_conn.cursor(name='alumni_migration') as cursor:
+        cursor.itersize = batch_size
+        cursor.execute(STREAM_QUERY, (after_id,))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield rows
+
+
+def build_documents(rows):
+    profiles, vectors, mappings = [], [], []
+    for alumni_id, full_name, role, company, university, high_school, url, date_updated, vector in rows:
+        object_id = legacy_object_id(alumni_id)
+        profiles.append({
+            '_id': object_id,
+            'fullName': full_name,
+            'currentRole': role,
+            'company': company,
+            'university': university,
+            'highSchool': high_school,
+            'linkedInURL': url,
+            'dateUpdated': date_updated or datetime.now(timezone.utc)
+        })
+        # Rows without a DateUpdated get a fill-in timestamp; verify must skip it
+        mappings.append({'_id': alumni_id, 'profileId': object_id, 'hasDateUpdated': date_updated is not None})
+        if vector is not None:
+            # Reuse the profile ObjectId so re-inserts collide instead of duplicating
+            vectors.append({
+                '_id': object_id,
+                'alumniId': str(object_id),
+                # Typed header, so load_matrix() takes its bulk float32 path
+                **encode_vector(bson_vector(vector), 'float32')
+            })
+    return profiles, vectors, mappings
+
+
+def insert_unordered(collection, documents):
+    """Insert a batch, treating documents that already exist as migrated."""
+    if not documents:
+        return 0
+    try:
+        return len(collection.insert_many(documents, ordered=False).inserted_ids)
+    except BulkWriteError as e:
+        errors = e.details.get('writeErrors', [])
+        fatal = [error for error in errors if error.get('code') != DUPLICATE_KEY]
+        if fatal:
+            raise
+        return e.details.get('nInserted', 0)
+
+
+def migrate(batch_size, checkpoint_path, restart=False):
+    if restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    state = load_checkpoint(checkpoint_path)
+    last_id = state.get('last_alumni_id', 0)
+    counts = state.get('counts', {'profiles': 0, 'vectors': 0})
+
+    pg_conn = get_pg_connection()
+    client = get_db_connection()
+    try:
+        db = client['alum_ni']
+        db['faissMapping'].create_index('alumniId')
+
+        if last_id:
+            print(f"Resuming after AlumniID {last_id}")
+        started = time.monotonic()
+        migrated = 0
+
+        for rows in stream_rows(pg_conn, last_id, batch_size):
+            profiles, vectors, mappings = build_documents(rows)
+            counts['profiles'] += insert_unordered(db['alumniProfiles'], profiles)
+            counts['vectors'] += insert_unordered(db['faissMapping'], vectors)
+            # Mapping goes last: its presence means the whole row made it across
+            insert_unordered(db['legacyAlumniIds'], mappings)
+
+            last_id = rows[-1][0]
+            migrated += len(rows)
+            save_checkpoint(checkpoint_path, {'last_alumni_id': last_id, 'counts': counts})
+
+            rate = migrated / (time.monotonic() - started)
+            print(f"Migrated through AlumniID {last_id} | {migrated} rows | {rate:,.0f} rows/sec", flush=True)
+
+        pg_conn.commit()
+    finally:
+        pg_conn.close()
+        client.close()
+
+    print(f"Inserted {counts['profiles']} profiles and {counts['vectors']} vectors")
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+
+def row_digest(alumni_id, fields, date_updated, vector_bytes):
+    """64-bit digest of one migrated row, as seen from either database."""
+    h = hashlib.blake2b(digest_size=8)
+    h.update(str(alumni_id).encode())
+    for value in fields:
+        h.update(b'\x1f')
+        h.update(b'' if value is None else str(value).encode())
+    if date_updated is not None:
+        # MongoDB keeps millisecond precision
+        date_updated = date_updated.replace(microsecond=date_updated.microsecond // 1000 * 1000, tzinfo=None)
+        h.update(date_updated.isoformat().encode())
+    h.update(b'\x1e')
+    h.update(vector_bytes or b'')
+    return int.from_bytes(h.digest(), 'little')
+
+
+def postgres_checksum(pg_conn, batch_size):
+    count, checksum = 0, 0
+    for rows in stream_rows(pg_conn, 0, batch_size):
+        for alumni_id, *fields, date_updated, vector in rows:
+            # Digest the elements only, as mongo_checksum does
+            vector = bytes(memoryview(vector)[len(FLOAT32_HEADER):]) if vector is not None else None
+            checksum ^= row_digest(alumni_id, fields, date_updated, vector)
+        count += len(rows)
+    return count, checksum
+
+
+def mongo_checksum(db, batch_size):
+    count, checksum = 0, 0
+    cursor = db['legacyAlumniIds'].find({}).sort('_id', 1).batch_size(batch_size)
+    batch = []
+
+    def flush(batch):
+        ids = [mapping['profileId'] for mapping in batch]
+        profiles = {p['_id']: p for p in db['alumniProfiles'].find({'_id': {'$in': ids}})}
+        vectors = {v['_id']: v['vector'] for v in db['faissMapping'].find({'_id': {'$in': ids}}, {'vector': 1})}
+        digest = 0
+        for mapping in batch:
+            profile = profiles.get(mapping['profileId'])
+            if profile is None:
+                continue
+            vector = vectors.get(mapping['profileId'])
+            has_date = mapping['hasDateUpdated']
+            digest ^= row_digest(
+                mapping['_id'],
+                [profile.get(field) for field in PROFILE_FIELDS],
+                profile.get('dateUpdated') if has_date else None,
+                vector_to_float32(vector).tobytes() if vector is not None else None
+            )
+        return len(profiles), digest
+
+    for mapping in cursor:
+        batch.append(mapping)
+        if len(batch) == batch_size:
+            found, digest = flush(batch)
+            count, checksum = count + found, checksum ^ digest
+            batch = []
+    if batch:
+        found, digest = flush(batch)
+        count, checksum = count + found, checksum ^ digest
+    return count, checksum
+
+
+def verify(batch_size):
+    pg_conn = get_pg_connection()
+    client = get_db_connection()
+    try:
+        pg_count, pg_sum = postgres_checksum(pg_conn, batch_size)
+        mongo_count, mongo_sum = mongo_checksum(client['alum_ni'], batch_size)
+    finally:
+        pg_conn.close()
+        client.close()
+
+    print(f"Postgres: {pg_count} rows, checksum {pg_sum:016x}")
+    print(f"MongoDB:  {mongo_count} rows, checksum {mongo_sum:016x}")
+    if (pg_count, pg_sum) != (mongo_count, mongo_sum):
+        print("Verification FAILED")
+        return 1
+    print("Verification passed")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migrate legacy Postgres alumni data into MongoDB")
+    parser.add_argument('command', choices=['migrate', 'verify'])
+    parser.add_argument('--batch-size', type=int, default=5000, help="rows per cursor fetch and insert batch")
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT, help="checkpoint file used to resume")
+    parser.add_argument('--restart', action='store_true', help="ignore any checkpoint and start from the first row")
+    args = parser.parse_args(argv)
+
+    if args.command == 'verify':
+        return verify(args.batch_size)
+    migrate(args.batch_size, args.checkpoint, restart=args.restart)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
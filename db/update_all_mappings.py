@@ -1,51 +1,184 @@
-import psycopg2
-import numpy as np
-from sentence_transformers import SentenceTransformer
-
-# Database connection details
-DB_NAME = "alumni"
-DB_USER = "satvik"
-DB_PASSWORD = "12345"
-DB_HOST = "localhost"
-DB_PORT = "5432"
-
-# Initialize the embedding model
-model = SentenceTransformer('all-MiniLM-L6-v2')
-
-# Establish database connection
-conn = psycopg2.connect(
-    dbname=DB_NAME,
-    user=DB_USER,
-    password=DB_PASSWORD,
-    host=DB_HOST,
-    port=DB_PORT
-)
-cursor = conn.cursor()
-
-# Fetch all profiles from the AlumniProfiles table
-cursor.execute("SELECT AlumniID, FullName, CurrentRole, Company, University, HighSchool FROM AlumniProfiles;")
-profiles = cursor.fetchall()
-
-# Iterate over each profile and generate new vectors
-for profile in profiles:
-    alumni_id = profile[0]
-    profile_text = f"{profile[1]} at {profile[3]}, graduated from {profile[4]}"
-    
-    # Generate the vector embedding
-    new_vector = model.encode(profile_text).astype('float32').tobytes()
-    
-    # Update or insert the new vector in the FaissMapping table
-    cursor.execute("""
-        INSERT INTO FaissMapping (AlumniID, Vector)
-        VALUES (%s, %s)
-        ON CONFLICT (AlumniID)
-        DO UPDATE SET Vector = EXCLUDED.Vector;
-    """, (alumni_id, new_vector))
-    conn.commit()
-    print(f"Updated vector for AlumniID {alumni_id}")
-
-# Close the connection
-cursor.close()
-conn.close()
-
-print("All vectors have been updated in the FaissMapping table.")
+"""
+Re-embed every alumni profile into the faissMapping collection.
+
+Profiles are streamed from alumniProfiles in _id order, encoded in large
+batches across a pool of worker processes and written back with unordered
+bulk upserts keyed on alumniId. Progress is checkpointed after every
+acknowledged write, so an interrupted run picks up where it stopped.
+
+Usage (from the repository root):
+    python -m db.update_all_mappings [--batch-size 512] [--workers 4] [--restart]
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from multiprocessing import get_context
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from db.db_utils import get_db_connection, load_checkpoint, profile_text, save_checkpoint
+from db.vector_codec import DTYPES, encode_vector
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+DEFAULT_CHECKPOINT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.update_all_mappings.json')
+PROFILE_PROJECTION = {
+    '_id': 1,
+    'fullName': 1,
+    'currentRole': 1,
+    'company': 1,
+    'university': 1,
+    'highSchool': 1
+}
+
+# Per-process model, created once by the pool initializer
+_model = None
+
+
+def _init_worker(model_name, threads_per_worker):
+    global _model
+    if model_name == 'fake':
+        # Hashed offline embeddings for load tests (see db/fake_embeddings.py)
+        from db.fake_embeddings import FakeEncoder
+        _model = FakeEncoder()
+        return
+
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    # Keep workers from oversubscribing the CPU with their own thread pools
+    torch.set_num_threads(threads_per_worker)
+    _model = SentenceTransformer(model_name)
+
+
+def _encode_batch(ids, texts):
+    vectors = _model.encode(texts, batch_size=len(texts), convert_to_numpy=True)
+    return ids, vectors.astype('float32', copy=False)
+
+
+def iter_batches(collection, last_id, batch_size):
+    """Stream (ids, texts) batches from a server-side cursor, resuming after last_id."""
+    query = {'_id': {'$gt': ObjectId(last_id)}} if last_id else {}
+    cursor = collection.find(query, PROFILE_PROJECTION).sort('_id', 1).batch_size(batch_size)
+
+    ids, texts = [], []
+    for profile in cursor:
+        ids.append(str(profile['_id']))
+        texts.append(profile_text(profile))
+        if len(ids) == batch_size:
+            yield ids, texts
+            ids, texts = [], []
+    if ids:
+        yield ids, texts
+
+
+def write_vectors(faiss_mapping, ids, vectors, dtype, model_name):
+    """Upsert one encoded batch with a single unordered bulk write."""
+    operations = [
+        UpdateOne(
+            {'alumniId': alumni_id},
+            {'$set': encode_vector(vector, dtype, model_name)},
+            upsert=True
+        )
+        for alumni_id, vector in zip(ids, vectors)
+    ]
+    faiss_mapping.bulk_write(operations, ordered=False)
+
+
+def format_eta(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}"
+
+
+def reembed(batch_size, workers, checkpoint_path, restart=False, model_name=MODEL_NAME, dtype='float16'):
+    if restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    state = load_checkpoint(checkpoint_path)
+    if state and state.get('model') != model_name:
+        raise SystemExit(
+            f"Checkpoint was written for model {state.get('model')!r}; rerun with --restart to re-embed with {model_name!r}"
+        )
+    last_id = state.get('last_id')
+    done = state.get('processed', 0)
+
+    client = get_db_connection()
+    try:
+        db = client['alum_ni']
+        alumni_profiles = db['alumniProfiles']
+        faiss_mapping = db['faissMapping']
+
+        # The upserts match on alumniId, so keep that lookup indexed
+        faiss_mapping.create_index('alumniId')
+
+        remaining = alumni_profiles.count_documents({'_id': {'$gt': ObjectId(last_id)}} if last_id else {})
+        if last_id:
+            print(f"Resuming after {last_id} ({done} profiles already embedded)")
+        print(f"Re-embedding {remaining} profiles with {workers} workers, batch size {batch_size}")
+
+        threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+        started = time.monotonic()
+        processed = 0
+
+        with get_context('spawn').Pool(workers, _init_worker, (model_name, threads_per_worker)) as pool:
+            # Bounded window of in-flight batches: keeps every worker busy without
+            # pulling the whole cursor into memory ahead of the writes.
+            pending = deque()
+            batches = iter_batches(alumni_profiles, last_id, batch_size)
+
+            def submit_next():
+                batch = next(batches, None)
+                if batch is not None:
+                    pending.append(pool.apply_async(_encode_batch, batch))
+
+            for _ in range(workers * 2):
+                submit_next()
+
+            while pending:
+                ids, vectors = pending.popleft().get()
+                submit_next()
+
+                write_vectors(faiss_mapping, ids, vectors, dtype, model_name)
+                processed += len(ids)
+                save_checkpoint(checkpoint_path, {
+                    'last_id': ids[-1],
+                    'processed': done + processed,
+                    'model': model_name
+                })
+
+                elapsed = time.monotonic() - started
+                rate = processed / elapsed if elapsed else 0.0
+                eta = (remaining - processed) / rate if rate else 0.0
+                print(
+                    f"{processed}/{remaining} profiles | {rate:,.0f} rows/sec | ETA {format_eta(eta)}",
+                    flush=True
+                )
+    finally:
+        client.close()
+
+    elapsed = time.monotonic() - started
+    print(f"Re-embedded {processed} profiles in {format_eta(elapsed)}")
+    # Completed runs start from scratch next time
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-embed all alumni profiles into faissMapping")
+    parser.add_argument('--batch-size', type=int, default=512, help="profiles per encode/write batch")
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) // 2), help="encoder processes")
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT, help="checkpoint file used to resume")
+    parser.add_argument('--restart', action='store_true', help="ignore any checkpoint and re-embed everything")
+    parser.add_argument('--model', default=MODEL_NAME, help="sentence-transformers model name, or 'fake' for offline hashed embeddings")
+    parser.add_argument('--dtype', choices=DTYPES, default='float16', help="stored vector precision")
+    args = parser.parse_args(argv)
+
+    reembed(args.batch_size, args.workers, args.checkpoint, restart=args.restart,
+            model_name=args.model, dtype=args.dtype)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Compact, typed storage format for faissMapping vectors.
+
+Each faissMapping document carries its vector plus a small header:
+
+    {
+        'alumniId': '6726ac2b41c292327ac3b0a4',
+        'vector': Binary(...),
+        'dtype': 'float16',            # float32 | float16 | int8
+        'dim': 384,
+        'model': 'all-MiniLM-L6-v2',
+        'scale': 0.0071                # int8 only: value = code * scale
+    }
+
+float32 and int8 vectors are BSON binary vectors (subtype 9: a two byte
+dtype/padding header followed by the raw little-endian elements, the same
+bytes Binary.from_vector produces). BSON vectors have no half precision
+dtype, so float16 vectors are stored as plain binary.
+
+Documents written before the header existed hold raw float32 bytes and are
+still readable; db/convert_vectors.py rewrites them in place.
+"""
+import numpy as np
+from bson.binary import Binary, BinaryVectorDtype, VECTOR_SUBTYPE
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+DIMENSION = 384
+DTYPES = ('float32', 'float16', 'int8')
+
+FLOAT32_HEADER = BinaryVectorDtype.FLOAT32.value + b'\x00'
+INT8_HEADER = BinaryVectorDtype.INT8.value + b'\x00'
+
+# dtype -> (payload header, numpy element type)
+_LAYOUTS = {
+    'float32': (FLOAT32_HEADER, np.dtype('<f4')),
+    'float16': (b'', np.dtype('<f2')),
+    'int8': (INT8_HEADER, np.dtype('i1')),
+}
+
+
+def float32_bytes_to_bson(buf):
+    """Wrap a buffer of little-endian float32 values as a BSON binary vector."""
+    if len(buf) % 4:
+        raise ValueError(f"float32 buffer length {len(buf)} is not a multiple of 4")
+    # join reads the buffer in place: one copy to prepend the header
+    return bson_vector(b''.join((FLOAT32_HEADER, buf)))
+
+
+def bson_vector(payload):
+    """Wrap a buffer that already starts with FLOAT32_HEADER, with no copy of our own."""
+    if len(payload) % 4 != len(FLOAT32_HEADER):
+        raise ValueError(f"float32 vector payload length {len(payload)} is not a header plus a multiple of 4")
+    if payload[:len(FLOAT32_HEADER)] != FLOAT32_HEADER:
+        raise ValueError("payload does not start with the float32 vector header")
+    return Binary(payload, VECTOR_SUBTYPE)
+
+
+def encode_vector(vector, dtype='float16', model=MODEL_NAME):
+    """
+    Return the faissMapping fields ('vector' plus header) for one vector.
+
+    A float32 BSON binary vector (e.g. from bson_vector()) is stored as is
+    when dtype is 'float32', without decoding or copying its elements.
+    """
+    if isinstance(vector, Binary) and vector.subtype == VECTOR_SUBTYPE and vector[:2] == FLOAT32_HEADER:
+        if dtype == 'float32':
+            dim = (len(vector) - len(FLOAT32_HEADER)) // 4
+            return {'dtype': dtype, 'dim': dim, 'model': model, 'vector': vector}
+        vector = vector_to_float32(vector)
+    vector = np.asarray(vector, dtype=np.float32)
+    fields = {'dtype': dtype, 'dim': int(vector.shape[0]), 'model': model}
+
+    if dtype == 'float32':
+        fields['vector'] = Binary(FLOAT32_HEADER + vector.astype('<f4').tobytes(), VECTOR_SUBTYPE)
+    elif dtype == 'float16':
+        fields['vector'] = Binary(vector.astype('<f2').tobytes())
+    elif dtype == 'int8':
+        # Symmetric per-vector scale keeps the full int8 range for every vector
+        scale = float(np.abs(vector).max()) / 127 or 1.0
+        codes = np.clip(np.rint(vector / scale), -127, 127).astype('i1')
+        fields['vector'] = Binary(INT8_HEADER + codes.tobytes(), VECTOR_SUBTYPE)
+        fields['scale'] = scale
+    else:
+        raise ValueError(f"Unsupported vector dtype {dtype!r}; expected one of {DTYPES}")
+    return fields
+
+
+def vector_to_float32(value):
+    """Return a float32 view of a headerless stored vector, raw bytes or float32 BSON vector."""
+    if isinstance(value, Binary) and value.subtype == VECTOR_SUBTYPE:
+        if value[:2] != FLOAT32_HEADER:
+            raise ValueError("BSON vector is not float32")
+        return np.frombuffer(value, dtype='<f4', offset=2)
+    return np.frombuffer(value, dtype='<f4')
+
+
+def decode_vectors(payloads, dtype, dim, scales=None):
+    """
+    Decode same-typed payloads into an (n, dim) float32 matrix in one shot.
+
+    The payloads are concatenated and viewed as a single array, so the cost is
+    a couple of bulk copies regardless of how many vectors there are.
+    """
+    header, element = _LAYOUTS[dtype]
+    stride = len(header) + dim * element.itemsize
+    buf = b''.join(payloads)
+    if len(buf) != stride * len(payloads):
+        raise ValueError(f"{dtype} payloads do not all hold {dim}-dimensional vectors")
+
+    rows = np.frombuffer(buf, dtype=np.uint8).reshape(len(payloads), stride)
+    matrix = rows[:, len(header):].view(element).astype(np.float32)
+    if scales is not None:
+        matrix *= np.asarray(scales, dtype=np.float32)[:, None]
+    return matrix
+
+
+def load_matrix(collection, dim=DIMENSION, model=MODEL_NAME, batch_size=10000):
+    """
+    Load every usable vector from a faissMapping collection.
+
+    Returns (ids, matrix) with matrix an (n, dim) float32 array. Typed
+    documents are fetched per dtype and decoded in bulk; legacy headerless
+    documents fall back to a per-record check until they are converted.
+    """
+    ids, blocks = [], []
+    projection = {'_id': 0, 'alumniId': 1, 'vector': 1, 'scale': 1}
+
+    for dtype in DTYPES:
+        docs = list(collection.find({'dtype': dtype, 'dim': dim, 'model': model}, projection).batch_size(batch_size))
+        if not docs:
+            continue
+        scales = [doc['scale'] for doc in docs] if dtype == 'int8' else None
+        blocks.append(decode_vectors([doc['vector'] for doc in docs], dtype, dim, scales))
+        ids.extend(doc['alumniId'] for doc in docs)
+
+    legacy_ids, legacy_vectors = [], []
+    for doc in collection.find({'dtype': {'$exists': False}}, projection).batch_size(batch_size):
+        value = doc.get('vector')
+        if not isinstance(value, bytes):
+            continue
+        try:
+            vector = vector_to_float32(value)
+        except ValueError:
+            continue
+        if vector.shape[0] == dim:
+            legacy_ids.append(doc['alumniId'])
+            legacy_vectors.append(vector)
+    if legacy_vectors:
+        blocks.append(np.vstack(legacy_vectors))
+        ids.extend(legacy_ids)
+
+    matrix = np.vstack(blocks) if blocks else np.empty((0, dim), dtype=np.float32)
+    return ids, matrix
@@ -0,0 +1,116 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import contextvars
+import sys
+import threading
+import time
+
+from flask import g, has_app_context
+
+from metrics import SEARCH_QUEUE_DEPTH, SEARCH_IN_FLIGHT, SEARCH_REJECTIONS, SEARCH_TIMEOUTS, record_stage
+
+
+class Overloaded(Exception):
+    """Raised when a search is shed rather than left to queue"""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(f"Search rejected: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class SearchTimeout(Exception):
+    """Raised when an admitted search is still running after run_timeout"""
+
+
+class AdmissionController:
+    """
+    A fixed pool of search workers behind a bounded queue
+
+    At most `workers` searches (encode, FAISS, hydration) run at once and at
+    most `queue_size` more wait. Past that, or once a queued search's
+    deadline passes, run() raises Overloaded at once and /search answers
+    503 + Retry-After, so admitted requests keep steady latency under a
+    spike instead of every request timing out. A search that started in
+    time is left to finish; one still running run_timeout seconds after
+    the deadline raises SearchTimeout (504) and counts in SEARCH_TIMEOUTS.
+    """
+
+    def __init__(self, workers, queue_size, timeout, retry_after=1, run_timeout=None):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.run_timeout = run_timeout
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='search')
+        # One slot per running or queued search
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+
+    def _reject(self, reason):
+        SEARCH_REJECTIONS.labels(reason).inc()
+        return Overloaded(reason, self.retry_after)
+
+    def run(self, fn, *args):
+        """Run fn on the pool; raises Overloaded if shed, SearchTimeout if it overruns"""
+        if not self._slots.acquire(blocking=False):
+            raise self._reject('queue_full')
+
+        deadline = time.monotonic() + self.timeout
+        queued = time.perf_counter()
+        # Carry the request context over so timed() still feeds Server-Timing
+        context = contextvars.copy_context()
+
+        def execute():
+            SEARCH_QUEUE_DEPTH.dec()
+            record_stage('queue', time.perf_counter() - queued)
+            if time.monotonic() > deadline:
+                # Queued past its deadline: shed it rather than start it late
+                raise self._reject('deadline')
+            # A profiled request spends find_profiles here, not on its own thread
+            sampler = g.get('stack_sampler') if has_app_context() else None
+            if sampler is not None:
+                sampler.add_thread(threading.get_ident())
+            SEARCH_IN_FLIGHT.inc()
+            try:
+                return fn(*args)
+            finally:
+                SEARCH_IN_FLIGHT.dec()
+                if sampler is not None:
+                    sampler.discard_thread(threading.get_ident())
+
+        SEARCH_QUEUE_DEPTH.inc()
+        future = self._pool.submit(context.run, execute)
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            if future.cancel():
+                # Never started, so execute() won't take it off the queue
+                SEARCH_QUEUE_DEPTH.dec()
+                raise self._reject('deadline')
+        # Already running: the deadline only sheds queued searches, so let
+        # this one finish unless it overruns run_timeout as well
+        try:
+            return future.result(timeout=self.run_timeout)
+        except FutureTimeoutError:
+            SEARCH_TIMEOUTS.inc()
+            raise SearchTimeout(f"Search still running after {self.timeout + self.run_timeout:g}s")
+
+
+def limit_native_threads(threads):
+    """
+    Cap the threads one search may use in FAISS (OpenMP), BLAS and torch
+
+    Each of them otherwise starts a thread per core for every call, so
+    concurrent searches oversubscribe the CPU; search workers x threads
+    should not exceed the cores.
+    """
+    import faiss
+    faiss.omp_set_num_threads(threads)
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(limits=threads)
+    except ImportError:
+        print("threadpoolctl is not installed; BLAS thread counts are not limited")
+    torch = sys.modules.get('torch')
+    if torch is not None:
+        torch.set_num_threads(threads)
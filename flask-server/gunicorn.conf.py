@@ -0,0 +1,56 @@
+"""
+Production serving for the FAISS search server
+
+    cd flask-server
+    gunicorn -c gunicorn.conf.py app:app
+
+The app is imported once in the master (preload_app), which also loads the
+vectors from MongoDB and publishes them as a memory-mapped index generation
+in VECTOR_INDEX_DIR. Each forked worker maps that same file, so the vectors
+are in memory once however many workers run; only the encoder model is per
+worker. /rebuild-index and /add-profile on any worker publish to the shared
+index and every other worker picks the change up on its next request.
+
+Environment:
+    PORT              listen port (default 8000)
+    WEB_CONCURRENCY   worker processes (default: one per CPU)
+    GUNICORN_THREADS  threads per worker (default 4)
+    VECTOR_INDEX_DIR  shared index directory (default /dev/shm/alumni-faiss)
+    SEARCH_WORKERS    concurrent searches per worker (default: cores / workers);
+                      more wait in a SEARCH_QUEUE_SIZE queue, the rest get 503
+    VECTOR_INDEX_SHARDS  shard processes per worker scanning slices of the
+                      index in parallel (default 1: search in the worker);
+                      keep workers x shards near the core count
+"""
+import multiprocessing
+import os
+import tempfile
+
+bind = f"0.0.0.0:{os.getenv('PORT', 8000)}"
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+timeout = 120
+preload_app = True
+
+# /dev/shm is tmpfs: the mapped vectors are shared memory, never written to disk
+os.environ.setdefault('VECTOR_INDEX_DIR', os.path.join(
+    '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(), 'alumni-faiss'))
+# Split the cores between workers so their search pools don't oversubscribe them
+os.environ.setdefault('SEARCH_WORKERS', str(max(1, multiprocessing.cpu_count() // workers)))
+# Threads don't survive fork, so each worker starts its own warmup (post_fork)
+os.environ['WARMUP_AFTER_FORK'] = 'true'
+
+
+def on_starting(server):
+    """Build the index once, before any worker exists"""
+    import app
+    try:
+        app.build_index()
+    except Exception as e:
+        # Workers build it themselves on warmup if the master couldn't
+        server.log.warning(f"Could not build the shared index at startup: {e}")
+
+
+def post_fork(server, worker):
+    import app
+    app.readiness.start()
@@ -0,0 +1,90 @@
+import threading
+import time
+import traceback
+
+from flask import jsonify, request
+
+
+class Readiness:
+    """
+    Warmup steps a worker must finish before it takes search traffic
+
+    warmup() runs the steps in order on a background thread; the worker is
+    ready only once every step has succeeded. A failed run can be retried,
+    which the readiness probe does on its next call.
+    """
+
+    def __init__(self, steps, retry_interval=5.0):
+        self.steps = steps  # list of (name, fn)
+        self.retry_interval = retry_interval
+        self.ready = False
+        self.status = {name: {'status': 'pending'} for name, _ in steps}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._finished_at = None
+
+    def start(self):
+        """Run (or re-run) the warmup on a daemon thread unless one is running"""
+        with self._lock:
+            if self.ready or (self._thread is not None and self._thread.is_alive()):
+                return
+            self._thread = threading.Thread(target=self._run, name='search-warmup', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        started = time.perf_counter()
+        for name, step in self.steps:
+            if self.status[name]['status'] == 'done':
+                continue
+            self.status[name] = {'status': 'running'}
+            step_started = time.perf_counter()
+            try:
+                step()
+                self.status[name] = {'status': 'done'}
+            except Exception as e:
+                print(f"Warmup step {name!r} failed:")
+                print(traceback.format_exc())
+                self.status[name] = {'status': 'failed', 'error': str(e)}
+                break
+            finally:
+                self.status[name]['seconds'] = round(time.perf_counter() - step_started, 3)
+        self._finished_at = time.monotonic()
+        self.ready = all(state['status'] == 'done' for state in self.status.values())
+        print(f"Warmup {'finished' if self.ready else 'stopped'} in {time.perf_counter() - started:.2f}s")
+
+    def retry_if_due(self):
+        if self.ready or self._finished_at is None:
+            return
+        if time.monotonic() - self._finished_at >= self.retry_interval:
+            self.start()
+
+    def reset(self, *names):
+        """Mark steps to be redone (e.g. after the index is rebuilt)"""
+        for name in names:
+            self.status[name] = {'status': 'pending'}
+        self.ready = False
+
+
+def init_health(app, readiness, gated_endpoints=()):
+    """
+    Add /health/live and /health/ready, and answer gated endpoints with 503
+    until readiness.ready so no request ever hits a cold worker
+    """
+    @app.before_request
+    def reject_until_ready():
+        if request.endpoint in gated_endpoints and not readiness.ready:
+            response = jsonify({"status": "error", "message": "Search index is warming up"})
+            response.status_code = 503
+            response.headers['Retry-After'] = '1'
+            return response
+
+    @app.route('/health/live', methods=['GET'])
+    def liveness():
+        # The process is up and serving; says nothing about the index
+        return jsonify({"status": "ok"})
+
+    @app.route('/health/ready', methods=['GET'])
+    def readiness_probe():
+        readiness.retry_if_due()
+        body = {"status": "ready" if readiness.ready else "warming", "steps": readiness.status}
+        return jsonify(body), 200 if readiness.ready else 503
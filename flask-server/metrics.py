@@ -0,0 +1,76 @@
+import time
+from contextlib import contextmanager
+
+from flask import Response, g, has_request_context, request
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+LATENCY_BUCKETS = (.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+
+SEARCH_STAGE_SECONDS = Histogram(
+    'faiss_search_stage_seconds', 'Time spent in each stage of /search', ['stage'], buckets=LATENCY_BUCKETS
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    'faiss_http_request_seconds', 'HTTP request latency by endpoint', ['method', 'endpoint', 'status'],
+    buckets=LATENCY_BUCKETS
+)
+SEARCH_CACHE_LOOKUPS = Counter('faiss_search_cache_lookups_total', 'Search cache lookups', ['result'])
+ERRORS = Counter('faiss_errors_total', 'Errors by component', ['component'])
+INDEX_VECTORS = Gauge('faiss_index_vectors', 'Vectors in the FAISS index')
+INDEX_BYTES = Gauge('faiss_index_bytes', 'Approximate memory held by the FAISS index vectors')
+SEARCH_QUEUE_DEPTH = Gauge('faiss_search_queue_depth', 'Searches admitted and waiting for a search worker')
+SEARCH_IN_FLIGHT = Gauge('faiss_search_in_flight', 'Searches running on the search worker pool')
+SEARCH_REJECTIONS = Counter('faiss_search_rejections_total', 'Searches shed by admission control', ['reason'])
+SEARCH_TIMEOUTS = Counter('faiss_search_timeouts_total', 'Admitted searches still running after SEARCH_RUN_TIMEOUT_SECONDS')
+
+
+@contextmanager
+def timed(stage):
+    """Observe a /search stage and record it for the Server-Timing header"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started)
+
+
+def record_stage(stage, elapsed):
+    """Record a stage duration measured elsewhere (e.g. time spent queued)"""
+    SEARCH_STAGE_SECONDS.labels(stage).observe(elapsed)
+    if has_request_context():
+        g.setdefault('server_timing', []).append((stage, elapsed))
+
+
+def init_metrics(app, index_size):
+    """
+    Add /metrics and Server-Timing to the app
+
+    index_size is called at scrape time and returns (vectors, bytes) for the
+    current index, since /rebuild-index swaps the index object.
+    """
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop('request_started', None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_REQUEST_SECONDS.labels(request.method, endpoint, response.status_code).observe(elapsed)
+        if response.status_code >= 500:
+            ERRORS.labels('http').inc()
+        timings = g.pop('server_timing', [])
+        timings.append(('app', elapsed))
+        response.headers['Server-Timing'] = ', '.join(
+            f"{stage};dur={duration * 1000:.2f}" for stage, duration in timings
+        )
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        vectors, nbytes = index_size()
+        INDEX_VECTORS.set(vectors)
+        INDEX_BYTES.set(nbytes)
+        return Response(generate_latest(), mimetype=CONTENT_TYPE_LATEST)
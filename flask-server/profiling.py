@@ -0,0 +1,149 @@
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timezone
+
+from flask import g, jsonify, request
+
+_UNSAFE_FILENAME = re.compile(r'[^A-Za-z0-9_.-]+')
+
+
+class StackSampler:
+    """
+    Statistical profiler for the threads serving one request
+
+    Samples their stacks every `interval` seconds from a daemon thread and
+    counts collapsed stacks ("module:func;module:func"), which
+    flamegraph.pl, speedscope and inferno read directly.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.thread_ids = {threading.get_ident()}
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def add_thread(self, thread_id):
+        """Also sample a thread the request continues on (the search pool)"""
+        self.thread_ids = self.thread_ids | {thread_id}
+
+    def discard_thread(self, thread_id):
+        self.thread_ids = self.thread_ids - {thread_id}
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return time.perf_counter() - self._started
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in self.thread_ids:
+                frame = frames.get(thread_id)
+                stack = []
+                while frame is not None:
+                    stack.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}")
+                    frame = frame.f_back
+                if stack:
+                    self.samples[';'.join(reversed(stack))] += 1
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def init_profiling(app, directory, token=None, header='X-Profile', sample_rate=0.0,
+                   interval_ms=5, max_files=500):
+    """
+    Profile requests that carry `header: token` (or a random sample_rate share)
+    into `directory`, and serve tracemalloc reports at /debug/memory
+    """
+    os.makedirs(directory, exist_ok=True)
+    previous = {'snapshot': None}
+
+    def authorized():
+        return bool(token) and hmac.compare_digest(request.headers.get(header, ''), token)
+
+    @app.before_request
+    def start_profile():
+        if authorized() or (sample_rate and random.random() < sample_rate):
+            g.stack_sampler = StackSampler(interval_ms / 1000).start()
+
+    @app.after_request
+    def write_profile(response):
+        sampler = g.pop('stack_sampler', None)
+        if sampler is None:
+            return response
+        elapsed = sampler.stop()
+        timestamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S.%f')
+        endpoint = _UNSAFE_FILENAME.sub('_', request.endpoint or 'unmatched')
+        filename = f"{timestamp}-{request.method}-{endpoint}-{elapsed * 1000:.0f}ms.folded"
+        try:
+            sampler.write(os.path.join(directory, filename))
+            profiles = sorted(
+                (entry for entry in os.scandir(directory) if entry.name.endswith('.folded')),
+                key=lambda entry: entry.stat().st_mtime
+            )
+            for entry in profiles[:max(0, len(profiles) - max_files)]:
+                os.unlink(entry.path)
+            response.headers['X-Profile-File'] = filename
+        except OSError as e:
+            print("Could not write profile:", str(e))
+        return response
+
+    @app.route('/debug/memory', methods=['GET', 'POST'])
+    def memory_snapshot():
+        """
+        GET: top tracemalloc allocation sites (?limit, ?group_by, ?compare=true)
+        POST: start tracing (?frames=N), or stop with ?stop=true
+        """
+        if not authorized():
+            return jsonify({"status": "error", "message": "Not found"}), 404
+
+        if request.method == 'POST':
+            if request.args.get('stop', 'false').lower() == 'true':
+                tracemalloc.stop()
+                previous['snapshot'] = None
+            elif not tracemalloc.is_tracing():
+                tracemalloc.start(request.args.get('frames', default=10, type=int))
+            return jsonify({"status": "success", "tracing": tracemalloc.is_tracing()})
+
+        if not tracemalloc.is_tracing():
+            return jsonify({"status": "error", "message": "tracemalloc is not tracing; POST first"}), 409
+
+        limit = request.args.get('limit', default=25, type=int)
+        group_by = request.args.get('group_by', 'lineno')
+        if group_by not in ('lineno', 'filename', 'traceback'):
+            return jsonify({"status": "error", "message": "Invalid group_by"}), 400
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+        if request.args.get('compare', 'false').lower() == 'true' and previous['snapshot'] is not None:
+            top = [
+                {'site': str(stat.traceback), 'size': stat.size, 'size_diff': stat.size_diff,
+                 'count': stat.count, 'count_diff': stat.count_diff}
+                for stat in snapshot.compare_to(previous['snapshot'], group_by)[:limit]
+            ]
+        else:
+            top = [
+                {'site': str(stat.traceback), 'size': stat.size, 'count': stat.count}
+                for stat in snapshot.statistics(group_by)[:limit]
+            ]
+        previous['snapshot'] = snapshot
+        current, peak = tracemalloc.get_traced_memory()
+        return jsonify({"status": "success", "traced_bytes": current, "peak_bytes": peak, "top": top})
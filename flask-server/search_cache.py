@@ -0,0 +1,63 @@
+from collections import OrderedDict
+import threading
+import time
+
+
+class SearchCache:
+    """
+    LRU + TTL cache for /search responses
+
+    Keys include an index generation that is bumped whenever the FAISS index
+    changes (/add-profile, /rebuild-index), so stale results stop matching
+    immediately and are evicted as new entries come in. Take the key before
+    searching and pass it to both get() and set(): results computed while
+    the generation moved on are then dropped instead of cached as current.
+    """
+
+    def __init__(self, max_entries=2000, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, query, k):
+        return (self.generation, ' '.join(query.casefold().split()), k)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, results):
+        with self._lock:
+            if key[0] != self.generation:
+                return
+            self._entries[key] = (results, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def bump_generation(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+        return self.generation
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "generation": self.generation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,395 @@
+from concurrent.futures import Future
+from contextlib import contextmanager
+import atexit
+import fcntl
+import heapq
+import itertools
+import json
+import multiprocessing
+import os
+import shutil
+import threading
+
+import faiss
+import numpy as np
+
+
+class LocalVectorIndex:
+    """
+    IndexFlatL2 plus its row -> alumni id list, private to this process
+
+    This is what `python app.py` serves from. search() returns
+    (distance, alumni_id) pairs taken from one snapshot, so a concurrent
+    replace() or add() can never pair rows of one index with ids of another
+    or change an index while it is being searched.
+    """
+
+    def __init__(self, dimension):
+        self.dimension = dimension
+        self.generation = None
+        self._state = (faiss.IndexFlatL2(dimension), [])
+        self._lock = threading.Lock()
+
+    @property
+    def ids(self):
+        return self._state[1]
+
+    @property
+    def ntotal(self):
+        return self._state[0].ntotal
+
+    @property
+    def nbytes(self):
+        return self.ntotal * self.dimension * 4
+
+    def refresh(self):
+        return False
+
+    def replace(self, ids, vectors):
+        """Build a fresh index and swap it in, so searches never see a half-built one"""
+        index = faiss.IndexFlatL2(self.dimension)
+        if len(ids):
+            index.add(vectors)
+        with self._lock:
+            self._state = (index, list(ids))
+            self.generation = (self.generation or 0) + 1
+
+    def add(self, alumni_id, vector):
+        """Copy the index with one more row and swap it in, like replace()"""
+        with self._lock:
+            current, ids = self._state
+            # Never added to in place: a search may be reading it right now
+            index = faiss.IndexFlatL2(self.dimension)
+            if current.ntotal:
+                index.add(current.reconstruct_n(0, current.ntotal))
+            index.add(vector.reshape(1, -1))
+            self._state = (index, ids + [alumni_id])
+
+    def search(self, queries, k):
+        index, ids = self._state
+        k = min(k, len(ids))
+        if k <= 0:
+            return [[] for _ in range(len(queries))]
+        distances, indices = index.search(queries, k)
+        return _hits(distances, indices, ids)
+
+
+class SharedVectorIndex:
+    """
+    A flat L2 index in memory-mapped files shared by every worker process
+
+    The vectors of each generation live in one raw float32 file that all
+    workers np.memmap, so they search the same physical pages (put the
+    directory on tmpfs, e.g. /dev/shm, to keep it in shared memory rather
+    than the page cache of a disk file). Layout:
+
+        CURRENT                {"generation": 3, "count": N, "ids_bytes": B}
+        gen-000003/vectors.f32 N x dimension float32, append-only
+        gen-000003/ids.txt     one alumni id per line, append-only
+        lock                   flock held by whoever writes
+
+    replace() publishes a new generation; add() appends one row to the
+    current one. Both finish by atomically replacing CURRENT, and refresh()
+    (cheap: one stat) picks the change up in every other worker, so
+    rebuilds and new profiles reach all workers without a restart. Old
+    generations are unlinked once superseded; a worker still mapping one
+    keeps its pages until it refreshes.
+    """
+
+    def __init__(self, directory, dimension, keep_generations=2):
+        self.directory = directory
+        self.dimension = dimension
+        self.keep_generations = keep_generations
+        os.makedirs(directory, exist_ok=True)
+        self._current_path = os.path.join(directory, 'CURRENT')
+        self._stamp = None
+        # (generation, count, ids_bytes, vectors, ids), swapped as a whole
+        self._state = (None, 0, 0, np.empty((0, dimension), dtype='float32'), [])
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self):
+        return self._state[0]
+
+    @property
+    def ids(self):
+        return self._state[4]
+
+    @property
+    def ntotal(self):
+        return self._state[1]
+
+    @property
+    def nbytes(self):
+        return self.ntotal * self.dimension * 4
+
+    def _generation_dir(self, generation):
+        return os.path.join(self.directory, f'gen-{generation:06d}')
+
+    @contextmanager
+    def _write_lock(self):
+        # flock serializes writers across processes; the thread lock within one
+        with self._lock, open(os.path.join(self.directory, 'lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_current(self):
+        try:
+            with open(self._current_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write_current(self, current):
+        tmp_path = f'{self._current_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(current, f)
+        os.replace(tmp_path, self._current_path)
+
+    def replace(self, ids, vectors):
+        """Publish ids/vectors as a new generation and switch every worker to it"""
+        vectors = np.ascontiguousarray(vectors, dtype='float32').reshape(-1, self.dimension)
+        ids_data = ''.join(f'{alumni_id}\n' for alumni_id in ids).encode()
+        with self._write_lock():
+            current = self._read_current()
+            generation = (current['generation'] if current else 0) + 1
+            directory = self._generation_dir(generation)
+            os.makedirs(directory, exist_ok=True)
+            vectors.tofile(os.path.join(directory, 'vectors.f32'))
+            with open(os.path.join(directory, 'ids.txt'), 'wb') as f:
+                f.write(ids_data)
+            self._write_current({'generation': generation, 'count': len(vectors), 'ids_bytes': len(ids_data)})
+            self._remove_old_generations(generation)
+        self.refresh()
+
+    def add(self, alumni_id, vector):
+        """Append one vector to the current generation"""
+        row = np.ascontiguousarray(vector, dtype='float32').reshape(self.dimension).tobytes()
+        id_line = f'{alumni_id}\n'.encode()
+        with self._write_lock():
+            current = self._read_current()
+            if current is None:
+                current = {'generation': 1, 'count': 0, 'ids_bytes': 0}
+                os.makedirs(self._generation_dir(1), exist_ok=True)
+            directory = self._generation_dir(current['generation'])
+            # Write at the offsets CURRENT vouches for, so a writer that died
+            # mid-append leaves nothing behind that readers would see
+            for name, offset, data in (('vectors.f32', current['count'] * len(row), row),
+                                       ('ids.txt', current['ids_bytes'], id_line)):
+                fd = os.open(os.path.join(directory, name), os.O_WRONLY | os.O_CREAT, 0o644)
+                try:
+                    os.pwrite(fd, data, offset)
+                finally:
+                    os.close(fd)
+            current['count'] += 1
+            current['ids_bytes'] += len(id_line)
+            self._write_current(current)
+        self.refresh()
+
+    def _remove_old_generations(self, generation):
+        for name in os.listdir(self.directory):
+            if name.startswith('gen-') and int(name[4:]) <= generation - self.keep_generations:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def refresh(self):
+        """Map the latest published generation; returns True if it changed"""
+        try:
+            stat = os.stat(self._current_path)
+        except FileNotFoundError:
+            return False
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return False
+
+        with self._lock:
+            if stamp == self._stamp:
+                return False
+            current = self._read_current()
+            if current is None:
+                return False
+            generation, count, ids_bytes = current['generation'], current['count'], current['ids_bytes']
+            old_generation, old_count, old_ids_bytes, _, old_ids = self._state
+            directory = self._generation_dir(generation)
+
+            with open(os.path.join(directory, 'ids.txt'), 'rb') as f:
+                if generation == old_generation and count >= old_count:
+                    # Appends only: read just the new ids
+                    f.seek(old_ids_bytes)
+                    ids = old_ids + f.read(ids_bytes - old_ids_bytes).decode().splitlines()
+                else:
+                    ids = f.read(ids_bytes).decode().splitlines()
+            if count:
+                vectors = np.memmap(os.path.join(directory, 'vectors.f32'), dtype='float32',
+                                    mode='r', shape=(count, self.dimension))
+            else:
+                vectors = np.empty((0, self.dimension), dtype='float32')
+
+            self._state = (generation, count, ids_bytes, vectors, ids)
+            self._stamp = stamp
+            return True
+
+    def search(self, queries, k):
+        _, count, _, vectors, ids = self._state
+        k = min(k, count)
+        if k <= 0:
+            return [[] for _ in range(len(queries))]
+        # Brute-force L2 straight over the mapped pages, as IndexFlatL2 would
+        distances, indices = faiss.knn(queries, vectors, k)
+        return _hits(distances, indices, ids)
+
+
+class ShardedVectorIndex(SharedVectorIndex):
+    """
+    A SharedVectorIndex searched by N shard processes in parallel
+
+    Shard i searches rows [i * n // N, (i + 1) * n // N) of the mapped
+    generation, so the shards stay balanced as rows are appended and after
+    every rebuild without moving any data: each request names the
+    generation file and row range, and shards just map the same pages.
+    The coordinator (the web worker) sends a query to every shard at once
+    and merges their sorted top-k lists with a heap.
+
+    Shards are started on first use with spawn (the worker has threads by
+    then, and a forked child could inherit a lock one of them held), and
+    run FAISS with one OpenMP thread each; the shards are the parallelism. Indexes smaller
+    than min_rows_per_shard per shard use fewer shards, down to searching
+    in-process, since fan-out costs more than it saves on small scans.
+    """
+
+    def __init__(self, directory, dimension, shards, min_rows_per_shard=10000, timeout=30.0, **kwargs):
+        super().__init__(directory, dimension, **kwargs)
+        self.shards = shards
+        self.min_rows_per_shard = min_rows_per_shard
+        self.timeout = timeout
+        self._clients = []
+        self._start_lock = threading.Lock()
+
+    def _shard_clients(self):
+        with self._start_lock:
+            if not self._clients:
+                self._clients = [_ShardClient(self.dimension, shard) for shard in range(self.shards)]
+                atexit.register(self.close)
+            for shard, client in enumerate(self._clients):
+                if not client.alive:
+                    print(f"Restarting search shard {shard}")
+                    self._clients[shard] = _ShardClient(self.dimension, shard)
+            return self._clients
+
+    def close(self):
+        for client in self._clients:
+            client.close()
+        self._clients = []
+
+    def search(self, queries, k):
+        generation, count, _, _, ids = self._state
+        k = min(k, count)
+        active = min(self.shards, -(-count // self.min_rows_per_shard))
+        if k <= 0 or active <= 1:
+            return super().search(queries, k)
+
+        path = os.path.join(self._generation_dir(generation), 'vectors.f32')
+        queries = np.ascontiguousarray(queries, dtype='float32')
+        clients = self._shard_clients()[:active]
+        # Scatter: every shard starts on the query before we wait on any
+        futures = [
+            client.submit('search', (path, count, shard * count // active, (shard + 1) * count // active, queries, k))
+            for shard, client in enumerate(clients)
+        ]
+        per_shard = [future.result(self.timeout) for future in futures]
+
+        # Gather: each shard's rows are sorted by distance, so a heap merge
+        # of the shard lists yields the global top-k
+        results = []
+        for query in range(len(queries)):
+            shard_hits = [_hits(distances[query:query + 1], indices[query:query + 1], ids)[0]
+                          for distances, indices in per_shard]
+            results.append(list(itertools.islice(heapq.merge(*shard_hits), k)))
+        return results
+
+
+class _ShardClient:
+    """One shard process and the pipe to it; requests may overlap from many threads"""
+
+    def __init__(self, dimension, shard):
+        context = multiprocessing.get_context('spawn')
+        self._conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_serve_shard, args=(child_conn, dimension),
+                                       name=f'search-shard-{shard}', daemon=True)
+        self.process.start()
+        child_conn.close()
+        self._request_ids = itertools.count()
+        self._pending = {}
+        self._send_lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read_responses, name=f'search-shard-{shard}-reader', daemon=True)
+        self._reader.start()
+
+    @property
+    def alive(self):
+        return self._reader.is_alive()
+
+    def submit(self, op, payload):
+        future = Future()
+        with self._send_lock:
+            request_id = next(self._request_ids)
+            self._pending[request_id] = future
+            try:
+                self._conn.send((request_id, op, payload))
+            except (OSError, ValueError) as e:
+                self._pending.pop(request_id, None)
+                future.set_exception(RuntimeError(f"{self.process.name} is gone: {e}"))
+        return future
+
+    def _read_responses(self):
+        try:
+            while True:
+                request_id, result, error = self._conn.recv()
+                future = self._pending.pop(request_id, None)
+                if future is None:
+                    continue
+                if error is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(RuntimeError(f"{self.process.name}: {error}"))
+        except (EOFError, OSError):
+            pass
+        # The shard died (or was closed): fail whatever was still waiting on it
+        for request_id in list(self._pending):
+            self._pending.pop(request_id).set_exception(RuntimeError(f"{self.process.name} exited"))
+
+    def close(self):
+        self._conn.close()
+        self.process.terminate()
+
+
+def _serve_shard(conn, dimension):
+    """Shard process main loop: search a row range of a mapped generation file"""
+    faiss.omp_set_num_threads(1)
+    mapped_path, vectors = None, None
+    while True:
+        try:
+            request_id, op, payload = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        try:
+            if op != 'search':
+                raise ValueError(f"Unknown shard operation {op!r}")
+            path, count, start, stop, queries, k = payload
+            if path != mapped_path or len(vectors) < count:
+                # New generation, or rows appended since we mapped it
+                vectors = np.memmap(path, dtype='float32', mode='r', shape=(count, dimension))
+                mapped_path = path
+            distances, indices = faiss.knn(queries, vectors[start:stop], min(k, stop - start))
+            indices[indices >= 0] += start
+            conn.send((request_id, (distances, indices), None))
+        except Exception as e:
+            conn.send((request_id, None, str(e)))
+
+
+def _hits(distances, indices, ids):
+    return [
+        [(float(distance), ids[idx]) for distance, idx in zip(row_distances, row_indices) if 0 <= idx < len(ids)]
+        for row_distances, row_indices in zip(distances, indices)
+    ]
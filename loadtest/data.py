@@ -0,0 +1,83 @@
+"""
+Synthetic alumni profiles and search queries for load tests
+
+Values are drawn from fixed vocabularies with a seeded RNG, so a given seed
+always produces the same profiles and the same query mix.
+"""
+import random
+
+FIRST_NAMES = [
+    'Aarav', 'Aisha', 'Alex', 'Amara', 'Ben', 'Carlos', 'Chen', 'Daniel', 'Diya', 'Elena',
+    'Emma', 'Ethan', 'Fatima', 'Grace', 'Hana', 'Isaac', 'Jamal', 'Jia', 'Kavya', 'Leo',
+    'Lucia', 'Maya', 'Mateo', 'Mei', 'Noah', 'Olivia', 'Omar', 'Priya', 'Rahul', 'Sara',
+    'Sofia', 'Tariq', 'Wei', 'Yuki', 'Zara'
+]
+LAST_NAMES = [
+    'Anderson', 'Brown', 'Chen', 'Davis', 'Fernandez', 'Garcia', 'Gupta', 'Hernandez', 'Ito',
+    'Johnson', 'Khan', 'Kim', 'Lee', 'Lopez', 'Martin', 'Mehta', 'Miller', 'Nguyen', 'Okafor',
+    'Patel', 'Rao', 'Rossi', 'Singh', 'Smith', 'Tanaka', 'Taylor', 'Wang', 'Williams', 'Wong'
+]
+ROLES = [
+    'Software Engineer', 'Senior Software Engineer', 'Staff Engineer', 'Engineering Manager',
+    'Product Manager', 'Data Scientist', 'Machine Learning Engineer', 'Research Scientist',
+    'Investment Banking Analyst', 'Venture Capital Associate', 'Consultant', 'Founder',
+    'Product Designer', 'Quantitative Researcher', 'Security Engineer', 'Site Reliability Engineer',
+    'Medical Resident', 'Attorney', 'Teacher', 'Policy Analyst'
+]
+COMPANIES = [
+    'Google', 'Microsoft', 'Apple', 'Amazon', 'Meta', 'Netflix', 'Stripe', 'OpenAI', 'Anthropic',
+    'Goldman Sachs', 'McKinsey', 'Sequoia Capital', 'Andreessen Horowitz', 'Jane Street', 'Databricks',
+    'Airbnb', 'Uber', 'Salesforce', 'NVIDIA', 'Tesla', 'SpaceX', 'Palantir', 'Figma', 'Notion',
+    'Mayo Clinic', 'Deloitte', 'Bain & Company', 'Citadel', 'Two Sigma', 'Coinbase'
+]
+UNIVERSITIES = [
+    'Stanford University', 'MIT', 'UC Berkeley', 'Harvard University', 'Carnegie Mellon University',
+    'Princeton University', 'Yale University', 'Columbia University', 'University of Michigan',
+    'Georgia Tech', 'UCLA', 'University of Texas at Austin', 'Cornell University', 'Caltech',
+    'University of Washington', 'University of Pennsylvania', 'Duke University', 'NYU',
+    'University of Illinois Urbana-Champaign', 'Purdue University'
+]
+HIGH_SCHOOLS = [
+    'Lincoln High School', 'Washington High School', 'Cathedral Catholic High School',
+    'Thomas Jefferson High School for Science and Technology', 'Stuyvesant High School',
+    'Lynbrook High School', 'Monta Vista High School', 'Phillips Exeter Academy',
+    'Bronx High School of Science', 'Westlake High School', 'Oakridge High School',
+    'Central High School', 'Mission San Jose High School', 'Harvard-Westlake School'
+]
+QUERY_TEMPLATES = [
+    '{role} at {company}',
+    '{role} who went to {university}',
+    'someone from {high_school} working in tech',
+    '{university} grads working at {company}',
+    'alumni who became a {role}',
+    'who transitioned from engineering to {role}',
+    '{company} {role} from {university}',
+]
+
+
+def make_profile(rng, index):
+    """One profile in the shape POST /api/v1/profiles/ and /import accept."""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return {
+        'fullName': f'{first} {last}',
+        'currentRole': rng.choice(ROLES),
+        'company': rng.choice(COMPANIES),
+        'university': rng.choice(UNIVERSITIES),
+        'highSchool': rng.choice(HIGH_SCHOOLS),
+        # index keeps URLs unique across a run; the idempotency key for imports
+        'linkedInURL': f'https://www.linkedin.com/in/{first.lower()}-{last.lower()}-{index}'
+    }
+
+
+def make_query(rng):
+    """A natural-language search query like the ones users type."""
+    return rng.choice(QUERY_TEMPLATES).format(
+        role=rng.choice(ROLES).lower(),
+        company=rng.choice(COMPANIES),
+        university=rng.choice(UNIVERSITIES),
+        high_school=rng.choice(HIGH_SCHOOLS)
+    )
+
+
+def new_rng(seed):
+    return random.Random(seed)
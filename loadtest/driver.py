@@ -0,0 +1,240 @@
+"""
+Concurrent HTTP load driver for the backend API and flask-server.
+
+Replays a weighted mix of realistic requests from a pool of worker threads
+and reports throughput and p50/p95/p99 latency per scenario, plus the
+server-side stage breakdown from Server-Timing headers.
+
+By default workers are closed-loop (next request as soon as the last one
+returns). With --rate the driver issues requests on a fixed schedule and
+measures latency from the scheduled start, so a stalled server shows up as
+queueing delay instead of silently lowering the offered load.
+
+Usage (from the repository root):
+    python -m loadtest.driver --backend http://localhost:8000 --faiss http://localhost:8001 \
+        --mix search=60,profile_get=25,profile_create=5,faiss_search=10 \
+        --concurrency 16 --duration 60 --warmup 5 [--rate 200] [--json results.json]
+"""
+import argparse
+import json
+import math
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from loadtest.data import make_profile, make_query, new_rng
+
+DEFAULT_MIX = 'search=60,profile_get=25,profile_create=5,faiss_search=10'
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name.strip()] = float(weight or 1)
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values), max(1, math.ceil(fraction * len(sorted_values)))) - 1
+    return sorted_values[rank]
+
+
+def parse_server_timing(header):
+    stages = {}
+    for entry in header.split(','):
+        name, _, params = entry.strip().partition(';')
+        if params.startswith('dur='):
+            try:
+                stages[name] = float(params[4:])
+            except ValueError:
+                continue
+    return stages
+
+
+class Context:
+    """State shared by all workers: target URLs and profile ids seen so far."""
+
+    def __init__(self, backend, faiss, seed):
+        self.backend = backend
+        self.faiss = faiss
+        self.seed = seed
+        self.profile_ids = []
+        self.created = 0
+        self.lock = threading.Lock()
+
+    def remember(self, profile_ids):
+        with self.lock:
+            self.profile_ids.extend(profile_ids)
+            # Keep the pool bounded; recent ids are as good as any
+            del self.profile_ids[:-10000]
+
+    def next_profile_index(self):
+        with self.lock:
+            self.created += 1
+            return self.created
+
+
+def run_search(session, ctx, rng):
+    response = session.post(
+        f'{ctx.backend}/api/v1/search/text',
+        json={'query': make_query(rng), 'limit': 10}
+    )
+    if response.ok:
+        ctx.remember([r['profile']['_id'] for r in response.json().get('results', [])])
+    return response
+
+
+def run_profile_get(session, ctx, rng):
+    with ctx.lock:
+        profile_id = rng.choice(ctx.profile_ids) if ctx.profile_ids else None
+    if profile_id is None:
+        # Nothing to read yet; a search populates the id pool
+        return run_search(session, ctx, rng)
+    return session.get(f'{ctx.backend}/api/v1/profiles/{profile_id}')
+
+
+def run_profile_create(session, ctx, rng):
+    # Offset well past seeded indices so linkedInURLs stay unique
+    index = 10_000_000 + ctx.seed * 1_000_000 + ctx.next_profile_index()
+    response = session.post(f'{ctx.backend}/api/v1/profiles/', json=make_profile(rng, index))
+    if response.ok:
+        ctx.remember([response.json()['profile']['_id']])
+    return response
+
+
+def run_faiss_search(session, ctx, rng):
+    return session.post(f'{ctx.faiss}/search', json={'query': make_query(rng), 'k': 10})
+
+
+SCENARIOS = {
+    'search': run_search,
+    'profile_get': run_profile_get,
+    'profile_create': run_profile_create,
+    'faiss_search': run_faiss_search,
+}
+
+
+def worker(worker_id, ctx, mix, deadline, measure_after, interval, results):
+    rng = new_rng(ctx.seed * 1000 + worker_id)
+    names, weights = list(mix), list(mix.values())
+    session = requests.Session()
+    records = []
+
+    next_start = time.monotonic()
+    while True:
+        if interval:
+            # Open loop: fixed schedule, latency measured from the intended start
+            now = time.monotonic()
+            if next_start > now:
+                time.sleep(next_start - now)
+            scheduled = next_start
+            next_start += interval
+        else:
+            scheduled = time.monotonic()
+        if scheduled >= deadline:
+            break
+
+        name = rng.choices(names, weights)[0]
+        status, timing = 0, {}
+        try:
+            response = SCENARIOS[name](session, ctx, rng)
+            status = response.status_code
+            timing = parse_server_timing(response.headers.get('Server-Timing', ''))
+        except requests.RequestException:
+            pass
+        finished = time.monotonic()
+
+        if scheduled >= measure_after:
+            records.append((name, finished - scheduled, status, timing))
+
+    results.extend(records)
+
+
+def summarize(records, elapsed):
+    by_scenario = defaultdict(list)
+    for record in records:
+        by_scenario[record[0]].append(record)
+    by_scenario['all'] = records
+
+    summary = {}
+    for name, rows in by_scenario.items():
+        latencies = sorted(row[1] * 1000 for row in rows)
+        errors = sum(1 for row in rows if not 200 <= row[2] < 400)
+        stages = defaultdict(list)
+        for row in rows:
+            for stage, duration in row[3].items():
+                stages[stage].append(duration)
+        summary[name] = {
+            'requests': len(rows),
+            'errors': errors,
+            'throughput_rps': len(rows) / elapsed if elapsed else 0.0,
+            'p50_ms': percentile(latencies, 0.50),
+            'p95_ms': percentile(latencies, 0.95),
+            'p99_ms': percentile(latencies, 0.99),
+            'max_ms': latencies[-1] if latencies else 0.0,
+            'server_timing_p50_ms': {
+                stage: percentile(sorted(values), 0.50) for stage, values in sorted(stages.items())
+            },
+        }
+    return summary
+
+
+def print_summary(summary):
+    header = f"{'scenario':<16}{'reqs':>8}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    print(header)
+    print('-' * len(header))
+    for name, row in sorted(summary.items(), key=lambda item: item[0] == 'all'):
+        print(f"{name:<16}{row['requests']:>8}{row['errors']:>8}{row['throughput_rps']:>10.1f}"
+              f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['max_ms']:>10.1f}")
+    for name, row in summary.items():
+        if name != 'all' and row['server_timing_p50_ms']:
+            stages = ', '.join(f"{stage} {ms:.1f}" for stage, ms in row['server_timing_p50_ms'].items())
+            print(f"  {name} server p50 ms: {stages}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a realistic request mix and report latency percentiles")
+    parser.add_argument('--backend', default='http://localhost:8000', help="backend base URL")
+    parser.add_argument('--faiss', default='http://localhost:8001', help="flask-server base URL")
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument('--concurrency', type=int, default=8, help="worker threads")
+    parser.add_argument('--duration', type=float, default=30, help="measured seconds")
+    parser.add_argument('--warmup', type=float, default=5, help="unmeasured seconds before measuring")
+    parser.add_argument('--rate', type=float, default=0, help="total requests/second (open loop); 0 = closed loop")
+    parser.add_argument('--seed', type=int, default=1, help="RNG seed for the request mix")
+    parser.add_argument('--json', dest='json_path', help="also write the summary as JSON")
+    args = parser.parse_args(argv)
+
+    ctx = Context(args.backend.rstrip('/'), args.faiss.rstrip('/'), args.seed)
+    start = time.monotonic()
+    measure_after = start + args.warmup
+    deadline = measure_after + args.duration
+    interval = args.concurrency / args.rate if args.rate else 0
+
+    results = []
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for worker_id in range(args.concurrency):
+            pool.submit(worker, worker_id, ctx, args.mix, deadline, measure_after, interval, results)
+
+    summary = summarize(results, args.duration)
+    print_summary(summary)
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({'args': {k: v for k, v in vars(args).items() if k != 'json_path'}, 'summary': summary}, f, indent=2)
+
+    return 1 if summary.get('all', {}).get('requests', 0) == 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
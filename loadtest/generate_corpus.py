@@ -0,0 +1,363 @@
+"""
+Generate a synthetic alumniProfiles corpus at million-profile scale.
+
+Profiles follow the AlumniProfile schema (ObjectId _id, the six profile
+fields, alumniEmb int8 / alumniEmbBin packed-bit BSON vectors, dateUpdated)
+with Zipf-skewed companies, universities, high schools and roles: a few big
+employers and schools cover most alumni, with a long tail behind them, the
+way real alumni networks look. LinkedIn URLs are valid and unique.
+
+The corpus is built in fixed-size chunks across worker processes. Each
+chunk is seeded from (--seed, its first profile number), so the same
+arguments produce the same profiles whatever the worker count.
+
+Embeddings:
+    fake    the vectors EMBEDDING_PROVIDER=fake produces for each profile's
+            text (up to float rounding), computed in bulk from per-field
+            token sums; ~1M profiles/minute per core
+    cohere  real Cohere embeddings (COHERE_KEY), 96 profiles per call
+    none    no embedding fields
+
+Outputs:
+    mongo    insert into alumniProfiles (MONGO_URI / MONGO_TLS as in db.db_utils);
+             --faiss-mapping also writes matching 384-d fake faissMapping vectors
+    ndjson   one part file per chunk under --path; the export line format,
+             or import-ready lines (profile fields only) with --embeddings none
+    parquet  one part file per chunk under --path, in the export schema
+
+Usage (from the repository root):
+    python -m loadtest.generate_corpus --count 1000000 --output mongo --drop [--faiss-mapping]
+    python -m loadtest.generate_corpus --count 1000000 --output parquet --path corpus/
+    python -m loadtest.generate_corpus --count 100000 --output ndjson --path corpus/ --embeddings none
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from multiprocessing import get_context
+
+import numpy as np
+from bson import ObjectId
+from bson.binary import Binary, BinaryVectorDtype
+
+from loadtest.data import COMPANIES, FIRST_NAMES, HIGH_SCHOOLS, LAST_NAMES, ROLES, UNIVERSITIES
+
+OUTPUTS = ('mongo', 'ndjson', 'parquet')
+EMBEDDINGS = ('fake', 'cohere', 'none')
+FAISS_DIMENSION = 384
+COHERE_BATCH = 96
+# Spread of dateUpdated back from --as-of
+HISTORY = timedelta(days=3 * 365)
+
+PLACES = [
+    'Austin', 'Boston', 'Boulder', 'Charlotte', 'Chicago', 'Cleveland', 'Columbus', 'Dallas',
+    'Denver', 'Des Moines', 'Detroit', 'Durham', 'Fresno', 'Hartford', 'Houston', 'Irvine',
+    'Jacksonville', 'Kansas City', 'Knoxville', 'Las Vegas', 'Lexington', 'Madison', 'Memphis',
+    'Miami', 'Milwaukee', 'Minneapolis', 'Nashville', 'Newark', 'Oakland', 'Omaha', 'Orlando',
+    'Palo Alto', 'Phoenix', 'Pittsburgh', 'Portland', 'Providence', 'Raleigh', 'Reno',
+    'Richmond', 'Rochester', 'Sacramento', 'Salt Lake City', 'San Antonio', 'San Diego',
+    'San Jose', 'Santa Clara', 'Seattle', 'Spokane', 'St Louis', 'Tampa', 'Tucson', 'Tulsa'
+]
+STARTUP_STEMS = [
+    'Aurora', 'Beacon', 'Bright', 'Cedar', 'Cobalt', 'Crest', 'Delta', 'Ember', 'Falcon', 'Granite',
+    'Harbor', 'Helix', 'Horizon', 'Juniper', 'Keystone', 'Lumen', 'Maple', 'Meridian', 'Nimbus',
+    'Northstar', 'Onyx', 'Orbit', 'Pioneer', 'Quartz', 'Redwood', 'Sierra', 'Summit', 'Tidal',
+    'Vector', 'Willow'
+]
+STARTUP_SUFFIXES = ['Labs', 'AI', 'Systems', 'Health', 'Robotics', 'Bio', 'Analytics', 'Capital', 'Networks', 'Software']
+
+# Zipf exponent per field: higher means more concentrated on the head
+SKEW = {'first': 0.5, 'last': 0.5, 'role': 0.8, 'company': 1.1, 'university': 1.0, 'highSchool': 0.9}
+
+
+def vocabularies():
+    """Head values from loadtest.data, in popularity order, then a generated long tail."""
+    return {
+        'first': FIRST_NAMES,
+        'last': LAST_NAMES,
+        'role': ROLES,
+        'company': COMPANIES + [f'{stem} {suffix}' for stem in STARTUP_STEMS for suffix in STARTUP_SUFFIXES],
+        'university': UNIVERSITIES + [f'University of {place}' for place in PLACES]
+                      + [f'{place} State University' for place in PLACES],
+        'highSchool': HIGH_SCHOOLS + [f'{place} High School' for place in PLACES]
+                      + [f'{place} Preparatory School' for place in PLACES],
+    }
+
+
+def zipf_weights(n, exponent):
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+class FieldVectors:
+    """
+    Token-sum vectors for every vocabulary value, so a profile's fake
+    embedding is a few row lookups instead of tokenizing its text
+    """
+
+    # Words the profile text template adds around the fields
+    TEMPLATE = 'works as at graduated from and attended'
+
+    def __init__(self, vocab, dimension):
+        from db.fake_embeddings import token_sum
+        self.template = token_sum(self.TEMPLATE, dimension)
+        self.fields = {field: np.vstack([token_sum(value, dimension) for value in values])
+                       for field, values in vocab.items()}
+
+    def embed(self, indices):
+        vectors = np.broadcast_to(self.template, (len(indices['first']), self.template.shape[0])).copy()
+        for field, matrix in self.fields.items():
+            vectors += matrix[indices[field]]
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+
+def quantize(vectors):
+    """int8 and packed-bit codes the way FakeEmbeddingClient derives them"""
+    scale = 127 / np.maximum(np.abs(vectors).max(axis=1, keepdims=True), 1e-12)
+    return np.round(vectors * scale).astype(np.int8), np.packbits(vectors > 0, axis=1)
+
+
+def profile_text(profile):
+    # Same text as VectorService.profile_text
+    return (
+        f"{profile['fullName']} works as {profile['currentRole']} at {profile['company']}. "
+        f"Graduated from {profile['university']} and attended {profile['highSchool']}."
+    )
+
+
+def base36(number):
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    text = ''
+    while True:
+        number, remainder = divmod(number, 36)
+        text = digits[remainder] + text
+        if not number:
+            return text
+
+
+# Per-process state, created once by the pool initializer
+_worker = {}
+
+
+def _init_worker(options):
+    vocab = vocabularies()
+    _worker.update(options=options, vocab=vocab,
+                   weights={field: zipf_weights(len(values), SKEW[field]) for field, values in vocab.items()})
+    if options['embeddings'] == 'fake':
+        _worker['vectors'] = FieldVectors(vocab, options['dimensions'])
+    elif options['embeddings'] == 'cohere':
+        import cohere
+        _worker['cohere'] = cohere.Client(os.environ['COHERE_KEY'])
+    if options['faiss_mapping']:
+        _worker['faiss_vectors'] = FieldVectors(vocab, FAISS_DIMENSION)
+    if options['output'] == 'mongo':
+        from db.db_utils import get_db_connection
+        _worker['client'] = get_db_connection()
+
+
+def generate_chunk(start, size):
+    """Profiles start..start+size-1 as AlumniProfile-shaped documents, plus their field indices."""
+    options, vocab, weights = _worker['options'], _worker['vocab'], _worker['weights']
+    rng = np.random.default_rng([options['seed'], start])
+    indices = {field: rng.choice(len(values), size, p=weights[field]) for field, values in vocab.items()}
+    age_ms = rng.integers(0, int(HISTORY.total_seconds() * 1000), size)
+    as_of = datetime.fromtimestamp(options['as_of'], timezone.utc).replace(tzinfo=None)
+
+    docs = []
+    for i in range(size):
+        number = start + i
+        first, last = vocab['first'][indices['first'][i]], vocab['last'][indices['last'][i]]
+        updated = as_of - timedelta(milliseconds=int(age_ms[i]))
+        docs.append({
+            # Creation-time prefix like a real ObjectId, profile number for uniqueness
+            '_id': ObjectId(int(updated.replace(tzinfo=timezone.utc).timestamp()).to_bytes(4, 'big')
+                            + number.to_bytes(8, 'big')),
+            'fullName': f'{first} {last}',
+            'currentRole': vocab['role'][indices['role'][i]],
+            'company': vocab['company'][indices['company'][i]],
+            'university': vocab['university'][indices['university'][i]],
+            'highSchool': vocab['highSchool'][indices['highSchool'][i]],
+            'linkedInURL': f'https://www.linkedin.com/in/{first.lower()}-{last.lower()}-{base36(number)}',
+            'dateUpdated': updated,
+        })
+    return docs, indices
+
+
+def embed_chunk(docs, indices):
+    """(int8, packed-bit) code arrays for a chunk, or None without embeddings"""
+    embeddings = _worker['options']['embeddings']
+    if embeddings == 'fake':
+        return quantize(_worker['vectors'].embed(indices))
+    if embeddings == 'cohere':
+        int8, ubinary = [], []
+        for offset in range(0, len(docs), COHERE_BATCH):
+            response = _worker['cohere'].embed(
+                texts=[profile_text(doc) for doc in docs[offset:offset + COHERE_BATCH]],
+                model='embed-english-v3.0',
+                input_type='search_document',
+                embedding_types=['int8', 'ubinary']
+            ).embeddings
+            int8.extend(response.int8)
+            ubinary.extend(response.ubinary)
+        return np.array(int8, dtype=np.int8), np.array(ubinary, dtype=np.uint8)
+    return None
+
+
+def write_mongo(docs, codes, indices):
+    options = _worker['options']
+    db = _worker['client'][options['db']]
+    if codes is not None:
+        for doc, int8, packed in zip(docs, *codes):
+            doc['alumniEmb'] = Binary.from_vector(int8, BinaryVectorDtype.INT8)
+            # Packed bytes as a plain list: NumPy input to from_vector means unpacked bits
+            doc['alumniEmbBin'] = Binary.from_vector(packed.tolist(), BinaryVectorDtype.PACKED_BIT)
+    db.alumniProfiles.insert_many(docs, ordered=False)
+
+    if options['faiss_mapping']:
+        from db.vector_codec import encode_vector
+        vectors = _worker['faiss_vectors'].embed(indices)
+        db.faissMapping.insert_many(
+            [{'alumniId': str(doc['_id']), **encode_vector(vector, 'float16', 'fake')}
+             for doc, vector in zip(docs, vectors)],
+            ordered=False
+        )
+
+
+def write_ndjson(path, docs, codes):
+    with open(path, 'w') as f:
+        for i, doc in enumerate(docs):
+            if codes is None:
+                # Import-ready: exactly the fields POST /api/v1/profiles/import accepts
+                line = {field: doc[field] for field in
+                        ('fullName', 'currentRole', 'company', 'university', 'highSchool', 'linkedInURL')}
+            else:
+                line = {**doc, '_id': str(doc['_id']), 'dateUpdated': doc['dateUpdated'].isoformat(),
+                        'alumniEmb': codes[0][i].tolist(), 'alumniEmbBin': codes[1][i].tolist()}
+            f.write(json.dumps(line))
+            f.write('\n')
+
+
+def write_parquet(path, docs, codes):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    columns = {'_id': pa.array([str(doc['_id']) for doc in docs], pa.string())}
+    for field in ('fullName', 'currentRole', 'company', 'university', 'highSchool', 'linkedInURL'):
+        columns[field] = pa.array([doc[field] for doc in docs], pa.string())
+    columns['dateUpdated'] = pa.array(
+        [doc['dateUpdated'].replace(tzinfo=timezone.utc) for doc in docs], pa.timestamp('ms', tz='UTC')
+    )
+    if codes is not None:
+        for field, values in zip(('alumniEmb', 'alumniEmbBin'), codes):
+            columns[field] = pa.FixedSizeListArray.from_arrays(pa.array(values.reshape(-1)), values.shape[1])
+    pq.write_table(pa.table(columns), path, compression='zstd')
+
+
+def build_chunk(task):
+    start, size = task
+    options = _worker['options']
+    docs, indices = generate_chunk(start, size)
+    codes = embed_chunk(docs, indices)
+
+    if options['output'] == 'mongo':
+        write_mongo(docs, codes, indices)
+    else:
+        path = os.path.join(options['path'], f"part-{start:09d}.{options['output']}")
+        if options['output'] == 'ndjson':
+            write_ndjson(path, docs, codes)
+        else:
+            write_parquet(path, docs, codes)
+    return size
+
+
+def chunk_tasks(count, chunk_size, first_number):
+    for offset in range(0, count, chunk_size):
+        yield first_number + offset, min(chunk_size, count - offset)
+
+
+def prepare_mongo(options, drop):
+    from db.db_utils import get_db_connection
+    client = get_db_connection()
+    try:
+        db = client[options['db']]
+        if drop:
+            db.alumniProfiles.drop()
+            if options['faiss_mapping']:
+                db.faissMapping.drop()
+    finally:
+        client.close()
+
+
+def finish_mongo(options):
+    """Build indexes once after the bulk load, which is much faster than maintaining them during it"""
+    from db.db_utils import get_db_connection
+    client = get_db_connection()
+    try:
+        db = client[options['db']]
+        db.alumniProfiles.create_index('linkedInURL', unique=True, name='profile_linkedin_url')
+        if options['faiss_mapping']:
+            db.faissMapping.create_index('alumniId')
+        print(f"{db.alumniProfiles.estimated_document_count():,} profiles in {options['db']}.alumniProfiles")
+    finally:
+        client.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic alumniProfiles corpus")
+    parser.add_argument('--count', type=int, default=1_000_000, help="profiles to generate")
+    parser.add_argument('--output', choices=OUTPUTS, default='mongo', help="where to write profiles")
+    parser.add_argument('--path', default='corpus', help="output directory for ndjson/parquet parts")
+    parser.add_argument('--db', default='alum_ni', help="MongoDB database for --output mongo")
+    parser.add_argument('--drop', action='store_true', help="drop the target collections first")
+    parser.add_argument('--embeddings', choices=EMBEDDINGS, default='fake', help="embedding source")
+    parser.add_argument('--dimensions', type=int, default=1024, help="alumniEmb dimensions (must match the backend)")
+    parser.add_argument('--faiss-mapping', action='store_true', help="also write 384-d fake faissMapping vectors (mongo only)")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="profiles per chunk (and per part file)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="generator processes")
+    parser.add_argument('--seed', type=int, default=42, help="corpus seed")
+    parser.add_argument('--first-number', type=int, default=0, help="first profile number (extends an existing corpus)")
+    parser.add_argument('--as-of', default=None, help="latest dateUpdated, ISO date (default: today)")
+    args = parser.parse_args(argv)
+
+    if args.faiss_mapping and args.output != 'mongo':
+        parser.error("--faiss-mapping requires --output mongo")
+    if args.dimensions % 8:
+        parser.error("--dimensions must be a multiple of 8 for the packed-bit embedding")
+    if args.embeddings == 'cohere' and not os.getenv('COHERE_KEY'):
+        parser.error("--embeddings cohere requires COHERE_KEY")
+
+    as_of = (datetime.fromisoformat(args.as_of) if args.as_of
+             else datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0))
+    if as_of.tzinfo is None:
+        as_of = as_of.replace(tzinfo=timezone.utc)
+    options = {
+        'output': args.output, 'path': args.path, 'db': args.db, 'embeddings': args.embeddings,
+        'dimensions': args.dimensions, 'faiss_mapping': args.faiss_mapping, 'seed': args.seed,
+        'as_of': as_of.timestamp(),
+    }
+
+    if args.output == 'mongo':
+        prepare_mongo(options, args.drop)
+    else:
+        os.makedirs(args.path, exist_ok=True)
+
+    print(f"Generating {args.count:,} profiles -> {args.output} with {args.workers} workers")
+    started = time.monotonic()
+    done = 0
+    with get_context('spawn').Pool(args.workers, _init_worker, (options,)) as pool:
+        for size in pool.imap_unordered(build_chunk, chunk_tasks(args.count, args.chunk_size, args.first_number)):
+            done += size
+            elapsed = time.monotonic() - started
+            print(f"{done:,}/{args.count:,} profiles | {done / elapsed:,.0f} profiles/sec", flush=True)
+
+    if args.output == 'mongo':
+        finish_mongo(options)
+    print(f"Generated {done:,} profiles in {time.monotonic() - started:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Seed a local stack with synthetic profiles for load testing.
+
+Profiles are streamed to the backend's NDJSON import endpoint, so they get
+embeddings from whatever provider the backend runs with (EMBEDDING_PROVIDER=fake
+offline). With --faiss, faissMapping is then filled for flask-server using
+the same offline embeddings (db.update_all_mappings --model fake).
+
+Usage (from the repository root, with loadtest/offline.env exported):
+    python -m loadtest.seed --backend http://localhost:8000 --count 20000 [--faiss]
+"""
+import argparse
+import json
+import sys
+import time
+
+import requests
+
+from loadtest.data import make_profile, new_rng
+
+
+def ndjson_profiles(count, seed, start):
+    rng = new_rng(seed)
+    for index in range(start, start + count):
+        yield (json.dumps(make_profile(rng, index)) + '\n').encode()
+
+
+def seed_backend(backend, count, seed, start=0):
+    """Stream profiles to /api/v1/profiles/import and echo its progress lines."""
+    started = time.monotonic()
+    response = requests.post(
+        f'{backend}/api/v1/profiles/import',
+        data=ndjson_profiles(count, seed, start),
+        headers={'Content-Type': 'application/x-ndjson'},
+        stream=True
+    )
+    response.raise_for_status()
+
+    summary = None
+    for line in response.iter_lines():
+        if not line:
+            continue
+        event = json.loads(line)
+        if event.get('type') == 'progress':
+            print(f"\r{event['processed']} processed, {event['imported']} imported, "
+                  f"{event['skipped']} skipped, {event['failed']} failed", end='', flush=True)
+        elif event.get('type') == 'summary':
+            summary = event
+        elif event.get('type') == 'error':
+            print(f"\nline {event.get('line')}: {event.get('message')}", file=sys.stderr)
+    print(f"\nImported in {time.monotonic() - started:.1f}s")
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed a local stack with synthetic alumni profiles")
+    parser.add_argument('--backend', default='http://localhost:8000', help="backend base URL")
+    parser.add_argument('--count', type=int, default=10000, help="profiles to create")
+    parser.add_argument('--seed', type=int, default=42, help="RNG seed")
+    parser.add_argument('--start', type=int, default=0, help="first profile index (keeps URLs unique across runs)")
+    parser.add_argument('--faiss', action='store_true', help="also build faissMapping for flask-server")
+    args = parser.parse_args(argv)
+
+    summary = seed_backend(args.backend.rstrip('/'), args.count, args.seed, args.start)
+    if summary is None:
+        print("Import did not finish", file=sys.stderr)
+        return 1
+
+    if args.faiss:
+        from db.update_all_mappings import main as update_all_mappings
+        update_all_mappings(['--model', 'fake', '--restart'])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())